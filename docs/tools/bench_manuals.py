@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Fouchger Homelab – Manual Generator Benchmarks
+
+Description:
+  Timing harness for docs/tools/generate_manuals.py. Start-up cases run in a
+  fresh interpreter so import costs are measured the way `make docs` pays them.
+
+Suites:
+  startup   import:generate_manuals, cli:--help, cli:--check, plus the
+            python-docx and matplotlib import costs (reference)
+  diagrams  per-diagram render time, matplotlib vs SVG backend, and the
+            shipped PNG (png/png_bytes: render at --image-dpi + lossless
+            optimisation) against the pre-optimisation 200 dpi figure
+            (matplotlib/mpl_bytes)
+  scale     synthetic repos shaped like this one (lib/, bin/homelab,
+            scripts/**.sh) at 10x, 100x and 1000x the real file count; times
+            function indexing, menu map parsing + layout (menu_map_s, up to
+            400 menus), diagram rendering, DOCX composition and DOCX save
+            separately, run log analytics (run_logs_s, up to 5000 logs),
+            plus PDF export with --pdf. The Developer Manual
+            is built with the table API reference and, for comparison, the
+            older list layout (list_* fields)
+
+Usage:
+  python3 docs/tools/bench_manuals.py
+  python3 docs/tools/bench_manuals.py --suite scale --scales 10,100
+  python3 docs/tools/bench_manuals.py --repeat 10 --json
+
+History:
+  Each run is appended to docs/benchmarks/manual_generator_history.json
+  (--history to change, --no-history to skip) with the git commit, Python
+  version and host. Timings are compared with the previous entry and
+  anything more than --threshold percent slower is reported as a regression.
+
+Notes:
+  - Reports the best of N runs; the minimum is the least noisy estimate of
+    fixed start-up cost on a shared admin box.
+  - Synthetic repos are generated deterministically into a temp directory,
+    so runs on different commits index exactly the same input.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent.parent
+GENERATOR = TOOLS_DIR / "generate_manuals.py"
+DEFAULT_HISTORY = REPO_ROOT / "docs" / "benchmarks" / "manual_generator_history.json"
+
+# Shape of this repo at 1x: Bash files per directory, functions per file.
+SYNTH_LAYOUT = {"lib": 10, "scripts/core": 8, "scripts/app_manager/lib": 12, "scripts/misc": 5}
+SYNTH_FUNCS_PER_FILE = 6
+# ui_menu functions in lib/menu.sh: 15 per scale step (like this repo), capped.
+SYNTH_MENUS = 15
+SYNTH_MAX_MENUS = 400
+# lib/run.sh logs for the Runbook analytics: 20 runs per scale step, capped.
+SYNTH_LOGS = 20
+SYNTH_MAX_LOGS = 5000
+SYNTH_LOG_STEPS = 60
+# The bullet-list API reference takes minutes beyond this; only the table is timed there.
+LIST_MAX_SCALE = 100
+
+
+def time_subprocess(cmd: List[str], repeat: int) -> float:
+    """Best wall time (seconds) of `repeat` runs of cmd."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=TOOLS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_startup(repeat: int) -> Dict[str, float]:
+    py = sys.executable
+    cases = {
+        "interpreter": [py, "-c", "pass"],
+        "import:generate_manuals": [py, "-c", "import generate_manuals"],
+        "cli:--help": [py, str(GENERATOR), "--help"],
+        "cli:--check": [py, str(GENERATOR), "--check", "--repo", str(REPO_ROOT)],
+        "import:docx": [py, "-c", "import docx"],
+        "import:matplotlib": [py, "-c", "import matplotlib.pyplot"],
+    }
+    results: Dict[str, float] = {}
+    for name, cmd in cases.items():
+        try:
+            results[name] = time_subprocess(cmd, repeat)
+        except subprocess.CalledProcessError:
+            results[name] = float("nan")
+    return results
+
+
+def bench_diagrams(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Per-diagram render time for each backend (best of N, in-process).
+
+    Notes:
+      - matplotlib is imported once before timing; its import cost is reported
+        separately under start-up. The first matplotlib figure is warmed up.
+      - svg: SVG text generation + write. svg+png adds rasterization and is only
+        reported when rsvg-convert or cairosvg is available.
+      - matplotlib renders the figure at 200 dpi and keeps the PNG as written,
+        which is what builds embedded before diagrams were sized for the page;
+        png is render_diagram() at the default --image-dpi, optimisation included.
+    """
+    sys.path.insert(0, str(TOOLS_DIR))
+    import generate_manuals as gm
+    from manuals.svg_diagrams import rasterize_png, rasterizer, render_svg
+
+    symbols = gm.build_function_index(REPO_ROOT)
+    specs = gm.diagram_specs(symbols, gm.parse_menus(REPO_ROOT, symbols))
+    have_raster = rasterizer() is not None
+    results: Dict[str, Dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="homelab-bench-") as tmp:
+        out = Path(tmp)
+        first = next(iter(specs.values()))
+        gm.diagram_boxes_arrows(out / "warmup.png", first["boxes"], first["arrows"], figsize=first["figsize"], title=first["title"])
+
+        for name, spec in specs.items():
+            png, svg = out / f"{name}.png", out / f"{name}.svg"
+
+            def mpl() -> None:
+                gm.diagram_boxes_arrows(png, spec["boxes"], spec["arrows"], figsize=spec["figsize"], title=spec["title"])
+
+            def svg_only() -> None:
+                svg.write_text(render_svg(spec["boxes"], spec["arrows"], figsize=spec["figsize"], title=spec["title"]))
+
+            def svg_png() -> None:
+                svg_only()
+                rasterize_png(svg, png)
+
+            def shipped() -> None:
+                gm.render_diagram(spec, png)
+
+            row: Dict[str, float] = {"matplotlib": best_of(mpl, repeat)}
+            row["mpl_bytes"] = png.stat().st_size
+            row["png"] = best_of(shipped, repeat)
+            row["png_bytes"] = png.stat().st_size
+            row["svg"] = best_of(svg_only, repeat)
+            if have_raster:
+                row["svg+png"] = best_of(svg_png, repeat)
+            results[name] = row
+    return results
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# -----------------------------
+# Synthetic repositories
+# -----------------------------
+
+SYNTH_MENU = """
+{name}() {{
+  while true; do
+    local choice=""
+    ui_menu "Synthetic menu {n}" "Choose an action:" choice \\
+{items}
+      0 "Back"
+
+    [[ -n "${{choice}}" ]] || return 0
+
+    case "${{choice}}" in
+{arms}
+      0) return 0 ;;
+    esac
+  done
+}}
+"""
+
+SYNTH_FUNCTION = """
+# {name}: synthetic function for benchmarking.
+{name}() {{
+  local key="${{1:-}}" value
+  value="$(printf '%s' "$key" | tr '[:lower:]' '[:upper:]')"
+{calls}
+  case "$key" in
+    a|b) echo "short path ($value)" ;;
+    *) printf '%s\\n' "value=${{value}} $(( {n} + 1 ))" ;;
+  esac
+  cat <<'TXT'
+{name} text inside a heredoc is not a call
+TXT
+}}
+"""
+
+
+def make_synthetic_repo(root: Path, scale: int, seed: int = 1) -> Dict[str, int]:
+    """
+    Write a repo shaped like this one with `scale` times its Bash file count.
+
+    Notes:
+      - Every file sources lib/modules.sh and each function calls up to two
+        earlier functions, so the call graph and source edges are populated.
+      - lib/menu.sh holds a tree of ui_menu functions rooted at main_menu
+        (four submenus each, plus one cross link), for the menu map layout.
+    """
+    rng = random.Random(seed)
+    (root / "bin").mkdir(parents=True, exist_ok=True)
+    (root / "bin" / "homelab").write_text(
+        '#!/usr/bin/env bash\nset -Eeuo pipefail\nsource "${REPO_ROOT}/lib/modules.sh"\nmain_menu\n'
+    )
+    menus = [f"synthetic_{i:04d}_menu" for i in range(min(SYNTH_MENUS * scale, SYNTH_MAX_MENUS))]
+    menus[0] = "main_menu"
+    parts = ["#!/usr/bin/env bash", "set -Eeuo pipefail"]
+    for i, name in enumerate(menus):
+        children = menus[4 * i + 1:4 * i + 5]
+        if i > 4:
+            children.append(menus[rng.randrange(1, i)])
+        items = "\n".join(f'      {k} "Open {c}" \\' for k, c in enumerate(children, 1))
+        arms = "\n".join(f"      {k}) {c} ;;" for k, c in enumerate(children, 1))
+        parts.append(SYNTH_MENU.format(name=name, n=i, items=items, arms=arms))
+    (root / "lib").mkdir(parents=True, exist_ok=True)
+    (root / "lib" / "menu.sh").write_text("\n".join(parts))
+    files, names = 2, []
+    for area, count in SYNTH_LAYOUT.items():
+        for i in range(count * scale):
+            rel = Path(area) / ("modules.sh" if area == "lib" and i == 0 else f"module_{i:05d}.sh")
+            parts = ["#!/usr/bin/env bash", "set -Eeuo pipefail", 'source "${REPO_ROOT}/lib/modules.sh"']
+            for j in range(SYNTH_FUNCS_PER_FILE):
+                name = f"{area.replace('/', '_')}_{i}_fn{j}"
+                callees = rng.sample(names, k=min(2, len(names)))
+                calls = "\n".join(f'  {c} "$key" || return 1' for c in callees)
+                parts.append(SYNTH_FUNCTION.format(name=name, calls=calls, n=rng.randrange(100)))
+                names.append(name)
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("\n".join(parts))
+            files += 1
+    return {"files": files, "functions": len(names) + len(menus), "menus": len(menus)}
+
+
+SYNTH_COMPONENTS = ("homelab", "app_manager", "bootstrap_dev_server", "gh_auth", "proxmox_templates")
+SYNTH_WARNINGS = (
+    "Package {n} is not available from the configured apt sources; skipping",
+    "Marker file missing for app {n}; not uninstalling",
+    "GitHub CLI not authenticated; retry {n} of 3",
+)
+
+
+def make_synthetic_logs(log_dir: Path, runs: int, seed: int = 1) -> Dict[str, int]:
+    """
+    Write `runs` run logs in lib/run.sh's format (Layer 1 lines plus the
+    untimestamped stdout copies), one in ten rotated into backup/ as
+    lib/logging.sh does; about 10% fail and 5% never finish.
+    """
+    rng = random.Random(seed)
+    (log_dir / "backup").mkdir(parents=True, exist_ok=True)
+    start = _dt.datetime(2026, 1, 1, 8, 0, 0, tzinfo=_dt.timezone.utc)
+    files = 0
+    for i in range(runs):
+        t = start + _dt.timedelta(minutes=17 * i)
+        run_id = f"{t:%Y%m%d-%H%M%S}-{SYNTH_COMPONENTS[i % len(SYNTH_COMPONENTS)]}"
+        lines = []
+
+        def emit(label: str, msg: str) -> None:
+            lines.append(f"{t.isoformat(timespec='seconds')} [{label}] {msg}")
+            lines.append(f"[{label}] {msg}")
+
+        emit("ℹ️ INFO", f"Run started: {run_id}")
+        for step in range(SYNTH_LOG_STEPS):
+            t += _dt.timedelta(seconds=rng.randrange(1, 20))
+            if rng.random() < 0.05:
+                emit("⚠️ WARN", rng.choice(SYNTH_WARNINGS).format(n=rng.randrange(40)))
+            else:
+                emit("ℹ️ INFO", f"Step {step}: ok")
+                lines.append(f"Reading package lists... Done ({rng.randrange(1000)} kB)")
+        roll = rng.random()
+        if roll < 0.10:
+            emit("✖ ERROR", f"Run failed (exit 100) at line {rng.randrange(50, 400)}. See log: {log_dir}/{run_id}.log")
+        elif roll < 0.95:
+            emit("✔ OK", "Run completed successfully.")
+        text = "\n".join(lines) + "\n"
+        if i % 10 == 0:
+            half = len(text) // 2
+            cut = text.index("\n", half) + 1
+            (log_dir / "backup" / f"{run_id}.log.{t:%Y-%m-%dT%H-%M-%S}+00-00.bak").write_text(text[:cut])
+            text = text[cut:]
+            files += 1
+        (log_dir / f"{run_id}.log").write_text(text)
+        files += 1
+    return {"runs": runs, "log_files": files}
+
+
+def bench_scale(scales: List[int], *, pdf: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Time each build stage on synthetic repos (one run per scale, in-process).
+
+    Notes:
+      - Indexing runs without the index cache, i.e. a cold build.
+      - DOCX composition and save are split with the generator's own phases,
+        so the numbers match what --timings reports for a real build.
+      - docx_* is the default table API reference (every function); list_* is
+        the bullet layout, which still truncates at 60 functions per file, and
+        is only timed up to LIST_MAX_SCALE.
+      - md_*/html_* build the same manual with the text writers against the
+        SVG diagrams (svgs_s), i.e. the --format md,html path.
+      - run_logs_s lists and streams SYNTH_LOGS run logs per scale step (up to
+        SYNTH_MAX_LOGS) for the Runbook analytics chapter; run_logs_jobs_s is
+        the same with a worker per CPU, on multi-core hosts only.
+    """
+    sys.path.insert(0, str(TOOLS_DIR))
+    import generate_manuals as gm
+    from manuals.run_logs import find_run_logs, scan_run_logs
+    from manuals.svg_diagrams import write_svg
+    from manuals.timing import PhaseTimer, activate
+
+    def build_docx(out: Path, repo: Path, diagrams, symbols, style: str, fmt: str = "docx"):
+        timer = PhaseTimer()
+        prev = activate(timer)
+        try:
+            with timer.phase("compose"):
+                docx = gm.create_developer_manual(out, repo, diagrams, "bench", today, symbols, style, fmt)
+        finally:
+            activate(prev)
+        totals = timer.totals()
+        return docx, round(totals["compose"]["wall"] + totals["api_reference"]["wall"], 4), round(totals["save"]["wall"], 4)
+
+    today = _dt.date.today()
+    results: Dict[str, Dict[str, float]] = {}
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"homelab-bench-{scale}x-") as tmp:
+            repo, out = Path(tmp) / "repo", Path(tmp) / "out"
+            shape = make_synthetic_repo(repo, scale)
+            assets = out / "manual_assets"
+            assets.mkdir(parents=True)
+
+            start = time.perf_counter()
+            symbols = gm.build_function_index(repo)
+            index_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            menus = gm.parse_menus(repo, symbols)
+            gm.menu_map_spec(menus, symbols)
+            menu_map_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            specs = gm.diagram_specs(symbols, menus)
+            diagrams = {name: gm.render_diagram(spec, assets / f"{name}.png") for name, spec in specs.items()}
+            diagrams_s = time.perf_counter() - start
+
+            row = {
+                "files": shape["files"],
+                "functions": shape["functions"],
+                "menus": shape["menus"],
+                "index_s": round(index_s, 4),
+                "menu_map_s": round(menu_map_s, 4),
+                "diagrams_s": round(diagrams_s, 4),
+                "diagram_bytes": sum(p.stat().st_size for p in diagrams.values()),
+            }
+            styles = [("docx", "table")]
+            if scale <= LIST_MAX_SCALE:
+                styles.insert(0, ("list", "list"))
+            for prefix, style in styles:
+                docx, row[f"{prefix}_compose_s"], row[f"{prefix}_save_s"] = build_docx(out, repo, diagrams, symbols, style)
+                row[f"{prefix}_bytes"] = docx.stat().st_size
+
+            start = time.perf_counter()
+            svgs = {name: write_svg(spec, assets / f"{name}.svg") for name, spec in specs.items()}
+            row["svgs_s"] = round(time.perf_counter() - start, 4)
+            for fmt in ("md", "html"):
+                text, row[f"{fmt}_compose_s"], row[f"{fmt}_save_s"] = build_docx(out, repo, svgs, symbols, "table", fmt)
+                row[f"{fmt}_bytes"] = text.stat().st_size
+
+            log_dir = Path(tmp) / "logs"
+            row.update(make_synthetic_logs(log_dir, min(SYNTH_LOGS * scale, SYNTH_MAX_LOGS)))
+            start = time.perf_counter()
+            scan_run_logs(find_run_logs(log_dir), 1)
+            row["run_logs_s"] = round(time.perf_counter() - start, 4)
+            if (os.cpu_count() or 1) > 1:
+                start = time.perf_counter()
+                scan_run_logs(find_run_logs(log_dir), os.cpu_count() or 1)
+                row["run_logs_jobs_s"] = round(time.perf_counter() - start, 4)
+            if pdf:
+                start = time.perf_counter()
+                if gm.export_pdfs_batch([docx], out / "pdf") is not None:
+                    row["pdf_s"] = round(time.perf_counter() - start, 4)
+            results[f"{scale}x"] = row
+    return results
+
+
+# -----------------------------
+# History
+# -----------------------------
+
+def git_commit() -> str:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(REPO_ROOT), "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return proc.stdout.strip()
+
+
+def timings(results: Dict[str, object], prefix: str = "") -> Dict[str, float]:
+    """Flatten results to {"suite.case.field": seconds}, skipping sizes and counts."""
+    flat: Dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(timings(value, name + "."))
+        elif isinstance(value, float) and (not name.startswith("scale.") or key.endswith("_s")):
+            flat[name] = value
+    return flat
+
+
+def record_history(path: Path, results: Dict[str, object], threshold: float) -> List[str]:
+    """
+    Append this run to the history file and return regression messages.
+
+    Notes:
+      - Each timing is compared with the most recent entry that has it, so
+        running a single suite does not hide regressions in the others.
+      - Sub-millisecond timings are too noisy to compare and are ignored.
+    """
+    try:
+        history = json.loads(path.read_text())
+    except (OSError, ValueError):
+        history = []
+
+    previous: Dict[str, float] = {}
+    for entry in reversed(history):
+        for name, secs in timings(entry.get("results", {})).items():
+            previous.setdefault(name, secs)
+
+    regressions = []
+    for name, secs in sorted(timings(results).items()):
+        old = previous.get(name)
+        if old is not None and old >= 0.001 and secs > old * (1 + threshold / 100):
+            regressions.append(f"{name}: {old:.4f}s -> {secs:.4f}s (+{(secs / old - 1) * 100:.0f}%)")
+
+    history.append({
+        "timestamp": _dt.datetime.now(_dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "results": results,
+    })
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2) + "\n")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the fouchger_homelab manual generator.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best time is reported (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=["startup", "diagrams", "scale"],
+        help="Suite to run; repeat for several (default: all)",
+    )
+    parser.add_argument("--scales", default="10,100,1000", help="Synthetic repo scales for the scale suite (default: 10,100,1000)")
+    parser.add_argument("--pdf", action="store_true", help="Include PDF export in the scale suite (needs soffice)")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON history file to append to")
+    parser.add_argument("--no-history", action="store_true", help="Do not record this run")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Slowdown in percent reported as a regression (default: 20)")
+    args = parser.parse_args()
+
+    repeat = max(1, args.repeat)
+    suites = args.suite or ["startup", "diagrams", "scale"]
+    results: Dict[str, object] = {}
+    if "startup" in suites:
+        results["startup"] = bench_startup(repeat)
+    if "diagrams" in suites:
+        results["diagrams"] = bench_diagrams(repeat)
+    if "scale" in suites:
+        results["scale"] = bench_scale([int(s) for s in args.scales.split(",") if s.strip()], pdf=args.pdf)
+
+    regressions = [] if args.no_history else record_history(args.history, results, args.threshold)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=2))
+        return
+
+    if "startup" in results:
+        print("Start-up (best of %d, seconds):" % repeat)
+        for name, secs in results["startup"].items():
+            print(f"  {name:<26} {secs:8.3f}")
+
+    if "diagrams" in results:
+        print("Diagrams (best of %d, seconds):" % repeat)
+        for name, row in results["diagrams"].items():
+            cols = "  ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items())
+            print(f"  {name:<26} {cols}")
+
+    if "scale" in results:
+        print("Synthetic repos (seconds unless noted):")
+        for scale, row in results["scale"].items():
+            cols = "  ".join(f"{k}={v}" for k, v in row.items())
+            print(f"  {scale:<6} {cols}")
+
+    if not args.no_history:
+        print(f"History: {args.history}")
+    for msg in regressions:
+        print(f"REGRESSION {msg}")
+
+
+if __name__ == "__main__":
+    main()
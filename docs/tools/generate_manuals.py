@@ -8,9 +8,10 @@ Description:
   menu map, and data model) and embeds them into the DOCX outputs.
 
 Outputs:
-  - Fouchger_Homelab_User_Manual.docx
+  - Fouchger_Homelab_User_Manual.docx (.md/.html with --format)
   - Fouchger_Homelab_Developer_Manual.docx
   - Fouchger_Homelab_Runbook.docx
+  - project_index.json / project_index.sqlite
   - manual_assets/architecture.png
   - manual_assets/menu_map.png
   - manual_assets/data_model.png
@@ -21,11 +22,22 @@ Optional:
 
 Usage:
   python3 generate_manuals.py --repo /path/to/fouchger_homelab-main --out /path/to/output
+  python3 generate_manuals.py --help
 
 Notes:
   - Safe-by-default: reads the repo and writes docs/diagrams only; does not modify repo files.
   - Designed for Ubuntu/Debian environments.
   - Keep diagrams simple and readable; this is operational documentation.
+  - Incremental builds and the diagram store: manuals/cache.py, manuals/index_cache.py.
+  - Parallel builds (--jobs): manuals/pipeline.py; PDF export: --pdf-mode.
+  - Diagrams: manuals/images.py (--image-dpi), manuals/svg_diagrams.py (--diagram-backend).
+  - Reproducible builds (--reproducible, SOURCE_DATE_EPOCH): manuals/reproducible.py.
+  - Timings and profiling (--timings, --profile): manuals/timing.py.
+  - API reference layout (--api-reference): manuals/api_reference.py.
+  - Scanned files and worktrees (--exclude, --worktrees): manuals/walker.py.
+  - Watch mode (--watch): manuals/watch.py; run log chapter (--run-logs): manuals/run_logs.py.
+  - Output formats (--format): manuals/writers.py; project index: manuals/project_index.py.
+  - Python API: ManualBuilder, below.
 
 Maintainer:
   Your team / you
@@ -36,20 +48,43 @@ Maintainer:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import datetime as _dt
+import functools
+import importlib.metadata
+import io
 import os
 import re
 import shutil
 import subprocess
+import tempfile
 import textwrap
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
-
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Inches, Pt
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from manuals.api_reference import STYLES as API_STYLES
+from manuals.bash_index import SymbolTable, index_repo, index_text
+from manuals.cache import STORE_DIR, ArtifactStore, BuildManifest, digest_file, digest_files, digest_values
+from manuals.images import DEFAULT_IMAGE_DPI, optimize_png, render_dpi
+from manuals.index_cache import CACHE_NAME as INDEX_CACHE_NAME, IndexCache, SharedParses
+from manuals.layout import layered_layout
+from manuals.menus import Menu, menu_edges, parse_menus, parse_ui_menu_blocks  # noqa: F401 - re-exported for callers of this module
+from manuals.pipeline import Pipeline, Task
+from manuals.project_index import JSON_NAME as PROJECT_JSON_NAME, SQLITE_NAME as PROJECT_SQLITE_NAME, write_project_index
+from manuals.reproducible import epoch_date, normalize_docx, source_date_epoch, strip_png_metadata
+from manuals.run_logs import RunLogs, component_rows, default_log_dir, find_run_logs, scan_run_logs
+from manuals.svg_diagrams import rasterize_png, rasterizer, write_svg
+from manuals.timing import PhaseTimer, activate, phase
+from manuals.walker import EXCLUDES, RepoWalk, git_worktrees, walk_repo
+from manuals.watch import InotifyWatcher, make_watcher, watch_changes
+from manuals.writers import FORMATS, PICTURE_WIDTH_IN, SUFFIXES, make_writer
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+WATCH_DIRS = ("lib", "bin", "scripts")
 
 
 # -----------------------------
@@ -78,42 +113,32 @@ def run(cmd: List[str]) -> None:
         )
 
 
-# -----------------------------
-# Bash parsing (best effort)
-# -----------------------------
-
-def extract_functions(path: Path) -> List[str]:
+def generator_digest() -> str:
     """
-    Extract Bash function names using a simple regex.
+    Digest of the generator source (this script and the manuals package).
 
     Notes:
-      - This is intentionally lightweight (no full Bash parsing).
-      - It should be used as a navigation aid, not a formal API contract.
+      - Folded into every cache key so template or layout edits invalidate
+        previously built outputs.
     """
-    txt = read_text(path)
-    fn = re.findall(r'^\s*(?:function\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*\(\)\s*\{', txt, flags=re.M)
-    return sorted(set(fn))
+    sources = [TOOLS_DIR / "generate_manuals.py", *sorted((TOOLS_DIR / "manuals").glob("*.py"))]
+    return digest_files([p for p in sources if p.exists()], TOOLS_DIR)
 
 
-def parse_ui_menu_blocks(menu_sh_text: str) -> List[Tuple[str, str, str, List[Tuple[str, str]]]]:
-    """
-    Parse ui_menu blocks from lib/menu.sh.
+# -----------------------------
+# Bash parsing (best effort)
+# -----------------------------
 
-    Returns:
-      List of tuples: (title, prompt, variable, items)
-      where items is list of (key, label)
+def extract_functions(path: Path) -> List[str]:
+    """
+    Extract Bash function names from one file.
 
     Notes:
-      - This is best-effort. It assumes the ui_menu usage pattern found in the repo.
-      - If the menu formatting changes, this may return fewer results.
+      - Uses the tokenizer in manuals/bash_index.py, so definitions inside
+        strings and heredocs (generated helper scripts) are not reported.
+      - It should be used as a navigation aid, not a formal API contract.
     """
-    blocks = []
-    pattern = r'ui_menu\s+"([^"]+)"\s+"([^"]+)"\s+([A-Za-z_][A-Za-z0-9_]*)\s*\\\s*(.*?)\n\n'
-    for m in re.finditer(pattern, menu_sh_text, flags=re.S):
-        title, prompt, var, body = m.group(1), m.group(2), m.group(3), m.group(4)
-        items = re.findall(r'\n?\s*([0-9]+)\s+"([^"]+)"', body)
-        blocks.append((title, prompt, var, items))
-    return blocks
+    return sorted({f.name for f in index_text(path.name, read_text(path)).functions})
 
 
 # -----------------------------
@@ -127,6 +152,7 @@ def diagram_boxes_arrows(
     *,
     figsize: Tuple[float, float] = (11, 6),
     title: str | None = None,
+    dpi: int = 200,
 ) -> None:
     """
     Create a simple box-and-arrow diagram.
@@ -141,6 +167,9 @@ def diagram_boxes_arrows(
       - Keep it simple; these are docs diagrams, not a full modelling tool.
       - Avoid overloading the diagram; readability matters more than completeness.
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import FancyBboxPatch
+
     fig, ax = plt.subplots(figsize=figsize)
     ax.set_xlim(0, 1)
     ax.set_ylim(0, 1)
@@ -175,29 +204,36 @@ def diagram_boxes_arrows(
             ax.text(mx, my, label, ha="center", va="center", fontsize=9)
 
     fig.tight_layout()
-    fig.savefig(out_path, dpi=200)
+    fig.savefig(out_path, dpi=dpi, metadata={"Software": None})
     plt.close(fig)
 
 
-def generate_diagrams(assets_dir: Path) -> Dict[str, Path]:
+def diagram_specs(symbols: SymbolTable | None = None, menus: List[Menu] | None = None) -> Dict[str, Dict[str, object]]:
     """
-    Generate architecture, data model, and menu map diagrams.
+    Box and arrow specs for the architecture, data model, and menu map diagrams.
 
     Notes:
       - Diagram content is a pragmatic representation of the repo structure.
       - Update this function if the application evolves materially.
+      - The specs double as the diagram cache inputs; any edit here triggers a redraw.
+      - With a symbol table, architecture boxes show how many functions each
+        layer defines, taken from the same index as the API reference.
+      - The menu map is derived from the parsed ui_menu blocks (menu_map_spec).
     """
-    ensure_dir(assets_dir)
+    def count(prefix: str) -> str:
+        if symbols is None:
+            return ""
+        return f"\n({symbols.count_functions(prefix)} functions)"
 
     # Architecture
     arch_boxes = {
         "user": (0.05, 0.75, 0.25, 0.15, "Operator\n(SSH / local shell)"),
-        "entry": (0.37, 0.75, 0.25, 0.15, "Entry point\nbin/homelab"),
-        "lib": (0.69, 0.75, 0.26, 0.15, "Library layer\nlib/*.sh"),
-        "ui": (0.69, 0.53, 0.26, 0.15, "UI framework\n(dialog wrappers)"),
-        "menu": (0.37, 0.53, 0.25, 0.15, "Menu router\nlib/menu.sh"),
-        "actions": (0.37, 0.31, 0.25, 0.15, "Actions\nlib/actions.sh"),
-        "modules": (0.05, 0.31, 0.25, 0.15, "Feature modules\nscripts/core/*.sh"),
+        "entry": (0.37, 0.75, 0.25, 0.15, "Entry point\nbin/homelab" + count("bin/homelab")),
+        "lib": (0.69, 0.75, 0.26, 0.15, "Library layer\nlib/*.sh" + count("lib/")),
+        "ui": (0.69, 0.53, 0.26, 0.15, "UI framework\n(dialog wrappers)" + count("lib/ui.sh")),
+        "menu": (0.37, 0.53, 0.25, 0.15, "Menu router\nlib/menu.sh" + count("lib/menu.sh")),
+        "actions": (0.37, 0.31, 0.25, 0.15, "Actions\nlib/actions.sh" + count("lib/actions.sh")),
+        "modules": (0.05, 0.31, 0.25, 0.15, "Feature modules\nscripts/core/*.sh" + count("scripts/")),
         "state": (0.69, 0.31, 0.26, 0.15, "State + logs\n~/.config/fouchger_homelab"),
     }
     arch_arrows = [
@@ -211,8 +247,6 @@ def generate_diagrams(assets_dir: Path) -> Dict[str, Path]:
         ("lib", "state", "read/write"),
         ("ui", "state", "tempfiles"),
     ]
-    arch_path = assets_dir / "architecture.png"
-    diagram_boxes_arrows(arch_path, arch_boxes, arch_arrows, figsize=(11, 6.5), title="System Architecture (High Level)")
 
     # Data model
     data_boxes = {
@@ -229,138 +263,303 @@ def generate_diagrams(assets_dir: Path) -> Dict[str, Path]:
         ("stateenv", "logs", "writes"),
         ("stateenv", "ptlog", "enables\nvia FEATURE_SESSION_CAPTURE"),
     ]
-    data_path = assets_dir / "data_model.png"
-    diagram_boxes_arrows(data_path, data_boxes, data_arrows, figsize=(11, 6), title="Data Model and State Storage")
-
-    # Menu map (simplified)
-    menu_boxes = {
-        "main": (0.35, 0.78, 0.30, 0.12, "Main menu\nFouchger_Homelab"),
-        "git": (0.05, 0.58, 0.26, 0.12, "Git & GitHub\n(dev-auth.sh)"),
-        "boot": (0.37, 0.58, 0.26, 0.12, "Bootstrap Dev Server"),
-        "infra": (0.69, 0.58, 0.26, 0.12, "Infrastructure"),
-        "work": (0.37, 0.38, 0.26, 0.12, "Workflows"),
-        "debug": (0.69, 0.38, 0.26, 0.12, "Debug"),
-        "appm": (0.37, 0.18, 0.26, 0.12, "Ubuntu App Manager\n(app_manager_menu)"),
+
+    return {
+        "architecture": {"boxes": arch_boxes, "arrows": arch_arrows, "figsize": (11, 6.5), "title": "System Architecture (High Level)"},
+        "data_model": {"boxes": data_boxes, "arrows": data_arrows, "figsize": (11, 6), "title": "Data Model and State Storage"},
+        "menu_map": menu_map_spec(menus or [], symbols),
     }
-    menu_arrows = [
-        ("main", "git", "1"),
-        ("main", "boot", "2"),
-        ("main", "infra", "3"),
-        ("main", "work", "4"),
-        ("main", "debug", "5"),
-        ("boot", "appm", "2"),
-    ]
-    menu_path = assets_dir / "menu_map.png"
-    diagram_boxes_arrows(menu_path, menu_boxes, menu_arrows, figsize=(11, 6), title="Menu Map (Current Wiring)")
 
-    return {"architecture": arch_path, "data_model": data_path, "menu_map": menu_path}
 
+MENU_MAP_COLUMNS = 3
+MENU_MAP_ROW_IN = 1.0
+MENU_MAP_LAYER_GAP = 0.5  # extra space between layers, in rows
+MENU_MAP_MAX_IN = 200.0  # keeps the 200 dpi PNG under matplotlib's 2^16 px limit
 
-# -----------------------------
-# DOCX composition helpers
-# -----------------------------
 
-def set_doc_styles(doc: Document) -> None:
-    normal = doc.styles["Normal"]
-    normal.font.name = "Calibri"
-    normal.font.size = Pt(11)
+def _plain(text: str) -> str:
+    """Menu title without emoji/variation selectors (the diagram fonts lack those glyphs)."""
+    kept = "".join(c for c in text if unicodedata.category(c) not in ("So", "Sk", "Mn", "Cf", "Cs", "Co"))
+    return " ".join(kept.split())
 
-    for h, size in [("Heading 1", 20), ("Heading 2", 16), ("Heading 3", 13)]:
-        st = doc.styles[h]
-        st.font.name = "Calibri"
-        st.font.size = Pt(size)
 
+def menu_map_spec(menus: List[Menu], symbols: SymbolTable | None = None) -> Dict[str, object]:
+    """
+    Menu map diagram spec: one box per ui_menu function, one arrow per item that opens a submenu.
 
-def add_title(doc: Document, title: str, subtitle: str | None = None) -> None:
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r = p.add_run(title)
-    r.bold = True
-    r.font.size = Pt(28)
+    Notes:
+      - Layers come from layered_layout(); main_menu (if present) is the first root.
+      - Layers wider than MENU_MAP_COLUMNS wrap onto extra rows and the figure
+        grows in height, so text stays at a readable size on a portrait page.
+      - Arrow labels are the item keys the user types.
+    """
+    by_name: Dict[str, Menu] = {}
+    for m in menus:
+        by_name.setdefault(m.function, m)
+    names = sorted(by_name, key=lambda n: (n != "main_menu", by_name[n].file, by_name[n].line))
+    edges = menu_edges(list(by_name.values()), symbols) if symbols is not None else []
+    keys: Dict[Tuple[str, str], List[str]] = {}
+    for frm, to, key in edges:
+        keys.setdefault((frm, to), []).append(key)
+
+    # (layer, row) pairs; wrapped rows of one layer sit closer than separate layers.
+    rows: List[Tuple[int, List[str]]] = []
+    for li, layer in enumerate(layered_layout(names, list(keys))):
+        rows += [(li, layer[i:i + MENU_MAP_COLUMNS]) for i in range(0, len(layer), MENU_MAP_COLUMNS)]
+    if not rows:
+        rows = [(0, ["none"])]
+    units = len(rows) + MENU_MAP_LAYER_GAP * rows[-1][0]
+    height = min(MENU_MAP_MAX_IN, max(6.0, MENU_MAP_ROW_IN * units + 0.8))
+    top, bottom = 1 - 0.7 / height, 0.02
+    row_h = (top - bottom) / units
+
+    boxes: Dict[str, Tuple[float, float, float, float, str]] = {}
+    for r, (li, row) in enumerate(rows):
+        col_w = 0.96 / len(row)
+        w = min(col_w - 0.06, 0.26)
+        h = max(row_h - 0.06, row_h * 0.3)  # the rounded boxes add 0.02 padding on each side
+        y = top - (r + 1 + MENU_MAP_LAYER_GAP * li) * row_h + (row_h - h) / 2
+        for c, name in enumerate(row):
+            m = by_name.get(name)
+            if m is None:
+                text = "No ui_menu menus found"
+            else:
+                title = "" if m.title.startswith("$") else _plain(m.title)
+                title = title or name
+                text = "\n".join(textwrap.wrap(title, 24)[:2] + [f"({name})"])
+            boxes[name] = (0.02 + c * col_w + (col_w - w) / 2, y, w, h, text)
+
+    arrows = [(frm, to, ",".join(k)) for (frm, to), k in keys.items()]
+    return {"boxes": boxes, "arrows": arrows, "figsize": (11, round(height, 2)), "title": "Menu Map (Current Wiring)"}
+
+
+def render_diagram(
+    spec: Dict[str, object],
+    out_path: Path,
+    backend: str = "matplotlib",
+    reproducible: bool = False,
+    image_dpi: int = DEFAULT_IMAGE_DPI,
+) -> Path:
+    """
+    Render one diagram spec from diagram_specs() (process-pool friendly).
 
-    if subtitle:
-        p2 = doc.add_paragraph()
-        p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        r2 = p2.add_run(subtitle)
-        r2.font.size = Pt(12)
+    Notes:
+      - The PNG is rendered for image_dpi at the width the DOCX places it
+        (PICTURE_WIDTH_IN), then losslessly optimised (manuals/images.py).
+      - backend="svg" writes <name>.svg straight from the spec and rasterizes
+        the PNG the DOCX embeds with rsvg-convert/cairosvg. Without either
+        rasterizer the PNG falls back to matplotlib, but the SVG is still written.
+      - reproducible=True strips PNG text/time chunks so reruns are byte-identical.
+    """
+    dpi = render_dpi(spec["figsize"][0], PICTURE_WIDTH_IN, image_dpi)
+    rendered = False
+    if backend == "svg":
+        rendered = rasterize_png(write_svg(spec, out_path.with_suffix(".svg")), out_path, dpi=dpi)
+    if not rendered:
+        diagram_boxes_arrows(out_path, spec["boxes"], spec["arrows"], figsize=spec["figsize"], title=spec["title"], dpi=dpi)
+    with phase(f"optimize:{out_path.stem}"):
+        optimize_png(out_path)
+    if reproducible:
+        strip_png_metadata(out_path)
+    return out_path
 
 
-def add_footer_note(doc: Document, text: str) -> None:
-    p = doc.add_paragraph()
-    r = p.add_run(text)
-    r.italic = True
-    r.font.size = Pt(9)
+def _dist_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "?"
 
 
-# -----------------------------
-# Manual generation
-# -----------------------------
+def diagram_renderer(backend: str) -> str:
+    """
+    What actually draws the diagram PNGs for backend (tool and version), for the diagram digest.
 
-def build_function_index(repo: Path) -> Dict[str, List[str]]:
+    Notes:
+      - --diagram-backend svg without rsvg-convert or cairosvg falls back to
+        matplotlib. The renderer is part of the digest, so installing a
+        rasterizer (or upgrading matplotlib) redraws instead of reusing a
+        stored PNG drawn by something else.
     """
-    Build a function index for the Developer Manual.
+    if backend == "svg":
+        tool = rasterizer()
+        if tool == "cairosvg":
+            return f"svg:cairosvg {_dist_version('CairoSVG')}"
+        if tool is not None:
+            return f"svg:{tool}"
+    return f"matplotlib {_dist_version('matplotlib')}"
+
+
+def render_shared(
+    store: ArtifactStore | None, inputs: str, out_path: Path, fn, args: Tuple[object, ...], refresh: bool = False,
+) -> Tuple[Path, bool]:
+    """
+    Produce out_path with fn(*args), or copy it from the store (returns (path, reused)).
 
     Notes:
-      - Includes *.sh and bin/homelab.
-      - Keep this small and practical; long lists are truncated in the doc.
-    """
-    bash_files = sorted([p for p in repo.rglob("*.sh") if p.is_file()])
-    maybe_entry = repo / "bin" / "homelab"
-    if maybe_entry.exists():
-        bash_files.append(maybe_entry)
-
-    out: Dict[str, List[str]] = {}
-    for p in bash_files:
-        rel = str(p.relative_to(repo))
-        out[rel] = extract_functions(p)
-    return out
+      - inputs is the manifest digest, which covers everything that affects
+        the bytes (generator source, spec, renderer, reproducibility), so equal
+        digests from another worktree's build give an identical file.
+      - refresh=True (--force) renders anyway, unless this run already stored
+        the artifact, and replaces the stored copy.
+    """
+    if store is not None and store.fetch(inputs, out_path, refresh=refresh):
+        return out_path, True
+    fn(*args)
+    if store is not None:
+        store.put(inputs, out_path)
+    return out_path, False
+
+
+_warned_svg_fallback = False
+
+
+def plan_all_diagrams(args: argparse.Namespace, assets_dir: Path, gen_digest: str, symbols: SymbolTable, menus: List[Menu], epoch: int | None):
+    """(plan_diagrams, plan_svgs) with the build's settings; warns if the svg backend has no rasterizer."""
+    global _warned_svg_fallback
+    if args.diagram_backend == "svg" and "docx" in args.format and not _warned_svg_fallback and rasterizer() is None:
+        print("WARN: --diagram-backend svg: neither rsvg-convert nor cairosvg is available; DOCX diagrams are drawn with matplotlib")
+        _warned_svg_fallback = True
+    return (
+        plan_diagrams(assets_dir, digest_values(gen_digest, epoch is not None), symbols, args.diagram_backend, menus, args.image_dpi),
+        plan_svgs(assets_dir, gen_digest, symbols, menus),
+    )
+
+
+def plan_digests(*plans: Dict[str, Tuple[Path, str, Dict[str, object]]]) -> Set[str]:
+    """Every inputs digest in the given diagram/SVG plans (what the artifact store must keep)."""
+    return {inputs for plan in plans for _, inputs, _ in plan.values()}
+
+
+def diagram_jobs(args: argparse.Namespace, diagram_plan, svg_plan, epoch: int | None) -> List[Tuple[str, Path, str, object, Tuple[object, ...]]]:
+    """(manifest key, output, inputs digest, render fn, fn args) for the diagrams the --format list uses."""
+    jobs = []
+    if "docx" in args.format:
+        for name, (path, inputs, spec) in diagram_plan.items():
+            fn_args = (spec, path, args.diagram_backend, epoch is not None, args.image_dpi)
+            jobs.append((f"diagram:{name}", path, inputs, render_diagram, fn_args))
+    if {"md", "html"} & set(args.format):
+        for name, (path, inputs, spec) in svg_plan.items():
+            jobs.append((f"svg:{name}", path, inputs, write_svg, (spec, path)))
+    return jobs
+
+
+def plan_diagrams(
+    assets_dir: Path,
+    gen_digest: str = "",
+    symbols: SymbolTable | None = None,
+    backend: str = "matplotlib",
+    menus: List[Menu] | None = None,
+    image_dpi: int = DEFAULT_IMAGE_DPI,
+) -> Dict[str, Tuple[Path, str, Dict[str, object]]]:
+    """
+    Map diagram name -> (output path, inputs digest, spec).
+
+    Notes:
+      - Documents embedding a diagram fold its digest into their own cache key.
+      - Rendering is left to the caller so it can be cached and parallelised.
+      - The renderer the backend resolves to (diagram_renderer) and the image
+        dpi are part of the digest; changing either redraws.
+    """
+    renderer = diagram_renderer(backend)
+    return {
+        name: (assets_dir / f"{name}.png", digest_values(gen_digest, renderer, image_dpi, spec), spec)
+        for name, spec in diagram_specs(symbols, menus).items()
+    }
+
 
+def plan_svgs(
+    assets_dir: Path,
+    gen_digest: str = "",
+    symbols: SymbolTable | None = None,
+    menus: List[Menu] | None = None,
+) -> Dict[str, Tuple[Path, str, Dict[str, object]]]:
+    """Like plan_diagrams, for the SVGs the Markdown/HTML manuals link (svg:* tasks)."""
+    return {
+        name: (assets_dir / f"{name}.svg", digest_values(gen_digest, "svg-file", spec), spec)
+        for name, spec in diagram_specs(symbols, menus).items()
+    }
 
-def create_user_manual(out_dir: Path, diagrams: Dict[str, Path], snapshot_label: str, today: _dt.date) -> Path:
-    doc = Document()
-    set_doc_styles(doc)
-    add_title(doc, "Fouchger Homelab", f"User Manual (v0.1) | {today.strftime('%d %B %Y')}")
 
-    doc.add_paragraph(
+# -----------------------------
+# Manual generation
+# -----------------------------
+
+def bash_sources(repo: Path, excludes: Sequence[str] = EXCLUDES) -> RepoWalk:
+    """Bash files scanned for the Developer Manual (*.sh plus bin/homelab), ignore-aware."""
+    return walk_repo(repo, lambda rel: rel.endswith(".sh") or rel == "bin/homelab", excludes=excludes)
+
+
+def build_function_index(repo: Path, cache: IndexCache | None = None, excludes: Sequence[str] = EXCLUDES) -> SymbolTable:
+    """
+    Build the symbol table for the Developer Manual and diagrams.
+
+    Notes:
+      - Includes *.sh and bin/homelab, as listed by `git ls-files` in a git
+        checkout; otherwise a walk that skips .gitignore'd and excluded paths
+        (manuals/walker.py). symbols.skipped records how many were pruned.
+      - One pass per file: definitions with line numbers, source edges and calls.
+      - With an IndexCache only new or edited files are parsed; call
+        cache.save() afterwards to persist results and drop deleted files.
+    """
+    with phase("scan"):
+        walk = bash_sources(repo, excludes)
+    with phase("index"):
+        symbols = index_repo(repo, walk.files, cache)
+    symbols.skipped = walk.skipped
+    return symbols
+
+
+def create_user_manual(
+    out_dir: Path,
+    diagrams: Dict[str, Path],
+    snapshot_label: str,
+    today: _dt.date,
+    fmt: str = "docx",
+) -> Path:
+    w = make_writer(fmt, out_dir, "Fouchger_Homelab_User_Manual")
+    w.title("Fouchger Homelab", f"User Manual (v0.1) | {today.strftime('%d %B %Y')}")
+
+    w.para(
         "This manual explains how to install and operate the fouchger_homelab interactive CLI application "
         "on Debian/Ubuntu hosts (including Ubuntu 24.04+ LXC on Proxmox)."
     )
 
-    doc.add_heading("1. What the application does", level=1)
-    doc.add_paragraph(
+    w.heading("1. What the application does", 1)
+    w.para(
         "fouchger_homelab is an interactive, menu-driven CLI that helps you bootstrap and manage common tooling "
         "for a homelab environment. It provides guided flows for Git and GitHub configuration, a development server "
         "bootstrap path, an Ubuntu App Manager for selecting and applying packages and tools, and a debug area for session capture."
     )
 
-    doc.add_heading("2. Prerequisites", level=1)
+    w.heading("2. Prerequisites", 1)
     for bullet in [
         "A Debian/Ubuntu-based system. Ubuntu 24.04+ is the primary target for the App Manager flows.",
         "Network access for package installs and any third-party installers you choose to run.",
         "sudo access (or run as root) for installing packages and writing system-level changes.",
         "A terminal that can display dialog-style interfaces (the UI uses dialog under the hood).",
     ]:
-        doc.add_paragraph(bullet, style="List Bullet")
+        w.bullet(bullet)
 
-    doc.add_heading("3. Installation", level=1)
-    doc.add_paragraph("There are two common ways to run the tool: directly from a cloned repository, or via the one-liner installer referenced in the repo README.")
+    w.heading("3. Installation", 1)
+    w.para("There are two common ways to run the tool: directly from a cloned repository, or via the one-liner installer referenced in the repo README.")
 
-    doc.add_heading("3.1 Install from the repository", level=2)
+    w.heading("3.1 Install from the repository", 2)
     for step in [
         "Clone the repository to your target host.",
         "From the repo root, run: make menu",
         "If you do not have make installed, install it first (sudo apt-get install -y make) or run the entry point directly: ./bin/homelab",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("3.2 Install via installer script", level=2)
-    doc.add_paragraph(
+    w.heading("3.2 Install via installer script", 2)
+    w.para(
         "The README references a curl-based installer. Treat this as a privileged action and review the script "
         "before running it in production environments."
     )
-    doc.add_paragraph('Command: bash -c "$(curl -fsSL https://raw.githubusercontent.com/Fouchger/fouchger_homelab/main/install.sh)"')
+    w.para('Command: bash -c "$(curl -fsSL https://raw.githubusercontent.com/Fouchger/fouchger_homelab/main/install.sh)"')
 
-    doc.add_heading("4. First-run quick start", level=1)
+    w.heading("4. First-run quick start", 1)
     for step in [
         "Launch the application (make menu or ./bin/homelab).",
         "Select 'Git & Github Management' to configure your git identity and authenticate GitHub CLI (gh).",
@@ -368,43 +567,43 @@ def create_user_manual(out_dir: Path, diagrams: Dict[str, Path], snapshot_label:
         "Open 'Debug' to enable session capture if you want full terminal recording (optional).",
         "Use 'Ubuntu App Manager' to pick a profile, adjust selections, and then apply installs.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("5. Navigating the menus", level=1)
-    doc.add_paragraph("The current menu map is below. Menu options may be gated by feature flags stored in your state file.")
-    doc.add_picture(str(diagrams["menu_map"]), width=Inches(6.8))
+    w.heading("5. Navigating the menus", 1)
+    w.para("The current menu map is below. Menu options may be gated by feature flags stored in your state file.")
+    w.picture(diagrams["menu_map"])
 
-    doc.add_heading("6. Main menu options", level=1)
-    doc.add_heading("6.1 Git & GitHub Management", level=2)
-    doc.add_paragraph("Runs the developer authentication helper to set global git identity (safe-by-default) and authenticate GitHub CLI (gh).")
-    doc.add_paragraph("Tip: For non-interactive runs, supply environment variables such as GIT_USER_NAME, GIT_USER_EMAIL, and GITHUB_TOKEN.")
+    w.heading("6. Main menu options", 1)
+    w.heading("6.1 Git & GitHub Management", 2)
+    w.para("Runs the developer authentication helper to set global git identity (safe-by-default) and authenticate GitHub CLI (gh).")
+    w.para("Tip: For non-interactive runs, supply environment variables such as GIT_USER_NAME, GIT_USER_EMAIL, and GITHUB_TOKEN.")
 
-    doc.add_heading("6.2 Bootstrap Development Server", level=2)
-    doc.add_paragraph(
+    w.heading("6.2 Bootstrap Development Server", 2)
+    w.para(
         "Provides a guided flow for bootstrapping a dev server. One option downloads and runs a third-party "
         "Code-Server installer. The second option leads into the Ubuntu App Manager to install baseline tooling."
     )
-    doc.add_paragraph("Control: the tool will prompt before running third-party scripts.")
+    w.para("Control: the tool will prompt before running third-party scripts.")
 
-    doc.add_heading("6.3 Infrastructure and Workflows", level=2)
-    doc.add_paragraph(
+    w.heading("6.3 Infrastructure and Workflows", 2)
+    w.para(
         "These menu areas are wired for future capability modules (Proxmox templates, MikroTik integration, DNS services, questionnaires). "
         "They are feature-flagged and may display enablement instructions if disabled on the host."
     )
 
-    doc.add_heading("6.4 Debug", level=2)
-    doc.add_paragraph(
+    w.heading("6.4 Debug", 2)
+    w.para(
         "Includes controls for Layer 2 session capture via ptlog. When enabled, the tool will attempt to start ptlog "
         "automatically on next launch and provide status views and log tails."
     )
 
-    doc.add_heading("7. Ubuntu App Manager (step-by-step)", level=1)
-    doc.add_paragraph(
+    w.heading("7. Ubuntu App Manager (step-by-step)", 1)
+    w.para(
         "The App Manager helps you maintain a repeatable set of packages and tools for Ubuntu 24.04+ hosts, "
         "especially LXC containers. It stores selections and version pins in an env file and tracks installed-by-tool items using marker files."
     )
 
-    doc.add_heading("7.1 Apply a profile (replace selections)", level=2)
+    w.heading("7.1 Apply a profile (replace selections)", 2)
     for step in [
         "Open: Bootstrap Development Server (admin01) then 'Bootstrap server - Configs and Setup' to enter the App Manager menu.",
         "Choose 'Apply profile (replace selections)'.",
@@ -412,47 +611,47 @@ def create_user_manual(out_dir: Path, diagrams: Dict[str, Path], snapshot_label:
         "Confirm the action. This overwrites prior selections in app_install_list.env with the profile defaults.",
         "Optionally adjust selections using 'Change selections' before applying.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("7.2 Apply a profile (add to selections)", level=2)
+    w.heading("7.2 Apply a profile (add to selections)", 2)
     for step in [
         "Choose 'Apply profile (add to selections)'.",
         "Select a profile. The profile apps will be added to your current selection set.",
         "Review the updated selection list if prompted, then continue.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("7.3 Change selections", level=2)
+    w.heading("7.3 Change selections", 2)
     for step in [
         "Choose 'Change selections'.",
         "Tick or untick apps using the checklist.",
         "Save and return to the App Manager menu.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("7.4 Edit version pins", level=2)
+    w.heading("7.4 Edit version pins", 2)
     for step in [
         "Choose 'Edit version pins'.",
         "Set versions to 'latest' or a specific value (where supported).",
         "Save. Version pins are written to app_install_list.env and used by installers that support pinning.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("7.5 Apply install/uninstall", level=2)
+    w.heading("7.5 Apply install/uninstall", 2)
     for step in [
         "Choose 'Apply install/uninstall'.",
         "The tool will compute the delta between selected apps and currently installed-by-tool markers.",
         "Confirm to proceed. Package installs use nala when available (apt-get fallback).",
         "When complete, review the log file if anything failed.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("7.6 Audit which apps are installed", level=2)
-    doc.add_paragraph("Choose 'check which apps are installed' to see what the App Manager believes is installed, based on markers and strategy checks.")
+    w.heading("7.6 Audit which apps are installed", 2)
+    w.para("Choose 'check which apps are installed' to see what the App Manager believes is installed, based on markers and strategy checks.")
 
-    doc.add_heading("8. Where files are stored", level=1)
-    doc.add_picture(str(diagrams["data_model"]), width=Inches(6.8))
-    doc.add_paragraph("Key paths (defaults):")
+    w.heading("8. Where files are stored", 1)
+    w.picture(diagrams["data_model"])
+    w.para("Key paths (defaults):")
     for b in [
         "~/.config/fouchger_homelab/state.env (feature flags, host settings)",
         "~/.config/fouchger_homelab/app_manager/app_install_list.env (selections and version pins)",
@@ -460,68 +659,68 @@ def create_user_manual(out_dir: Path, diagrams: Dict[str, Path], snapshot_label:
         "~/.config/fouchger_homelab/state/markers (installed-by-tool markers)",
         "~/.ptlog/current.log (optional Layer 2 session capture log)",
     ]:
-        doc.add_paragraph(b, style="List Bullet")
+        w.bullet(b)
 
-    doc.add_heading("9. Troubleshooting", level=1)
+    w.heading("9. Troubleshooting", 1)
     for item in [
         ("The UI does not open", "Ensure dialog is installed and you are in an interactive terminal. If needed, install dialog: sudo apt-get install -y dialog."),
         ("Installs fail due to permissions", "Run as root or ensure sudo is available and your user is in the sudo group."),
         ("GitHub auth fails", "Check gh is installed and your token has appropriate scopes for your workflow. For GHES, ensure GH_HOST is set."),
         ("Session capture does not start", "Install ptlog and enable the feature flag: state_set FEATURE_SESSION_CAPTURE 1, then relaunch the app."),
     ]:
-        doc.add_paragraph(f"{item[0]}: {item[1]}", style="List Bullet")
+        w.bullet(f"{item[0]}: {item[1]}")
 
-    doc.add_heading("10. Operational guardrails", level=1)
-    doc.add_paragraph(
+    w.heading("10. Operational guardrails", 1)
+    w.para(
         "The tool aims to be safe-by-default, but it can install packages and run scripts with elevated privileges. "
         "In a corporate environment, treat it like any other automation: review changes, pin versions when stability matters, "
         "and apply in lower environments first."
     )
 
-    add_footer_note(doc, f"Document generated from repository snapshot: {snapshot_label}.")
-    out_path = out_dir / "Fouchger_Homelab_User_Manual.docx"
-    doc.save(out_path)
-    return out_path
+    w.footer(f"Document generated from repository snapshot: {snapshot_label}.")
+    with phase(f"save:{w.out_path.name}"):
+        return w.save()
 
 
-def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path], snapshot_label: str, today: _dt.date) -> Path:
-    func_index = build_function_index(repo)
+def create_developer_manual(
+    out_dir: Path,
+    repo: Path,
+    diagrams: Dict[str, Path],
+    snapshot_label: str,
+    today: _dt.date,
+    symbols: SymbolTable | None = None,
+    api_style: str = "table",
+    fmt: str = "docx",
+) -> Path:
+    symbols = symbols if symbols is not None else build_function_index(repo)
 
-    doc = Document()
-    set_doc_styles(doc)
-    add_title(doc, "Fouchger Homelab", f"Developer Manual (v0.1) | {today.strftime('%d %B %Y')}")
+    w = make_writer(fmt, out_dir, "Fouchger_Homelab_Developer_Manual")
+    w.title("Fouchger Homelab", f"Developer Manual (v0.1) | {today.strftime('%d %B %Y')}")
 
-    doc.add_paragraph(
+    w.para(
         "This manual describes how the application is structured, how the codebase works, and how to extend it safely. "
         "It also includes a practical code review and recommended improvements."
     )
 
-    doc.add_heading("1. Architectural overview", level=1)
-    doc.add_paragraph(
+    w.heading("1. Architectural overview", 1)
+    w.para(
         "fouchger_homelab is a Bash-based, menu-driven CLI. The application follows a layered structure: entry point, "
         "library layer, menu routing, action orchestration, and optional feature modules. State and configuration are "
         "externalised to user-space files for portability."
     )
-    doc.add_picture(str(diagrams["architecture"]), width=Inches(6.8))
+    w.picture(diagrams["architecture"])
 
-    doc.add_heading("2. Repository layout", level=1)
-    tbl = doc.add_table(rows=1, cols=2)
-    hdr = tbl.rows[0].cells
-    hdr[0].text = "Path"
-    hdr[1].text = "Purpose"
-    for p, purpose in [
+    w.heading("2. Repository layout", 1)
+    w.table(("Path", "Purpose"), [
         ("bin/homelab", "Entrypoint: loads libs and modules, optionally starts session capture, opens main menu."),
         ("lib/*.sh", "Reusable libraries: paths, logging, core helpers, UI wrappers, feature flags, menu routing."),
         ("scripts/core/*.sh", "Operational scripts and feature modules invoked from menus."),
         ("tests/*", "Lightweight tests (currently repo root resolution)."),
         ("install.sh / Makefile", "Installer and developer convenience targets."),
-    ]:
-        row = tbl.add_row().cells
-        row[0].text = p
-        row[1].text = purpose
+    ])
 
-    doc.add_heading("3. Startup sequence", level=1)
-    doc.add_paragraph("On launch, bin/homelab anchors REPO_ROOT, loads libraries, loads feature modules, optionally starts Layer 2 capture, then enters main_menu().")
+    w.heading("3. Startup sequence", 1)
+    w.para("On launch, bin/homelab anchors REPO_ROOT, loads libraries, loads feature modules, optionally starts Layer 2 capture, then enters main_menu().")
     for step in [
         "Resolve and export REPO_ROOT.",
         "Source lib/modules.sh then call homelab_load_lib (sources lib/paths.sh, logging, core, run, state, common, ui, features, actions, menu).",
@@ -529,9 +728,9 @@ def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path]
         "If FEATURE_SESSION_CAPTURE is enabled, attempt to start ptlog and show status.",
         "Call main_menu (lib/menu.sh), which initialises UI and enters a selection loop.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("4. Design principles used in the codebase", level=1)
+    w.heading("4. Design principles used in the codebase", 1)
     for b in [
         "Strict mode (set -Eeuo pipefail) with controlled, explicit defaults.",
         "Best-effort optional modules: missing files do not break core runtime.",
@@ -539,52 +738,45 @@ def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path]
         "State externalisation: persist settings and selections under ~/.config/fouchger_homelab instead of inside the repo.",
         "Marker-based safety: uninstall operations should target only items installed by this tool.",
     ]:
-        doc.add_paragraph(b, style="List Bullet")
+        w.bullet(b)
 
-    doc.add_heading("5. UI framework and menu design", level=1)
-    doc.add_paragraph("The UI uses wrapper functions in lib/ui.sh to avoid scattering direct dialog calls through the code. lib/menu.sh focuses on navigation and delegates work to action_* functions (or scripts) to keep responsibilities clean.")
-    doc.add_paragraph("Current menu map:")
-    doc.add_picture(str(diagrams["menu_map"]), width=Inches(6.8))
+    w.heading("5. UI framework and menu design", 1)
+    w.para("The UI uses wrapper functions in lib/ui.sh to avoid scattering direct dialog calls through the code. lib/menu.sh focuses on navigation and delegates work to action_* functions (or scripts) to keep responsibilities clean.")
+    w.para("Current menu map:")
+    w.picture(diagrams["menu_map"])
 
-    doc.add_heading("6. State, configuration, and data model", level=1)
-    doc.add_paragraph("The project uses dotenv-style env files for persistence. This keeps the runtime dependency footprint low and works well in LXC environments.")
-    doc.add_picture(str(diagrams["data_model"]), width=Inches(6.8))
+    w.heading("6. State, configuration, and data model", 1)
+    w.para("The project uses dotenv-style env files for persistence. This keeps the runtime dependency footprint low and works well in LXC environments.")
+    w.picture(diagrams["data_model"])
 
-    doc.add_heading("7. App Manager internals", level=1)
-    doc.add_paragraph(
+    w.heading("7. App Manager internals", 1)
+    w.para(
         "scripts/core/app_manager.sh is a self-contained module that exposes app_manager_menu. "
         "It maintains a catalogue of apps (APP_CATALOGUE) and a set of profiles that map to app keys. "
         "Selections are persisted to app_install_list.env as APP_<KEY>=0/1 along with version variables."
     )
 
-    doc.add_heading("8. API reference (functions and entry points)", level=1)
-    doc.add_paragraph(
-        "This reference is generated from the current repository snapshot and lists Bash functions discovered in each file. "
+    w.heading("8. API reference (functions and entry points)", 1)
+    w.para(
+        "This reference is generated from the current repository snapshot and lists Bash functions discovered in each file, "
+        "with the line they are defined on, the functions that call them, and the repo functions they call. "
         "Use it as a navigation aid rather than a formal interface contract."
     )
+    with phase("api_reference"):
+        w.api_reference(symbols, api_style)
 
-    for rel, fns in sorted(func_index.items()):
-        doc.add_heading(rel, level=2)
-        if not fns:
-            doc.add_paragraph("No Bash functions detected.", style="List Bullet")
-            continue
-        for fn in fns[:60]:
-            doc.add_paragraph(fn, style="List Bullet")
-        if len(fns) > 60:
-            doc.add_paragraph(f"(Truncated: {len(fns)} total functions in this file.)")
-
-    doc.add_heading("9. Setup and configuration", level=1)
-    doc.add_heading("9.1 Local development setup (Ubuntu)", level=2)
+    w.heading("9. Setup and configuration", 1)
+    w.heading("9.1 Local development setup (Ubuntu)", 2)
     for step in [
         "Install prerequisites: git, make, dialog (and optionally gh).",
         "Clone the repo and run make menu to verify the UI starts.",
         "Run make executable (or scripts/core/make-executable.sh) after pulling changes on systems that strip executable bits.",
         "Use scripts/core/bootstrap.sh for minimal bootstrap on fresh hosts.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("10. Tutorials and guides", level=1)
-    doc.add_heading("10.1 Add a new main menu item", level=2)
+    w.heading("10. Tutorials and guides", 1)
+    w.heading("10.1 Add a new main menu item", 2)
     for step in [
         "Implement a new script or action function (prefer scripts/<area>/... for larger features).",
         "Expose an action_* wrapper in lib/actions.sh if it improves decoupling.",
@@ -592,10 +784,10 @@ def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path]
         "If the feature is host-dependent, gate it behind feature_require in lib/features.sh.",
         "Update documentation and add a smoke test if possible.",
     ]:
-        doc.add_paragraph(step, style="List Number")
+        w.step(step)
 
-    doc.add_heading("11. Code review findings and recommendations", level=1)
-    doc.add_heading("11.1 What is working well", level=2)
+    w.heading("11. Code review findings and recommendations", 1)
+    w.heading("11.1 What is working well", 2)
     for b in [
         "Consistent strict-mode usage across most files improves runtime safety.",
         "Clear separation of menu routing (lib/menu.sh) from operations (lib/actions.sh and scripts).",
@@ -603,9 +795,9 @@ def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path]
         "Two-layer logging is a strong operational pattern for troubleshooting in homelabs.",
         "App Manager catalogue and profile approach is scalable for repeatable builds.",
     ]:
-        doc.add_paragraph(b, style="List Bullet")
+        w.bullet(b)
 
-    doc.add_heading("11.2 Key risks and improvement opportunities", level=2)
+    w.heading("11.2 Key risks and improvement opportunities", 2)
     for b in [
         "Third-party script execution: bootstrap flows may run external curl|bash installers. Consider pinning to a specific commit/tag, logging the exact source URL, and requiring explicit acknowledgement.",
         "Dependency detection: dialog availability is assumed. Consider a preflight that checks for dialog and offers to install it (or falls back to a non-UI mode).",
@@ -613,15 +805,15 @@ def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path]
         "Idempotency and rollback: repo additions benefit from explicit cleanup paths and backup of repo list files.",
         "Testing: add a lightweight CI check (bash -n, load order, temp HOME env write).",
     ]:
-        doc.add_paragraph(b, style="List Bullet")
+        w.bullet(b)
 
-    doc.add_heading("12. Code commenting and file header standard", level=1)
-    doc.add_paragraph(
+    w.heading("12. Code commenting and file header standard", 1)
+    w.para(
         "To keep the codebase consistent, use a standard header block at the top of each script and capture: filename, purpose, usage, "
         "key assumptions, and maintainer. Keep function-level comments focused on why and constraints rather than restating what the code does."
     )
-    doc.add_paragraph("Recommended header template:")
-    doc.add_paragraph(
+    w.para("Recommended header template:")
+    w.code(
         textwrap.dedent(
             """\
             #!/usr/bin/env bash
@@ -637,26 +829,26 @@ def create_developer_manual(out_dir: Path, repo: Path, diagrams: Dict[str, Path]
         )
     )
 
-    add_footer_note(doc, f"Document generated from repository snapshot: {snapshot_label}.")
-    out_path = out_dir / "Fouchger_Homelab_Developer_Manual.docx"
-    doc.save(out_path)
-    return out_path
+    w.footer(f"Document generated from repository snapshot: {snapshot_label}.")
+    with phase(f"save:{w.out_path.name}"):
+        return w.save()
 
 
-def create_runbook(out_dir: Path, snapshot_label: str, today: _dt.date) -> Path:
-    doc = Document()
-    set_doc_styles(doc)
+def create_runbook(
+    out_dir: Path, snapshot_label: str, today: _dt.date, fmt: str = "docx", run_logs: RunLogs | None = None
+) -> Path:
+    w = make_writer(fmt, out_dir, "Fouchger_Homelab_Runbook")
 
-    doc.add_heading("Fouchger Homelab – Operational Runbook", level=0)
-    doc.add_paragraph(f"Quick reference for day-to-day operations | {today.strftime('%d %B %Y')}")
+    w.heading("Fouchger Homelab – Operational Runbook", 0)
+    w.para(f"Quick reference for day-to-day operations | {today.strftime('%d %B %Y')}")
 
-    doc.add_heading("1. Purpose", level=1)
-    doc.add_paragraph(
+    w.heading("1. Purpose", 1)
+    w.para(
         "This runbook provides a concise, operational view of fouchger_homelab for administrators. "
         "It is intended for repeatable day-to-day use, incident response, and first-line troubleshooting."
     )
 
-    doc.add_heading("2. Common daily tasks", level=1)
+    w.heading("2. Common daily tasks", 1)
     for t in [
         "Launch the tool: make menu or ./bin/homelab",
         "Update installed tooling: Ubuntu App Manager → Apply install/uninstall",
@@ -664,9 +856,9 @@ def create_runbook(out_dir: Path, snapshot_label: str, today: _dt.date) -> Path:
         "Bootstrap a new dev host: Bootstrap Development Server (admin01)",
         "Verify Git/GitHub auth: Git & GitHub Management",
     ]:
-        doc.add_paragraph(t, style="List Bullet")
+        w.bullet(t)
 
-    doc.add_heading("3. Pre-flight checklist (before changes)", level=1)
+    w.heading("3. Pre-flight checklist (before changes)", 1)
     for c in [
         "Confirm you are on the correct host or container",
         "Ensure network connectivity (apt repositories, GitHub, third-party repos)",
@@ -674,10 +866,10 @@ def create_runbook(out_dir: Path, snapshot_label: str, today: _dt.date) -> Path:
         "Confirm sudo access",
         "Optional: enable session capture for auditability",
     ]:
-        doc.add_paragraph(c, style="List Bullet")
+        w.bullet(c)
 
-    doc.add_heading("4. Where to check when things go wrong", level=1)
-    doc.add_paragraph("Primary locations:")
+    w.heading("4. Where to check when things go wrong", 1)
+    w.para("Primary locations:")
     for p in [
         "~/.config/fouchger_homelab/logs/ (general runtime logs)",
         "~/.config/fouchger_homelab/app_manager/app-manager.log (App Manager actions)",
@@ -685,9 +877,9 @@ def create_runbook(out_dir: Path, snapshot_label: str, today: _dt.date) -> Path:
         "~/.config/fouchger_homelab/state/markers/ (installed-by-tool indicators)",
         "~/.ptlog/current.log (if session capture is enabled)",
     ]:
-        doc.add_paragraph(p, style="List Bullet")
+        w.bullet(p)
 
-    doc.add_heading("5. Common issues and fast recovery", level=1)
+    w.heading("5. Common issues and fast recovery", 1)
     for title, fix in [
         ("UI does not open", "Install dialog and re-run the tool. sudo apt-get install -y dialog"),
         ("Package install failed", "Re-run Apply install/uninstall. Check app-manager.log for the failing package."),
@@ -695,101 +887,941 @@ def create_runbook(out_dir: Path, snapshot_label: str, today: _dt.date) -> Path:
         ("Tool tries to uninstall something critical", "Stop immediately. Verify marker files before continuing."),
         ("Session capture missing", "Enable FEATURE_SESSION_CAPTURE and restart the tool."),
     ]:
-        doc.add_paragraph(f"{title}: {fix}", style="List Bullet")
+        w.bullet(f"{title}: {fix}")
 
-    doc.add_heading("6. Safe operating guardrails", level=1)
+    w.heading("6. Safe operating guardrails", 1)
     for g in [
         "Treat this tool as privileged automation; review prompts carefully.",
         "Avoid running bootstrap actions repeatedly on the same host unless intended.",
         "Prefer profiles and version pins for stable environments.",
         "Test changes in a non-production container or VM first.",
     ]:
-        doc.add_paragraph(g, style="List Bullet")
+        w.bullet(g)
 
-    doc.add_heading("7. Escalation and next steps", level=1)
-    doc.add_paragraph(
+    w.heading("7. Escalation and next steps", 1)
+    w.para(
         "If an issue cannot be resolved quickly: stop further changes, collect logs, and review the Developer Manual for deeper diagnostics. "
         "For structural issues, raise a change to the codebase rather than applying manual fixes."
     )
 
-    add_footer_note(doc, f"Document generated from repository snapshot: {snapshot_label}.")
-    out_path = out_dir / "Fouchger_Homelab_Runbook.docx"
-    doc.save(out_path)
-    return out_path
+    if run_logs is not None and run_logs.stats is not None:
+        add_run_log_chapter(w, run_logs)
+
+    w.footer(f"Document generated from repository snapshot: {snapshot_label}.")
+    with phase(f"save:{w.out_path.name}"):
+        return w.save()
+
+
+def add_run_log_chapter(w, run_logs: RunLogs) -> None:
+    """Runbook chapter 8: what the run logs say about recent operations (--run-logs)."""
+    stats = run_logs.stats
+    assert stats is not None
+    where = str(run_logs.log_dir).replace(str(Path.home()), "~", 1)
+
+    w.heading("8. Operational analytics (run logs)", 1)
+    if not stats.runs:
+        w.para(f"No run logs were found under {where}.")
+        return
+    w.para(
+        f"Aggregated from {stats.runs} runs ({stats.files} log files, including rotated backups) under {where}. "
+        f"{stats.failed} runs failed ({100 * stats.failed / stats.runs:.1f}%). Unfinished runs were interrupted "
+        "or still running when the logs were read. Durations span each run's first and last log line."
+    )
+
+    w.heading("8.1 Runs per component", 2)
+    w.table(["Component", "Runs", "Failed", "Failure rate", "Unfinished", "Mean duration", "Max duration"], component_rows(stats))
+
+    w.heading("8.2 Most frequent errors and warnings", 2)
+    top = stats.top_messages()
+    if not top:
+        w.para("No ERROR or WARN lines were logged.")
+        return
+    w.para("Numbers in messages are shown as # so repeats of the same problem are counted together.")
+    w.table(["Level", "Count", "Message"], [(level, str(count), msg) for level, msg, count in top])
 
 
 # -----------------------------
 # Optional PDF export
 # -----------------------------
 
-def export_pdf_with_libreoffice(docx_path: Path, pdf_dir: Path) -> Path | None:
+def export_pdf_with_libreoffice(docx_path: Path, pdf_dir: Path, *, isolated: bool = False) -> Path | None:
     """
     Convert DOCX to PDF using LibreOffice (soffice) if available.
 
     Notes:
       - This is the most portable approach in Linux environments.
       - If soffice isn't installed, we skip PDF generation cleanly.
+      - isolated=True gives the conversion its own throwaway user profile.
+        Concurrent soffice processes sharing one profile block on its lock
+        (or silently hand the job to the first instance), so parallel builds
+        must use this.
     """
     soffice = shutil.which("soffice")
     if not soffice:
         return None
 
     ensure_dir(pdf_dir)
-    run([soffice, "--headless", "--convert-to", "pdf", "--outdir", str(pdf_dir), str(docx_path)])
+    cmd = [soffice, "--headless", "--convert-to", "pdf", "--outdir", str(pdf_dir), str(docx_path)]
+    if not isolated:
+        run(cmd)
+    else:
+        with tempfile.TemporaryDirectory(prefix="homelab-soffice-") as profile:
+            run([cmd[0], f"-env:UserInstallation={Path(profile).as_uri()}", *cmd[1:]])
     return pdf_dir / (docx_path.stem + ".pdf")
 
 
+def export_pdfs_batch(docx_paths: List[Path], pdf_dir: Path) -> Dict[Path, float] | None:
+    """
+    Convert several DOCX files to PDF in a single LibreOffice session.
+
+    Returns:
+      Map of PDF path -> seconds spent on that file, or None if soffice is missing.
+
+    Notes:
+      - One soffice start-up (profile load, UNO bring-up) is paid for the whole
+        batch instead of once per document.
+      - soffice prints one "convert ... -> ..." line as each file finishes; the
+        gap between lines is the per-file cost. The first file also carries
+        the session start-up time.
+    """
+    soffice = shutil.which("soffice")
+    if not soffice:
+        return None
+    if not docx_paths:
+        return {}
+
+    ensure_dir(pdf_dir)
+    cmd = [soffice, "--headless", "--convert-to", "pdf", "--outdir", str(pdf_dir), *map(str, docx_paths)]
+    timings: Dict[Path, float] = {}
+    output: List[str] = []
+
+    mark = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        output.append(line)
+        m = re.match(r"convert .+ -> (.+?\.pdf)", line.strip())
+        if m:
+            now = time.perf_counter()
+            timings[Path(m.group(1))] = now - mark
+            mark = now
+    proc.wait()
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Command failed ({proc.returncode}): {' '.join(cmd)}\nOUTPUT:\n{''.join(output)}")
+
+    expected = [pdf_dir / (p.stem + ".pdf") for p in docx_paths]
+    missing = [p for p in expected if not p.exists()]
+    if missing:
+        raise RuntimeError(f"soffice finished but did not write: {', '.join(map(str, missing))}\nOUTPUT:\n{''.join(output)}")
+    # Fall back to an even split if soffice did not report per-file lines.
+    if len(timings) < len(expected):
+        total = time.perf_counter() - mark + sum(timings.values())
+        timings = {p: total / len(expected) for p in expected}
+    return {p: timings.get(p, 0.0) for p in expected}
+
+
 # -----------------------------
-# Main
+# Build planning (no rendering imports)
 # -----------------------------
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Generate fouchger_homelab manuals and diagrams.")
-    parser.add_argument("--repo", type=Path, default=Path.cwd(), help="Path to repo root (default: current directory)")
-    parser.add_argument("--out", type=Path, default=Path.cwd(), help="Output directory for docs and assets")
-    parser.add_argument("--snapshot-label", type=str, default=None, help="Label to embed in footers (default: repo name + date)")
-    args = parser.parse_args()
+def build_manual(builder, builder_args: Tuple[object, ...], epoch: int | None = None) -> Path:
+    """
+    Run a create_* builder and, for reproducible DOCX builds, normalise the zip.
 
-    repo = args.repo.resolve()
-    out_dir = args.out.resolve()
+    Notes:
+      - Module-level so the pipeline can ship it to a worker process.
+    """
+    out_path = builder(*builder_args)
+    if epoch is not None and out_path.suffix == ".docx":
+        normalize_docx(out_path, epoch)
+    return out_path
 
+
+def check_repo(repo: Path) -> Tuple[List[str], List[str]]:
+    """
+    Validate the repo layout the generator relies on.
+
+    Returns:
+      (errors, warnings). Errors stop a build; warnings mean some content
+      (for example the bin/homelab entry in the API reference) will be missing.
+    """
     if not repo.exists():
-        die(f"Repo path does not exist: {repo}")
+        return [f"Repo path does not exist: {repo}"], []
+
+    errors: List[str] = []
+    warnings: List[str] = []
     if not (repo / "lib").exists() or not (repo / "bin").exists():
-        die(f"Repo path does not look like the expected project root (missing lib/ or bin/): {repo}")
+        errors.append(f"Repo path does not look like the expected project root (missing lib/ or bin/): {repo}")
+    for rel in ("bin/homelab", "lib/menu.sh", "scripts/core"):
+        if not (repo / rel).exists():
+            warnings.append(f"Expected path not found: {rel}")
+    return errors, warnings
+
+
+def plan_manuals(
+    repo: Path,
+    out_dir: Path,
+    diagram_plan: Dict[str, Tuple[Path, str, Dict[str, object]]],
+    snapshot_label: str,
+    today: _dt.date,
+    gen_digest: str,
+    symbols: SymbolTable,
+    epoch: int | None = None,
+    api_style: str = "table",
+    formats: Tuple[str, ...] = ("docx",),
+    svg_plan: Dict[str, Tuple[Path, str, Dict[str, object]]] | None = None,
+    run_logs: RunLogs | None = None,
+) -> List[Tuple[str, Path, str, object, Tuple[object, ...], Tuple[str, ...]]]:
+    """
+    Describe each manual as (key, output, inputs digest, builder, builder args, diagram deps).
 
-    ensure_dir(out_dir)
-    assets_dir = out_dir / "manual_assets"
-    pdf_dir = out_dir / "manual_out"
+    Notes:
+      - One entry per manual and format; keys are "<format>:<manual>".
+      - DOCX embeds the PNG diagrams (diagram:* tasks); Markdown and HTML link
+        the SVGs (svg:* tasks), so they never need matplotlib.
+      - Computing the digests only reads source files; nothing is rendered here.
+      - With run_logs, the Runbook digest covers the log listing (names, sizes,
+        mtimes); the logs themselves are only read if the Runbook is stale.
+    """
+    common = (gen_digest, snapshot_label, today.isoformat(), epoch)
+    out = []
+    for fmt in formats:
+        plan, task = (diagram_plan, "diagram") if fmt == "docx" else (svg_plan, "svg")
+        diagrams = {name: path for name, (path, _, _) in plan.items()}
+        d = {name: inputs for name, (_, inputs, _) in plan.items()}
+        suffix = SUFFIXES[fmt]
+        out += [
+            (
+                f"{fmt}:user_manual", out_dir / f"Fouchger_Homelab_User_Manual{suffix}",
+                digest_values(*common, fmt, d["menu_map"], d["data_model"]),
+                create_user_manual, (out_dir, diagrams, snapshot_label, today, fmt),
+                (f"{task}:menu_map", f"{task}:data_model"),
+            ),
+            (
+                f"{fmt}:developer_manual", out_dir / f"Fouchger_Homelab_Developer_Manual{suffix}",
+                digest_values(*common, fmt, d, symbols.digests, api_style),
+                create_developer_manual, (out_dir, repo, diagrams, snapshot_label, today, symbols, api_style, fmt),
+                tuple(f"{task}:{name}" for name in diagrams),
+            ),
+            (
+                f"{fmt}:runbook", out_dir / f"Fouchger_Homelab_Runbook{suffix}",
+                digest_values(*common, fmt, run_logs.digest if run_logs else None),
+                create_runbook, (out_dir, snapshot_label, today, fmt, run_logs),
+                (),
+            ),
+        ]
+    return out
 
-    today = _dt.date.today()
-    snapshot_label = args.snapshot_label or f"{repo.name} ({today.strftime('%d %B %Y')})"
 
-    diagrams = generate_diagrams(assets_dir)
+def plan_project_index(out_dir: Path, gen_digest: str, symbols: SymbolTable) -> Tuple[str, Path, Path, str]:
+    """(key, JSON path, SQLite path, inputs digest) for the machine-readable project index."""
+    inputs = digest_values(gen_digest, symbols.digests)
+    return "project_index", out_dir / PROJECT_JSON_NAME, out_dir / PROJECT_SQLITE_NAME, inputs
 
-    user_docx = create_user_manual(out_dir, diagrams, snapshot_label, today)
-    dev_docx = create_developer_manual(out_dir, repo, diagrams, snapshot_label, today)
-    runbook_docx = create_runbook(out_dir, snapshot_label, today)
 
-    # Optional PDF export
-    exported = []
-    for docx in [user_docx, dev_docx, runbook_docx]:
-        pdf = export_pdf_with_libreoffice(docx, pdf_dir)
-        if pdf:
-            exported.append(pdf)
+def project_index_fresh(manifest: BuildManifest, plan: Tuple[str, Path, Path, str]) -> bool:
+    key, json_path, sqlite_path, inputs = plan
+    return sqlite_path.exists() and manifest.is_fresh(key, json_path, inputs)
 
-    print("Generated DOCX:")
-    print(f"  - {user_docx}")
-    print(f"  - {dev_docx}")
-    print(f"  - {runbook_docx}")
+
+def list_outputs(manifest: BuildManifest, diagram_plan, svg_plan, manuals, project_index, pdf_dir: Path, have_soffice: bool) -> None:
+    """Print every output and whether the next build would regenerate it."""
+    def show(state: str, path: Path) -> None:
+        print(f"  [{state:<9}] {path}")
+
+    formats = {key.partition(":")[0] for key, *_ in manuals}
+    print("Diagrams:")
+    if "docx" in formats:
+        for name, (path, inputs, _) in diagram_plan.items():
+            show("fresh" if manifest.is_fresh(f"diagram:{name}", path, inputs) else "build", path)
+    if formats & {"md", "html"}:
+        for name, (path, inputs, _) in svg_plan.items():
+            show("fresh" if manifest.is_fresh(f"svg:{name}", path, inputs) else "build", path)
+
+    print("Manuals:")
+    stale_docx = set()
+    for key, out_path, inputs, *_ in manuals:
+        fresh = manifest.is_fresh(key, out_path, inputs)
+        if not fresh:
+            stale_docx.add(out_path)
+        show("fresh" if fresh else "build", out_path)
+
+    print("Project index:")
+    state = "fresh" if project_index_fresh(manifest, project_index) else "build"
+    show(state, project_index[1])
+    show(state, project_index[2])
+
+    print("PDF:")
+    for _, out_path, *_ in manuals:
+        if out_path.suffix != ".docx":
+            continue
+        pdf_path = pdf_dir / (out_path.stem + ".pdf")
+        if out_path not in stale_docx and manifest.is_fresh(f"pdf:{out_path.stem}", pdf_path, digest_file(out_path)):
+            show("fresh", pdf_path)
+        else:
+            show("build" if have_soffice else "no-soffice", pdf_path)
+
+
+def select_targets(
+    targets: Iterable[str], manuals, diagram_keys: Sequence[str]
+) -> Tuple[set, set, bool]:
+    """
+    Resolve build targets to (manual keys, diagram keys, build the project index?).
+
+    Notes:
+      - A manual name ("runbook") selects it in every --format; a manual key
+        ("md:runbook") selects one. Manuals pull in the diagrams they embed.
+      - "diagrams" selects every diagram the formats use; "diagram:<name>" and
+        "svg:<name>" select one. "project_index" selects the JSON/SQLite index.
+    """
+    deps = {key: d for key, _, _, _, _, d in manuals}
+    manual_keys: set = set()
+    diagrams: set = set()
+    index = False
+    for target in targets:
+        if target == "project_index":
+            index = True
+        elif target == "diagrams":
+            diagrams.update(diagram_keys)
+        elif target in diagram_keys:
+            diagrams.add(target)
+        else:
+            hits = [key for key in deps if target in (key, key.split(":", 1)[1])]
+            if not hits:
+                names = sorted({key.split(":", 1)[1] for key in deps}) + sorted(deps) + ["project_index", "diagrams", *diagram_keys]
+                raise ValueError(f"unknown build target {target!r}; expected one of: {', '.join(names)}")
+            manual_keys.update(hits)
+    for key in manual_keys:
+        diagrams.update(deps[key])
+    return manual_keys, diagrams, index
+
+
+# -----------------------------
+# Main
+# -----------------------------
+
+def build_dates(args: argparse.Namespace) -> Tuple[int | None, _dt.date]:
+    """(zip timestamp epoch, document date) for a build starting now: SOURCE_DATE_EPOCH if set, else today."""
+    sde = source_date_epoch()
+    epoch = sde if sde is not None else (0 if args.reproducible else None)
+    return epoch, (epoch_date(sde) if sde is not None else _dt.date.today())
+
+
+def snapshot_label_for(args: argparse.Namespace, repo: Path, today: _dt.date) -> str:
+    return args.snapshot_label or f"{repo.name} ({today.strftime('%d %B %Y')})"
+
+
+def scan_excludes(args: argparse.Namespace, repo: Path, out_dir: Path) -> Tuple[str, ...]:
+    """EXCLUDES plus --exclude entries and the output directory when it is inside the repo."""
+    extra = [e.strip("/") for e in args.exclude]
+    if out_dir != repo and out_dir.is_relative_to(repo):
+        extra.append(out_dir.relative_to(repo).as_posix())
+    return EXCLUDES + tuple(e for e in extra if e not in EXCLUDES)
+
+
+def build_all(
+    args: argparse.Namespace,
+    repo: Path,
+    out_dir: Path,
+    jobs: int,
+    epoch: int | None,
+    today: _dt.date,
+    snapshot_label: str,
+    index_cache: IndexCache | None = None,
+    store: ArtifactStore | None = None,
+    targets: Iterable[str] | None = None,
+) -> Dict[Path, bool]:
+    """
+    Plan and run one build; outputs whose inputs are unchanged are skipped.
+
+    Returns:
+      Every output the build covered -> True if it was (re)generated.
+
+    Notes:
+      - --watch and ManualBuilder pass the same IndexCache on every rebuild
+        so unchanged scripts are not even re-read from the cache file.
+      - Rendered diagrams go through an ArtifactStore (default
+        <out>/artifact_cache), pruned afterwards to the digests this build
+        plans; build_worktrees() passes one shared store and prunes it itself.
+      - targets limits the build to some outputs (see select_targets); PDFs
+        follow the selected DOCX manuals.
+    """
+    if store is None:
+        store = ArtifactStore(out_dir / STORE_DIR)
+    assets_dir = out_dir / "manual_assets"
+    pdf_dir = out_dir / "manual_out"
+
+    timer = None
+    if args.timings or args.profile:
+        timer = PhaseTimer(out_dir / "profile" if args.profile else None)
+    prev_timer = activate(timer)
+    build_started = time.perf_counter()
+
+    manifest = BuildManifest(out_dir, force=args.force)
+    gen_digest = generator_digest()
+    have_soffice = shutil.which("soffice") is not None
+    if index_cache is None:
+        index_cache = IndexCache(out_dir / INDEX_CACHE_NAME, enabled=not args.force)
+    index_cache.reset_stats()
+    symbols = build_function_index(repo, index_cache, scan_excludes(args, repo, out_dir))
+    with phase("menus"):
+        menus = parse_menus(repo, symbols)
+    diagram_plan, svg_plan = plan_all_diagrams(args, assets_dir, gen_digest, symbols, menus, epoch)
+    formats = args.format
+    run_logs = None
+    if args.run_logs is not None:
+        with phase("run_logs:list"):
+            run_logs = find_run_logs(args.run_logs)
+    manuals = plan_manuals(
+        repo, out_dir, diagram_plan, snapshot_label, today, gen_digest, symbols, epoch, args.api_reference, formats, svg_plan,
+        run_logs,
+    )
+    project_index = plan_project_index(out_dir, gen_digest, symbols)
+    jobs_for_diagrams = diagram_jobs(args, diagram_plan, svg_plan, epoch)
+    wanted_diagrams = None
+    want_index = True
+    if targets is not None:
+        manual_keys, wanted_diagrams, want_index = select_targets(targets, manuals, [key for key, *_ in jobs_for_diagrams])
+        manuals = [m for m in manuals if m[0] in manual_keys]
+        jobs_for_diagrams = [job for job in jobs_for_diagrams if job[0] in wanted_diagrams]
+
+    if args.list_outputs:
+        list_outputs(manifest, diagram_plan, svg_plan, manuals, project_index, pdf_dir, have_soffice)
+        activate(prev_timer)
+        return {}
+
+    ensure_dir(out_dir)
+    ensure_dir(assets_dir)
+    index_cache.save()
+
+    pipeline = Pipeline(jobs, timer)
+    built: Dict[Path, bool] = {}
+    exported: Dict[Path, float | None] = {}
+    pdf_batch: List[Tuple[Path, str]] = []
+
+    # Diagrams: redraw only those whose spec changed, and only for formats that use them.
+    # Another build under the same store (another worktree) may already have rendered them.
+    rendered = {"rendered": 0, "reused": 0}
+    assets: Dict[Path, bool] = {}
+
+    def diagram_done(key: str, inputs: str, result: Tuple[Path, bool]) -> None:
+        path, reused = result
+        manifest.record(key, path, inputs)
+        rendered["reused" if reused else "rendered"] += 1
+        assets[path] = True
+
+    for key, path, inputs, fn, fn_args in jobs_for_diagrams:
+        assets[path] = False
+        if not manifest.is_fresh(key, path, inputs):
+            pipeline.add(Task(key, render_shared, (store, inputs, path, fn, fn_args, args.force), then=functools.partial(diagram_done, key, inputs)))
+
+    # Project index (JSON + SQLite): depends only on the scanned sources.
+    index_built = False
+    if want_index and not project_index_fresh(manifest, project_index):
+        def index_done(path: Path, k=project_index[0], d=project_index[3]) -> None:
+            nonlocal index_built
+            manifest.record(k, path, d)
+            index_built = True
+
+        pipeline.add(Task(project_index[0], write_project_index, (repo, symbols, project_index[1], project_index[2]), then=index_done))
+
+    # Run logs: streamed once for every stale Runbook format, before the builders are submitted.
+    log_scan_s = None
+    if run_logs is not None and any(
+        key.endswith(":runbook") and not manifest.is_fresh(key, out_path, inputs) for key, out_path, inputs, *_ in manuals
+    ):
+        started = time.perf_counter()
+        with phase("run_logs"):
+            run_logs.stats = scan_run_logs(run_logs, jobs)
+        log_scan_s = time.perf_counter() - started
+
+    # PDFs: inputs are the DOCX bytes; each conversion starts once its DOCX exists.
+    def schedule_pdf(docx: Path) -> None:
+        key = f"pdf:{docx.stem}"
+        pdf_path = pdf_dir / (docx.stem + ".pdf")
+        inputs = digest_file(docx)
+        if manifest.is_fresh(key, pdf_path, inputs):
+            exported[pdf_path] = None
+            return
+        if not have_soffice:
+            return
+        if args.pdf_mode == "batch":
+            pdf_batch.append((docx, inputs))
+            return
+
+        started = time.perf_counter()
+
+        def done(pdf: Path | None) -> None:
+            if pdf:
+                manifest.record(key, pdf, inputs)
+                manifest.save()
+                exported[pdf] = time.perf_counter() - started
+
+        convert = functools.partial(export_pdf_with_libreoffice, isolated=jobs > 1)
+        pipeline.add(Task(key, convert, (docx, pdf_dir), io=True, then=done))
+
+    # Manuals: each depends on the diagrams it embeds; only DOCX goes on to PDF.
+    for key, out_path, inputs, fn, fn_args, deps in manuals:
+        to_pdf = out_path.suffix == ".docx"
+        if manifest.is_fresh(key, out_path, inputs):
+            built[out_path] = False
+            if to_pdf:
+                schedule_pdf(out_path)
+            continue
+
+        def done(path: Path, k=key, d=inputs, to_pdf=to_pdf) -> None:
+            manifest.record(k, path, d)
+            manifest.save()
+            built[path] = True
+            if to_pdf:
+                schedule_pdf(path)
+
+        pipeline.add(Task(key, build_manual, (fn, fn_args, epoch), deps=deps, then=done))
+    try:
+        pipeline.run()
+        if pdf_batch:
+            with phase("pdf:batch"):
+                timings = export_pdfs_batch([docx for docx, _ in pdf_batch], pdf_dir) or {}
+            for docx, inputs in pdf_batch:
+                pdf_path = pdf_dir / (docx.stem + ".pdf")
+                if pdf_path in timings:
+                    manifest.record(f"pdf:{docx.stem}", pdf_path, inputs)
+                    exported[pdf_path] = timings[pdf_path]
+    finally:
+        manifest.save()
+    pruned = 0
+    if not store.shared:
+        with phase("store:prune"):
+            pruned = store.prune(plan_digests(diagram_plan, svg_plan))
+
+    st = index_cache.stats
+    print(
+        f"Function index: {len(symbols.files)} files "
+        f"(parsed {st['parsed']}, cached {st['stat_hits'] + st['hash_hits'] + st['shared_hits']}, dropped {st['removed']}; "
+        f"{symbols.skipped} ignored/excluded paths skipped)"
+    )
+    if rendered["reused"]:
+        print(f"Diagrams: {rendered['rendered']} rendered, {rendered['reused']} copied from the artifact cache")
+    if pruned:
+        print(f"Artifact cache: removed {pruned} entries no longer referenced")
+    if "docx" in formats:
+        pngs = [path for path, _, _ in diagram_plan.values() if path.exists()]
+        size = sum(p.stat().st_size for p in pngs)
+        print(f"Diagram assets: {len(pngs)} PNG, {size / 1024:.0f} KiB at {args.image_dpi} dpi on the page (each embedded once per DOCX)")
+    if run_logs is not None:
+        files = sum(len(paths) for _, paths in run_logs.runs)
+        scanned = "unchanged" if log_scan_s is None else f"scanned in {log_scan_s:.2f}s"
+        print(f"Run logs: {len(run_logs.runs)} runs in {files} files under {run_logs.log_dir} ({scanned})")
+    print("Generated manuals:")
+    for _, out_path, *_ in manuals:
+        print(f"  - {out_path}" + ("" if built.get(out_path) else " (unchanged)"))
+
+    if want_index:
+        print("Project index:")
+        for path in project_index[1:3]:
+            print(f"  - {path}" + ("" if index_built else " (unchanged)"))
 
     if exported:
         print("Generated PDF:")
-        for p in exported:
-            print(f"  - {p}")
-    else:
+        for path in sorted(exported):
+            secs = exported[path]
+            print(f"  - {path}" + (" (unchanged)" if secs is None else f" ({secs:.1f}s)"))
+    if not have_soffice and "docx" in formats:
         print("PDF export skipped (LibreOffice 'soffice' not found).")
 
+    if timer is not None:
+        activate(prev_timer)
+        total = time.perf_counter() - build_started
+        timer.write_json(out_dir / "timings.json", total_wall=round(total, 6), jobs=jobs)
+        print(f"Timings (total wall {total:.3f}s, exclusive per phase):")
+        print(timer.report())
+        print(f"  written to {out_dir / 'timings.json'}" + (f"; profiles in {out_dir / 'profile'}" if args.profile else ""))
+
+    outputs = {**assets, **built}
+    if want_index:
+        outputs.update({path: index_built for path in project_index[1:3]})
+    outputs.update({path: secs is not None for path, secs in exported.items()})
+    return outputs
+
+
+def _build_captured(args: argparse.Namespace, target: Tuple[Path, Path, str], jobs: int, epoch, today, index_cache, store) -> str:
+    """build_all for one worktree with its report captured (process-pool friendly)."""
+    repo, out_dir, label = target
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        build_all(args, repo, out_dir, jobs, epoch, today, label, index_cache, store)
+    return buf.getvalue()
+
+
+def worktree_out_dirs(repos: List[Path], out_root: Path) -> List[Path]:
+    """One output directory per repo under out_root, named after the checkout directory."""
+    out: List[Path] = []
+    used: set = set()
+    for repo in repos:
+        name, n = repo.name, 2
+        while name in used:
+            name, n = f"{repo.name}-{n}", n + 1
+        used.add(name)
+        out.append(out_root / name)
+    return out
+
+
+def build_worktrees(
+    args: argparse.Namespace,
+    repos: List[Path],
+    out_root: Path,
+    jobs: int,
+    epoch: int | None,
+    today: _dt.date,
+) -> None:
+    """
+    Build docs for several checkouts (for example every `git worktree`) in one run.
+
+    Notes:
+      - Each checkout gets <out>/<directory name>/ with its own manifest, so a
+        rerun only rebuilds what changed in that checkout.
+      - Indexing runs first, in this process, with one shared parse pool: a
+        file whose content is identical in several worktrees is parsed once.
+      - Every distinct diagram (by inputs digest) is rendered once into one
+        ArtifactStore under <out> before the builds start; the builds then
+        copy it instead of redrawing.
+      - With --jobs N the checkouts build in up to N worker processes; each
+        gets N // checkouts (at least 1) workers for its own pipeline.
+    """
+    pool: SharedParses = {}
+    store = ArtifactStore(out_root / STORE_DIR, shared=True)
+    keep: Set[str] = set()
+    gen_digest = generator_digest()
+    targets: List[Tuple[Path, Path, str]] = []
+    caches: List[IndexCache] = []
+    unique: Dict[str, Tuple[Path, object, Tuple[object, ...]]] = {}
+    parsed = shared = 0
+    for repo, out_dir in zip(repos, worktree_out_dirs(repos, out_root)):
+        errors, _ = check_repo(repo)
+        if errors:
+            print(f"WARN: skipping {repo}: {errors[0]}")
+            continue
+        cache = IndexCache(out_dir / INDEX_CACHE_NAME, enabled=not args.force, pool=pool)
+        symbols = build_function_index(repo, cache, scan_excludes(args, repo, out_dir))
+        plans = plan_all_diagrams(args, out_dir / "manual_assets", gen_digest, symbols, parse_menus(repo, symbols), epoch)
+        keep |= plan_digests(*plans)
+        for _, path, inputs, fn, fn_args in diagram_jobs(args, *plans, epoch):
+            unique.setdefault(inputs, (path, fn, fn_args))
+        parsed += cache.stats["parsed"]
+        shared += cache.stats["shared_hits"]
+        cache.pool = None  # not needed (or pickled) past indexing
+        targets.append((repo, out_dir, snapshot_label_for(args, repo, today)))
+        caches.append(cache)
+    if not targets:
+        die("no buildable checkouts")
+    print(f"Worktrees: {len(targets)} (files parsed {parsed}, shared between worktrees {shared})")
+
+    # Render each distinct diagram once, up front, so the parallel builds below
+    # all find it in the store instead of racing to draw it.
+    pipeline = Pipeline(jobs)
+    # With --force everything is redrawn here, once; the builds then reuse it.
+    missing = [
+        (inputs, job) for inputs, job in unique.items()
+        if args.force or not store.path_for(inputs, job[0].suffix).is_file()
+    ]
+    for inputs, (path, fn, fn_args) in missing:
+        ensure_dir(path.parent)
+        pipeline.add(Task(f"store:{inputs[:12]}", render_shared, (store, inputs, path, fn, fn_args, args.force)))
+    pipeline.run()
+    store.written.update(inputs for inputs, _ in missing)
+    print(f"Diagrams: {len(unique)} distinct across worktrees, {len(missing)} rendered")
+
+    workers = min(jobs, len(targets))
+    each = max(1, jobs // len(targets))
+    calls = [(args, t, each, epoch, today, c, store) for t, c in zip(targets, caches)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            reports = list(ex.map(_build_captured, *zip(*calls)))
+    else:
+        reports = [_build_captured(*call) for call in calls]
+    for (repo, out_dir, _), report in zip(targets, reports):
+        print(f"== {repo} -> {out_dir}")
+        print(report, end="")
+    pruned = store.prune(keep)
+    if pruned:
+        print(f"Artifact cache: removed {pruned} entries no longer referenced by any worktree")
+
+
+# -----------------------------
+# Python API
+# -----------------------------
+
+class ManualBuilder:
+    """
+    Keep the generator loaded and rebuild on demand, without a new process.
+
+    Usage (with docs/tools on sys.path):
+      from generate_manuals import ManualBuilder
+      builder = ManualBuilder("/path/to/repo", "/path/to/out", formats=("docx", "md"), jobs=4)
+      builder.build()                                  # everything, like the CLI
+      builder.build(targets=["runbook"])               # one manual, every format
+      builder.build(targets=["md:developer_manual", "project_index"])
+
+    Notes:
+      - Holds the IndexCache (per-file parses, kept decoded in memory between
+        builds), the build manifest and diagram ArtifactStore under `out`, and
+        python-docx/matplotlib once imported (warm() imports them up front).
+        A rebuild re-checks file stats and then does only what --watch would.
+      - Options are the CLI's, by dest name (api_reference="list",
+        diagram_backend="svg", run_logs=Path(...), image_dpi=150, ...).
+      - build() returns {output path: True if (re)generated} and keeps the
+        text summary the CLI prints in `report` (echoed with verbose=True).
+      - The date and SOURCE_DATE_EPOCH are re-read on every build, so a
+        long-lived builder stamps each document with the day it was built.
+      - Not thread-safe: one build at a time per builder.
+    """
+
+    def __init__(
+        self,
+        repo: Path | str,
+        out: Path | str,
+        *,
+        formats: Sequence[str] = ("docx",),
+        jobs: int = 1,
+        verbose: bool = False,
+        **options: object,
+    ) -> None:
+        self.repo = Path(repo).resolve()
+        self.out_dir = Path(out).resolve()
+        errors, _ = check_repo(self.repo)
+        if errors:
+            raise ValueError(errors[0])
+        self.args = make_parser().parse_args([])
+        for name, value in options.items():
+            if name in {"repo", "worktrees", "out", "jobs", "format", "force", "check", "list_outputs", "watch", "watch_poll", "debounce"}:
+                raise TypeError(f"ManualBuilder does not take option {name!r}")
+            if not hasattr(self.args, name):
+                raise TypeError(f"unknown option {name!r}")
+            setattr(self.args, name, value)
+        self.args.format = parse_formats(",".join(formats))
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.verbose = verbose
+        self.index_cache = IndexCache(self.out_dir / INDEX_CACHE_NAME, enabled=not self.args.force, pool={})
+        self.store = ArtifactStore(self.out_dir / STORE_DIR)
+        self.report = ""
+
+    def warm(self) -> None:
+        """Import the DOCX and diagram libraries now rather than in the first build."""
+        if "docx" in self.args.format:
+            import docx  # noqa: F401 - warm import
+            import matplotlib.pyplot  # noqa: F401 - warm import
+
+    def build(self, targets: Iterable[str] | None = None, *, force: bool = False) -> Dict[Path, bool]:
+        """
+        Build targets (default: everything); see select_targets for the names.
+
+        Notes:
+          - force=True ignores the manifest for this build only, like --force.
+        """
+        epoch, today = build_dates(self.args)
+        label = snapshot_label_for(self.args, self.repo, today)
+        self.args.force = force
+        if force:
+            self.store.written.clear()  # artifacts from earlier builds are not trusted either
+        buf = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buf):
+                return build_all(
+                    self.args, self.repo, self.out_dir, self.jobs, epoch, today, label,
+                    self.index_cache, self.store, None if targets is None else list(targets),
+                )
+        finally:
+            self.args.force = False
+            self.report = buf.getvalue()
+            if self.verbose:
+                print(self.report, end="")
+
+
+def is_watched_source(rel: str) -> bool:
+    """True if a change to rel can affect the outputs (see bash_sources)."""
+    return rel.endswith(".sh") or rel == "bin/homelab"
+
+
+def watch(args: argparse.Namespace, repo: Path, out_dir: Path, jobs: int) -> None:
+    """
+    Build, then rebuild whenever a Bash source under lib/, bin/ or scripts/ changes.
+
+    Notes:
+      - python-docx and matplotlib are imported once up front (when DOCX is
+        among the formats), so a rebuild
+        pays only for the artifacts whose input digests changed (typically
+        the Developer Manual, plus the architecture diagram when function
+        counts move).
+      - The date, SOURCE_DATE_EPOCH and the default snapshot label are
+        re-read for every rebuild, as ManualBuilder.build does, so a session
+        left running past midnight stamps (and rebuilds) with the new day.
+      - Changes to the generator itself are not picked up; restart the watch.
+    """
+    if "docx" in args.format:
+        import docx  # noqa: F401 - warm import
+        import matplotlib.pyplot  # noqa: F401 - warm import
+
+    roots = [repo / d for d in WATCH_DIRS if (repo / d).is_dir()]
+    watcher = make_watcher(roots, poll=args.watch_poll)
+    index_cache = IndexCache(out_dir / INDEX_CACHE_NAME, enabled=not args.force)
+
+    def rebuild() -> None:
+        epoch, today = build_dates(args)
+        build_all(args, repo, out_dir, jobs, epoch, today, snapshot_label_for(args, repo, today), index_cache)
+
+    rebuild()
+    args.force = False  # --force applies to the first build only
+
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else f"polling every {watcher.interval:.1f}s"
+    print(f"Watching {', '.join(d.name + '/' for d in roots)} ({mode}); Ctrl-C to stop.")
+    try:
+        for changed in watch_changes(watcher, debounce=args.debounce):
+            rels = sorted({p.relative_to(repo).as_posix() for p in changed if p.is_relative_to(repo)})
+            relevant = [r for r in rels if r in WATCH_DIRS or is_watched_source(r)]
+            if not relevant:
+                continue
+            started = time.perf_counter()
+            print(f"\n==> Changed: {', '.join(relevant[:5])}" + (f" (+{len(relevant) - 5} more)" if len(relevant) > 5 else ""))
+            try:
+                rebuild()
+            except Exception as exc:  # noqa: BLE001 - keep watching after a failed build
+                print(f"ERROR: rebuild failed: {exc}")
+                continue
+            print(f"==> Rebuilt in {time.perf_counter() - started:.2f}s")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+
+
+def parse_formats(value: str) -> Tuple[str, ...]:
+    """argparse type for --format: "md,html" -> ("md", "html")."""
+    formats = tuple(dict.fromkeys(f.strip().lower() for f in value.split(",") if f.strip()))
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"expected a comma list of {', '.join(FORMATS)}; got {value!r}")
+    return formats
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """The CLI; ManualBuilder takes its defaults from here too."""
+    parser = argparse.ArgumentParser(description="Generate fouchger_homelab manuals and diagrams.")
+    parser.add_argument(
+        "--repo", type=Path, action="append", default=None,
+        help="Path to repo root (default: current directory); repeat to build several checkouts in one run",
+    )
+    parser.add_argument(
+        "--worktrees", action="store_true",
+        help="Build every `git worktree` of the --repo checkout(s); outputs go to <out>/<worktree dir>/",
+    )
+    parser.add_argument("--out", type=Path, default=Path.cwd(), help="Output directory for docs and assets")
+    parser.add_argument("--snapshot-label", type=str, default=None, help="Label to embed in footers (default: repo name + date)")
+    parser.add_argument("--force", action="store_true", help="Ignore the build manifest and regenerate every output")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Parallel workers for diagram renders, manual builds and PDF export (0 = CPU count; default: 1)",
+    )
+    parser.add_argument(
+        "--pdf-mode", choices=["batch", "per-file"], default="batch",
+        help="batch: convert all stale DOCX in one soffice session after the manuals are built (default); "
+             "per-file: one soffice per DOCX, started as soon as it is written",
+    )
+    parser.add_argument(
+        "--diagram-backend", choices=["matplotlib", "svg"], default="matplotlib",
+        help="matplotlib (default) or svg: emit SVG directly and rasterize to PNG only for DOCX embedding",
+    )
+    parser.add_argument(
+        "--image-dpi", type=int, default=DEFAULT_IMAGE_DPI,
+        help=f"Effective resolution of diagram PNGs at their placed width in the DOCX (default: {DEFAULT_IMAGE_DPI})",
+    )
+    parser.add_argument(
+        "--api-reference", choices=list(API_STYLES), default="table",
+        help="Developer Manual API reference layout: table (default; every function, one table per file) "
+             "or list (bullets, capped at 60 per file)",
+    )
+    parser.add_argument(
+        "--reproducible", action="store_true",
+        help="Byte-reproducible outputs: fixed zip timestamps/order, stripped PNG metadata "
+             "(implied when SOURCE_DATE_EPOCH is set)",
+    )
+    parser.add_argument(
+        "--timings", action="store_true",
+        help="Print a per-phase wall/CPU breakdown and write it to <out>/timings.json",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Write a cProfile dump per phase to <out>/profile/ (implies --timings)",
+    )
+    parser.add_argument(
+        "--exclude", action="append", default=[], metavar="PATH",
+        help="Repo-relative path (or directory name) not to scan, in addition to .gitignore and the "
+             f"built-in list ({', '.join(EXCLUDES)}); repeatable",
+    )
+    parser.add_argument(
+        "--run-logs", nargs="?", type=Path, const=default_log_dir(), default=None, metavar="DIR",
+        help="Add an operational analytics chapter to the Runbook from the run logs in DIR "
+             f"(default with no DIR: {default_log_dir()})",
+    )
+    parser.add_argument(
+        "--format", type=parse_formats, default=("docx",),
+        help=f"Comma-separated output formats: {', '.join(FORMATS)} (default: docx). "
+             "md/html link SVG diagrams and need neither python-docx nor LibreOffice",
+    )
+    quick = parser.add_mutually_exclusive_group()
+    quick.add_argument("--check", action="store_true", help="Validate the repo layout and exit (no rendering libraries loaded)")
+    quick.add_argument("--list-outputs", action="store_true", help="List outputs and whether they would be rebuilt, then exit")
+    quick.add_argument("--watch", action="store_true", help="Stay running and rebuild affected outputs when lib/, bin/ or scripts/ change")
+    parser.add_argument("--watch-poll", action="store_true", help="With --watch, poll for changes instead of using inotify")
+    parser.add_argument(
+        "--debounce", type=float, default=0.3,
+        help="With --watch, seconds without further changes before rebuilding (default: 0.3)",
+    )
+    return parser
+
+
+def main() -> None:
+    args = make_parser().parse_args()
+
+    repos = list(dict.fromkeys(r.resolve() for r in (args.repo or [Path.cwd()])))
+    if args.worktrees:
+        found = [w.resolve() for r in repos for w in git_worktrees(r)]
+        repos = list(dict.fromkeys(found)) or repos
+    out_dir = args.out.resolve()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    sde = source_date_epoch()
+
+    if len(repos) > 1:
+        if args.watch or args.check or args.list_outputs:
+            die("--watch, --check and --list-outputs take a single --repo")
+        if args.reproducible and sde is None:
+            print("NOTE: --reproducible without SOURCE_DATE_EPOCH; using today's date in text and 1980-01-01 for zip entries.")
+        build_worktrees(args, repos, out_dir, jobs, *build_dates(args))
+        return
+
+    repo = repos[0]
+    errors, warnings = check_repo(repo)
+    if args.check:
+        for w in warnings:
+            print(f"WARN: {w}")
+        for e in errors:
+            print(f"ERROR: {e}")
+        if errors:
+            raise SystemExit(1)
+        print(f"OK: {repo}")
+        return
+    if errors:
+        die(errors[0])
+
+    if args.reproducible and sde is None:
+        print("NOTE: --reproducible without SOURCE_DATE_EPOCH; using today's date in text and 1980-01-01 for zip entries.")
+    if args.watch:
+        watch(args, repo, out_dir, jobs)
+        return
+    epoch, today = build_dates(args)
+    build_all(args, repo, out_dir, jobs, epoch, today, snapshot_label_for(args, repo, today))
+
 
 if __name__ == "__main__":
     main()
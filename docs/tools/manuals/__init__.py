@@ -0,0 +1,10 @@
+"""
+Fouchger Homelab – Manual Generator support package
+
+Description:
+  Helper modules used by docs/tools/generate_manuals.py. The generator script
+  remains the entry point; this package holds the build plumbing so the
+  document content in the script stays readable.
+
+-------------------------------------------------------------------------------
+"""
@@ -0,0 +1,135 @@
+"""
+Fouchger Homelab – Manual Generator: API reference writer
+
+Description:
+  Renders section 8 of the Developer Manual (functions per Bash file) from a
+  SymbolTable. The "table" style writes one table per file with function,
+  line, callers and callees, built as a single WordprocessingML string and
+  parsed once, instead of creating one python-docx paragraph per function.
+
+Notes:
+  - python-docx builds each paragraph through several lxml element/proxy
+    calls; at thousands of functions that dominates DOCX composition. One
+    parse of pre-escaped XML is close to linear in output size, so the table
+    lists every function (no per-file truncation).
+  - The "list" style is the original bullet-per-function layout, capped at
+    LIST_LIMIT functions per file. It is kept for comparison in
+    bench_manuals.py.
+  - Style ids (Heading2, TableGrid) come from the default python-docx template.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+from manuals.bash_index import SymbolTable
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+STYLES = ("table", "list")
+LIST_LIMIT = 60
+COLUMNS = (("Function", 2200), ("Line", 600), ("Called by", 3300), ("Calls", 3300))
+
+
+def _sourced_by(symbols: SymbolTable) -> Dict[str, List[str]]:
+    out: Dict[str, List[str]] = {}
+    for src, dest in symbols.source_edges:
+        out.setdefault(src, []).append(dest)
+    return out
+
+
+def _para(text: str, style: str | None = None) -> str:
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f'<w:p>{ppr}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def _cell(text: str, width: int, *, bold: bool = False) -> str:
+    rpr = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    return (
+        f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+        f'<w:p><w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p></w:tc>'
+    )
+
+
+def _file_table(rows: List[Tuple[str, str, str, str]]) -> str:
+    grid = "".join(f'<w:gridCol w:w="{w}"/>' for _, w in COLUMNS)
+    widths = [w for _, w in COLUMNS]
+    out = [
+        '<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/>'
+        '<w:tblLayout w:type="fixed"/></w:tblPr>',
+        f"<w:tblGrid>{grid}</w:tblGrid>",
+        '<w:tr><w:trPr><w:tblHeader/></w:trPr>',
+        "".join(_cell(name, w, bold=True) for name, w in COLUMNS),
+        "</w:tr>",
+    ]
+    for values in rows:
+        out.append("<w:tr>" + "".join(_cell(v, w) for v, w in zip(values, widths)) + "</w:tr>")
+    out.append("</w:tbl>")
+    return "".join(out)
+
+
+def api_reference_files(symbols: SymbolTable) -> List[Tuple[str, List[str], List[Tuple[str, str, str, str]]]]:
+    """(file, files it sources, [(function, line, callers, calls)]) per file, shared by all writers."""
+    sourced_by = _sourced_by(symbols)
+    out = []
+    for rel, fi in sorted(symbols.files.items()):
+        rows = [
+            (f.name, str(f.line), ", ".join(symbols.callers.get(f.name, ())), ", ".join(symbols.calls_of(f)))
+            for f in sorted(fi.functions, key=lambda f: f.name)
+        ]
+        out.append((rel, sourced_by.get(rel, []), rows))
+    return out
+
+
+def api_reference_xml(symbols: SymbolTable) -> str:
+    """Body-level WordprocessingML for the table style (no namespace declarations)."""
+    out: List[str] = []
+    for rel, sources, rows in api_reference_files(symbols):
+        out.append(_para(rel, "Heading2"))
+        if sources:
+            out.append(_para("Sources: " + ", ".join(sources)))
+        out.append(_file_table(rows) if rows else _para("No Bash functions detected."))
+    return "".join(out)
+
+
+def add_api_reference(doc: Document, symbols: SymbolTable, style: str = "table") -> None:
+    """Append the per-file API reference to doc in the given style."""
+    if style == "list":
+        _add_api_reference_list(doc, symbols)
+        return
+
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    fragment = parse_xml(f"<w:body {nsdecls('w')}>{api_reference_xml(symbols)}</w:body>")
+    body = doc.element.body
+    anchor = body.sectPr
+    for el in list(fragment):
+        if anchor is not None:
+            anchor.addprevious(el)
+        else:
+            body.append(el)
+
+
+def _add_api_reference_list(doc: Document, symbols: SymbolTable) -> None:
+    sourced_by = _sourced_by(symbols)
+    for rel, fi in sorted(symbols.files.items()):
+        doc.add_heading(rel, level=2)
+        if sourced_by.get(rel):
+            doc.add_paragraph("Sources: " + ", ".join(sourced_by[rel]))
+        fns = sorted(fi.functions, key=lambda f: f.name)
+        if not fns:
+            doc.add_paragraph("No Bash functions detected.", style="List Bullet")
+            continue
+        for fdef in fns[:LIST_LIMIT]:
+            calls = symbols.calls_of(fdef)
+            text = f"{fdef.name} (line {fdef.line})"
+            if calls:
+                text += " → " + ", ".join(calls)
+            doc.add_paragraph(text, style="List Bullet")
+        if len(fns) > LIST_LIMIT:
+            doc.add_paragraph(f"(Truncated: {len(fns)} total functions in this file.)")
@@ -0,0 +1,573 @@
+"""
+Fouchger Homelab – Manual Generator: Bash symbol indexer
+
+Description:
+  Single-pass tokenizer and indexer for the repo's Bash sources. For every
+  file it records function definitions (with line numbers), `source`/`.`
+  targets, and the commands each function runs. index_repo() folds the
+  per-file results into one SymbolTable with resolved source edges and a
+  caller/callee graph, shared by the API reference and the diagrams.
+
+Notes:
+  - This is a navigation aid, not a Bash parser. It understands enough of the
+    grammar to stay out of strings, comments, heredocs and arithmetic, and to
+    see commands inside $(...), `...` and <(...).
+  - "Calls" are command words in command position that name a function defined
+    somewhere in the repo. Indirect calls (eval, "$fn", trap strings) are not seen.
+    Case patterns (`start|stop)`) are not command words and are skipped.
+  - Lexing and indexing are linear in the input size; resolving the graph is
+    linear in the number of recorded calls.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Tuple
+
+from manuals.cache import digest_bytes
+
+if TYPE_CHECKING:
+    from manuals.index_cache import IndexCache
+
+# Token kinds
+WORD = "word"
+OP = "op"
+NL = "nl"
+CASE_END = ";;"  # OP value for ;; ;& ;;& (a case clause ends, a pattern follows)
+SUBST_OPEN = "subst_open"
+SUBST_CLOSE = "subst_close"
+
+Token = Tuple[str, str, int]
+
+_BLANKS = re.compile(r"[ \t\r]+")
+_PLAIN = re.compile(r"[^\s;&|()<>'\"`$\\]+")
+_DQ_PLAIN = re.compile(r"[^\"\\$`\n]+")
+_OPERATORS = ("&&", "||", ";;&", ";;", ";&", "|&", "|", "&", ";")
+_REDIRECTS = ("&>>", "&>", ">>", ">&", "<&", "<>", ">|", ">", "<")
+_ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(\[[^\]]*\])?\+?=")
+_FUNC_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_:.\-]*")
+
+# Words after which the next word is still in command position.
+_CMD_PREFIX = frozenset({
+    "if", "then", "else", "elif", "do", "while", "until", "!", "time",
+    "command", "builtin", "exec", "nohup", "{",
+})
+# Shell keywords that are never recorded as calls.
+_KEYWORDS = frozenset({
+    "fi", "done", "esac", "in", "case", "for", "select", "function", "}",
+    "[[", "]]", "coproc",
+}) | _CMD_PREFIX
+
+
+class _Lexer:
+    """
+    Turn Bash source into a flat token list.
+
+    Notes:
+      - Quoted strings are folded into the surrounding WORD; command
+        substitutions inside them are emitted as nested SUBST_OPEN/CLOSE runs
+        (before the enclosing WORD) so calls in "$(fn ...)" are visible.
+      - Heredoc bodies, comments and arithmetic are skipped entirely.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.n = len(text)
+        self.pos = 0
+        self.line = 1
+        self.tokens: List[Token] = []
+        self.heredocs: List[Tuple[str, bool]] = []
+        self.in_backtick = False  # a bare ` ends the word (and the substitution)
+
+    def emit(self, kind: str, value: str, line: int | None = None) -> None:
+        self.tokens.append((kind, value, self.line if line is None else line))
+
+    # -- top level ---------------------------------------------------------
+
+    def lex(self, stop: str | None = None) -> None:
+        text, n = self.text, self.n
+        while self.pos < n:
+            c = text[self.pos]
+            if c in " \t\r":
+                self.pos = _BLANKS.match(text, self.pos).end()
+            elif c == "\\" and text.startswith("\\\n", self.pos):
+                self.pos += 2
+                self.line += 1
+            elif c == "\n":
+                self.emit(NL, "\n")
+                self.pos += 1
+                self.line += 1
+                if self.heredocs:
+                    self._skip_heredocs()
+            elif c == "#":
+                end = text.find("\n", self.pos)
+                self.pos = n if end < 0 else end
+            elif stop is not None and c == stop:
+                self.pos += 1
+                return
+            elif c in ";&|":
+                if text.startswith("&>", self.pos):
+                    self._redirect()
+                    continue
+                op = next(o for o in _OPERATORS if text.startswith(o, self.pos))
+                if op in (";;", ";&", ";;&"):
+                    self.emit(OP, CASE_END)
+                else:
+                    self.emit(OP, ";" if op not in ("|", "|&") else "|")
+                self.pos += len(op)
+            elif c == "(":
+                if text.startswith("((", self.pos):
+                    self._skip_arith(self.pos + 2)
+                    self.emit(WORD, "((")
+                else:
+                    self.emit(OP, "(")
+                    self.pos += 1
+            elif c == ")":
+                self.emit(OP, ")")
+                self.pos += 1
+            elif c in "<>":
+                if text.startswith("<<<", self.pos):
+                    self.pos += 3
+                elif text.startswith("<<", self.pos):
+                    self._heredoc_start()
+                elif text.startswith("<(", self.pos) or text.startswith(">(", self.pos):
+                    self._subst(self.pos + 2, ")")
+                else:
+                    self._redirect()
+            else:
+                self._word()
+
+    # -- words -------------------------------------------------------------
+
+    def _word(self) -> None:
+        text, n = self.text, self.n
+        start_line = self.line
+        parts: List[str] = []
+        while self.pos < n:
+            c = text[self.pos]
+            if c in " \t\r\n;&|<>)" or (c == "`" and self.in_backtick):
+                break
+            if c == "(":
+                # Array literal: name=( ... )
+                if parts and parts[-1].endswith("="):
+                    end = self._match_paren(self.pos + 1)
+                    parts.append(text[self.pos:end])
+                    self.pos = end
+                    continue
+                break
+            if c == "\\":
+                if text.startswith("\\\n", self.pos):
+                    break
+                parts.append(text[self.pos:self.pos + 2])
+                self.pos += 2
+            elif c == "'":
+                end = text.find("'", self.pos + 1)
+                end = n if end < 0 else end + 1
+                parts.append(text[self.pos:end])
+                self.line += text.count("\n", self.pos, end)
+                self.pos = end
+            elif c == '"':
+                parts.append(self._dquote())
+            elif c == "`":
+                self._subst(self.pos + 1, "`")
+                parts.append("`...`")
+            elif c == "$":
+                parts.append(self._dollar())
+            else:
+                m = _PLAIN.match(text, self.pos)
+                if m is None:
+                    parts.append(c)
+                    self.pos += 1
+                else:
+                    parts.append(m.group())
+                    self.pos = m.end()
+        raw = "".join(parts)
+        if raw in ("{", "}"):
+            self.emit(OP, raw, start_line)
+        elif raw:
+            self.emit(WORD, raw, start_line)
+
+    def _dquote(self) -> str:
+        text, n = self.text, self.n
+        start = self.pos
+        self.pos += 1
+        while self.pos < n:
+            c = text[self.pos]
+            if c == '"':
+                self.pos += 1
+                break
+            if c == "\\":
+                self.pos += 2
+            elif c == "\n":
+                self.line += 1
+                self.pos += 1
+            elif c == "$":
+                self._dollar()
+            elif c == "`":
+                self._subst(self.pos + 1, "`")
+            else:
+                self.pos = _DQ_PLAIN.match(text, self.pos).end()
+        return text[start:self.pos]
+
+    def _dollar(self) -> str:
+        text = self.text
+        start = self.pos
+        if text.startswith("$((", self.pos):
+            self._skip_arith(self.pos + 3)
+        elif text.startswith("$(", self.pos):
+            self._subst(self.pos + 2, ")")
+        elif text.startswith("${", self.pos):
+            self._skip_braced(self.pos + 2)
+        elif text.startswith("$'", self.pos):
+            i = self.pos + 2
+            while i < self.n and text[i] != "'":
+                i += 2 if text[i] == "\\" else 1
+            self.line += text.count("\n", self.pos, i)
+            self.pos = min(i + 1, self.n)
+        else:
+            self.pos += 1
+        return text[start:self.pos]
+
+    def _subst(self, body_start: int, stop: str) -> None:
+        self.emit(SUBST_OPEN, stop)
+        self.pos = body_start
+        saved, self.heredocs = self.heredocs, []
+        saved_bt, self.in_backtick = self.in_backtick, stop == "`"
+        self.lex(stop)
+        self.heredocs, self.in_backtick = saved, saved_bt
+        self.emit(SUBST_CLOSE, stop)
+
+    # -- skipping ----------------------------------------------------------
+
+    def _match_paren(self, i: int, depth: int = 1) -> int:
+        """Index just past the ')' closing `depth` open parens before i (quote-aware)."""
+        text, n = self.text, self.n
+        while i < n and depth:
+            c = text[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c in "'\"":
+                end = text.find(c, i + 1)
+                end = n - 1 if end < 0 else end
+                self.line += text.count("\n", i, end)
+                i = end + 1
+                continue
+            if c == "(":
+                depth += 1
+            elif c == ")":
+                depth -= 1
+            elif c == "\n":
+                self.line += 1
+            i += 1
+        return i
+
+    def _skip_arith(self, body_start: int) -> None:
+        # body_start is just inside "((" (or "$(("), so two parens are open.
+        self.pos = self._match_paren(body_start, depth=2)
+
+    def _skip_braced(self, i: int) -> None:
+        text, n, depth = self.text, self.n, 1
+        while i < n and depth:
+            c = text[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+            elif c == "\n":
+                self.line += 1
+            i += 1
+        self.pos = i
+
+    def _redirect(self) -> None:
+        op = next(o for o in _REDIRECTS if self.text.startswith(o, self.pos))
+        self.pos += len(op)
+
+    def _heredoc_start(self) -> None:
+        text = self.text
+        self.pos += 2
+        strip_tabs = text.startswith("-", self.pos)
+        if strip_tabs:
+            self.pos += 1
+        self.pos = _BLANKS.match(text, self.pos).end() if text[self.pos:self.pos + 1] in (" ", "\t") else self.pos
+        start = self.pos
+        while self.pos < self.n and text[self.pos] not in " \t\r\n;&|<>()":
+            c = text[self.pos]
+            if c in "'\"":
+                end = text.find(c, self.pos + 1)
+                self.pos = self.n if end < 0 else end + 1
+            else:
+                self.pos += 1
+        delim = re.sub(r"[\"'\\]", "", text[start:self.pos])
+        if delim:
+            self.heredocs.append((delim, strip_tabs))
+
+    def _skip_heredocs(self) -> None:
+        text, n = self.text, self.n
+        for delim, strip_tabs in self.heredocs:
+            while self.pos < n:
+                end = text.find("\n", self.pos)
+                end = n if end < 0 else end
+                line = text[self.pos:end]
+                self.pos = min(end + 1, n)
+                self.line += 1
+                if (line.lstrip("\t") if strip_tabs else line) == delim:
+                    break
+        self.heredocs = []
+
+
+def tokenize(text: str) -> List[Token]:
+    lexer = _Lexer(text)
+    lexer.lex()
+    return lexer.tokens
+
+
+# -----------------------------
+# Per-file index
+# -----------------------------
+
+@dataclass
+class FunctionDef:
+    name: str
+    file: str
+    line: int
+    calls: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileIndex:
+    path: str
+    functions: List[FunctionDef] = field(default_factory=list)
+    sources: List[Tuple[str, int]] = field(default_factory=list)
+    toplevel_calls: List[str] = field(default_factory=list)
+
+
+def index_text(rel: str, text: str) -> FileIndex:
+    """
+    Index one Bash file in a single pass over its tokens.
+
+    Notes:
+      - Function bodies are tracked by brace depth, so nested definitions and
+        `{ ...; }` groups inside a body attribute calls correctly.
+      - Calls are recorded once per function, in first-seen order.
+      - case_stack holds one flag per open `case ... esac`: True while its
+        patterns are being read (after `in` or a `;;`, up to the `)`).
+    """
+    tokens = tokenize(text)
+    out = FileIndex(path=rel)
+
+    expect_cmd = True
+    cmd_stack: List[Tuple[bool, List[bool], bool]] = []
+    case_stack: List[bool] = []
+    want_case_in = False
+    depth = 0
+    scopes: List[Tuple[FunctionDef, int, Set[str]]] = []
+    top_seen: Set[str] = set()
+    pending: FunctionDef | None = None
+    want_source = False
+    i, n = 0, len(tokens)
+
+    while i < n:
+        kind, value, line = tokens[i]
+
+        if kind == WORD and case_stack and case_stack[-1]:
+            # Pattern word; `esac` may follow the last `;;`.
+            if value == "esac":
+                case_stack.pop()
+                expect_cmd = False
+        elif kind == WORD and want_case_in and value == "in":
+            case_stack.append(True)
+            want_case_in = False
+        elif kind == WORD:
+            if want_source:
+                out.sources.append((value, line))
+                want_source = False
+                expect_cmd = False
+            elif expect_cmd:
+                # name() { ... }
+                if (
+                    i + 2 < n
+                    and tokens[i + 1][:2] == (OP, "(")
+                    and tokens[i + 2][:2] == (OP, ")")
+                    and _FUNC_NAME.fullmatch(value)
+                ):
+                    pending = FunctionDef(value, rel, line)
+                    i += 3
+                    continue
+                # function name [()] { ... }
+                if value == "function" and i + 1 < n and tokens[i + 1][0] == WORD:
+                    pending = FunctionDef(tokens[i + 1][1], rel, tokens[i + 1][2])
+                    i += 2
+                    if i + 1 < n and tokens[i][:2] == (OP, "(") and tokens[i + 1][:2] == (OP, ")"):
+                        i += 2
+                    continue
+                if _ASSIGNMENT.match(value):
+                    pass
+                elif value in _CMD_PREFIX:
+                    pass
+                elif value in ("source", "."):
+                    want_source = True
+                    expect_cmd = False
+                elif value == "case":
+                    want_case_in = True
+                    expect_cmd = False
+                elif value == "esac" and case_stack:
+                    case_stack.pop()
+                    expect_cmd = False
+                else:
+                    if value not in _KEYWORDS and _FUNC_NAME.fullmatch(value):
+                        if scopes:
+                            fdef, _, seen = scopes[-1]
+                            if value not in seen:
+                                seen.add(value)
+                                fdef.calls.append(value)
+                        elif value not in top_seen:
+                            top_seen.add(value)
+                            out.toplevel_calls.append(value)
+                    expect_cmd = False
+            pending = None
+        elif kind == OP:
+            if value == "{":
+                depth += 1
+                if pending is not None:
+                    out.functions.append(pending)
+                    scopes.append((pending, depth, set()))
+                    pending = None
+            elif value == "}":
+                if scopes and scopes[-1][1] == depth:
+                    scopes.pop()
+                depth = max(0, depth - 1)
+            elif value == "(" and pending is not None:
+                # Subshell body: name() ( ... ). Record the definition; calls
+                # inside are attributed to the enclosing scope.
+                out.functions.append(pending)
+                pending = None
+            elif value == ")" and case_stack and case_stack[-1]:
+                case_stack[-1] = False
+            elif value == CASE_END and case_stack:
+                case_stack[-1] = True
+            expect_cmd = True
+            want_source = False
+        elif kind == NL:
+            expect_cmd = True
+            want_source = False
+        elif kind == SUBST_OPEN:
+            # A substitution in `source "$(dirname ...)/x.sh"` is part of the
+            # target word that follows it, not the target itself.
+            cmd_stack.append((expect_cmd, case_stack, want_source))
+            expect_cmd, case_stack, want_source = True, [], False
+        elif kind == SUBST_CLOSE:
+            expect_cmd, case_stack, want_source = cmd_stack.pop() if cmd_stack else (False, [], False)
+        i += 1
+
+    return out
+
+
+# -----------------------------
+# Repo-wide symbol table
+# -----------------------------
+
+_SOURCE_TAIL = re.compile(r"""^.*(?:\}|\)|\$[A-Za-z_][A-Za-z0-9_]*)""")
+
+
+def resolve_source(target: str, from_rel: str, known: Set[str]) -> str | None:
+    """
+    Best-effort resolution of a `source` argument to a repo-relative path.
+
+    Notes:
+      - Variable/substitution prefixes (${REPO_ROOT}, ${base}, $(cd ... && pwd))
+        are dropped; the remaining path tail is tried relative to the sourcing
+        file's directory and each of its parents up to the repo root.
+      - Absolute paths and anything outside the indexed set resolve to None.
+    """
+    raw = target.strip("\"'")
+    tail = _SOURCE_TAIL.sub("", raw).strip("\"'")
+    if not tail or (tail == raw and raw.startswith("/")):
+        return None
+    tail = tail.lstrip("/")
+    parent = Path(from_rel).parent
+    while True:
+        cand = str(parent / tail) if str(parent) != "." else tail
+        cand = str(Path(cand))
+        if cand in known:
+            return cand
+        if str(parent) == ".":
+            return None
+        parent = parent.parent
+
+
+@dataclass
+class SymbolTable:
+    files: Dict[str, FileIndex]
+    digests: Dict[str, str] = field(default_factory=dict)
+    definitions: Dict[str, List[FunctionDef]] = field(default_factory=dict)
+    source_edges: List[Tuple[str, str]] = field(default_factory=list)
+    callers: Dict[str, List[str]] = field(default_factory=dict)
+    skipped: int = 0  # paths the repo walker pruned (ignored or excluded)
+
+    def __post_init__(self) -> None:
+        if not self.definitions:
+            self._link()
+
+    def _link(self) -> None:
+        known = set(self.files)
+        for rel in sorted(self.files):
+            fi = self.files[rel]
+            for fdef in fi.functions:
+                self.definitions.setdefault(fdef.name, []).append(fdef)
+            for target, _ in fi.sources:
+                dest = resolve_source(target, rel, known)
+                if dest is not None:
+                    self.source_edges.append((rel, dest))
+
+        callers: Dict[str, Set[str]] = {}
+        for rel in sorted(self.files):
+            fi = self.files[rel]
+            for fdef in fi.functions:
+                for callee in fdef.calls:
+                    if callee in self.definitions and callee != fdef.name:
+                        callers.setdefault(callee, set()).add(fdef.name)
+            for callee in fi.toplevel_calls:
+                if callee in self.definitions:
+                    callers.setdefault(callee, set()).add(f"<{rel}>")
+        self.callers = {k: sorted(v) for k, v in callers.items()}
+
+    def calls_of(self, fdef: FunctionDef) -> List[str]:
+        """Callees of fdef that are defined somewhere in the repo."""
+        return [c for c in fdef.calls if c in self.definitions and c != fdef.name]
+
+    def function_names(self, rel: str) -> List[str]:
+        return sorted({f.name for f in self.files[rel].functions})
+
+    def count_functions(self, prefix: str) -> int:
+        """Number of function definitions in files whose path starts with prefix."""
+        return sum(len(fi.functions) for rel, fi in self.files.items() if rel.startswith(prefix))
+
+
+def index_repo(repo: Path, paths: Iterable[Path], cache: "IndexCache | None" = None) -> SymbolTable:
+    """
+    Index every path and link the results.
+
+    Notes:
+      - With an IndexCache, unchanged files are served from disk without being
+        read; only new or edited files are tokenized.
+      - SymbolTable.digests records each file's content hash for cache keys.
+    """
+    files: Dict[str, FileIndex] = {}
+    digests: Dict[str, str] = {}
+    for p in paths:
+        rel = str(p.relative_to(repo))
+        if cache is not None:
+            files[rel], digests[rel] = cache.lookup(rel, p)
+        else:
+            data = p.read_bytes()
+            digests[rel] = digest_bytes(data)
+            files[rel] = index_text(rel, data.decode("utf-8", errors="ignore"))
+    return SymbolTable(files, digests=digests)
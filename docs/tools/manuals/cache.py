@@ -0,0 +1,196 @@
+"""
+Fouchger Homelab – Manual Generator: build manifest
+
+Description:
+  Content-hash build cache for generate_manuals.py. Every output is recorded
+  in a JSON manifest together with a digest of the inputs it was built from.
+  On the next run an output is only regenerated when that digest changes or
+  the output file has gone missing.
+
+Notes:
+  - The manifest lives next to the outputs (docs/generated/build_manifest.json).
+  - A missing or unreadable manifest simply means "rebuild everything".
+  - Digests cover content, not timestamps, so a fresh checkout of an unchanged
+    tree is still a cache hit.
+  - ArtifactStore keeps a copy of each rendered diagram under its inputs
+    digest, so builds of other worktrees copy it instead of rendering again.
+    --force bypasses it (fetch(refresh=True)) and replaces what it holds.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Set
+
+MANIFEST_NAME = "build_manifest.json"
+MANIFEST_VERSION = 1
+STORE_DIR = "artifact_cache"
+STORE_TMP_MAX_AGE_S = 3600
+
+
+def digest_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def digest_values(*values: object) -> str:
+    """
+    Digest arbitrary JSON-serialisable values (specs, labels, dates, digests).
+
+    Notes:
+      - Tuples and lists hash the same; dict keys are sorted for stability.
+    """
+    blob = json.dumps(values, sort_keys=True, default=str, separators=(",", ":"))
+    return digest_bytes(blob.encode("utf-8"))
+
+
+def digest_files(paths: Iterable[Path], root: Path | None = None) -> str:
+    """
+    Digest a set of files by relative path and content.
+
+    Notes:
+      - Paths are sorted so scan order does not matter.
+      - Renaming a file changes the digest even if its content does not.
+    """
+    h = hashlib.sha256()
+    for p in sorted(paths):
+        rel = str(p.relative_to(root)) if root else str(p)
+        h.update(rel.encode("utf-8") + b"\0")
+        h.update(digest_file(p).encode("ascii") + b"\n")
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """
+    Track which outputs are up to date with respect to their inputs.
+
+    Entries are keyed by a logical name (for example "diagram:architecture" or
+    "pdf:Fouchger_Homelab_Runbook") and store the output path relative to the
+    manifest directory plus the inputs digest used to build it.
+    """
+
+    def __init__(self, out_dir: Path, *, force: bool = False) -> None:
+        self.out_dir = out_dir
+        self.path = out_dir / MANIFEST_NAME
+        self.force = force
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION and isinstance(data.get("entries"), dict):
+            self.entries = data["entries"]
+
+    def is_fresh(self, key: str, output: Path, inputs_digest: str) -> bool:
+        """Return True if output exists and was built from the same inputs."""
+        if self.force or not output.exists():
+            return False
+        entry = self.entries.get(key)
+        return bool(entry) and entry.get("inputs") == inputs_digest and entry.get("output") == self._rel(output)
+
+    def record(self, key: str, output: Path, inputs_digest: str) -> None:
+        self.entries[key] = {"output": self._rel(output), "inputs": inputs_digest}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "entries": self.entries}, indent=2, sort_keys=True) + "\n")
+        tmp.replace(self.path)
+
+    def _rel(self, output: Path) -> str:
+        try:
+            return str(output.relative_to(self.out_dir))
+        except ValueError:
+            return str(output)
+
+
+class ArtifactStore:
+    """
+    Content-addressed copies of rendered artifacts: <root>/<digest[:2]>/<digest><suffix>.
+
+    Notes:
+      - Safe to share between processes: entries are written to a temp file and
+        renamed, so a reader sees a whole file or none.
+      - Outputs are copied, never hard-linked, because renderers overwrite
+        their output path in place.
+      - `written` holds the digests this process stored (or was told were
+        stored this run, see build_worktrees); fetch(refresh=True) only
+        returns those, so a --force build never reuses an older artifact.
+      - Every spec change adds an entry, so the owner prunes it after each
+        build to the digests that build still references. A shared store
+        (build_worktrees) is pruned once, by the caller that sees every
+        checkout's digests, never by the individual builds.
+    """
+
+    def __init__(self, root: Path, *, shared: bool = False) -> None:
+        self.root = root
+        self.shared = shared
+        self.written: Set[str] = set()
+
+    def path_for(self, digest: str, suffix: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def fetch(self, digest: str, dest: Path, *, refresh: bool = False) -> bool:
+        """Copy the stored artifact for digest to dest; False if there is none (or, with refresh, none from this run)."""
+        if refresh and digest not in self.written:
+            return False
+        src = self.path_for(digest, dest.suffix)
+        if not src.is_file():
+            return False
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        tmp.replace(dest)
+        return True
+
+    def put(self, digest: str, src: Path) -> None:
+        dest = self.path_for(digest, src.suffix)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp)
+        tmp.replace(dest)
+        self.written.add(digest)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Delete stored artifacts whose digest is not in keep; returns how many were removed."""
+        keep = set(keep)
+        removed = 0
+        stale_tmp = time.time() - STORE_TMP_MAX_AGE_S
+        try:
+            subdirs = [d for d in self.root.iterdir() if d.is_dir()]
+        except OSError:
+            return 0
+        for sub in subdirs:
+            for entry in sub.iterdir():
+                if entry.name.startswith("."):
+                    # A temp file: another writer's in-flight copy, unless a crash left it behind.
+                    try:
+                        if entry.stat().st_mtime < stale_tmp:
+                            entry.unlink()
+                    except OSError:
+                        pass
+                    continue
+                if entry.name.split(".", 1)[0] not in keep:
+                    entry.unlink(missing_ok=True)
+                    removed += 1
+            try:
+                sub.rmdir()  # only succeeds once empty
+            except OSError:
+                pass
+        return removed
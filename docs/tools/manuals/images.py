@@ -0,0 +1,66 @@
+"""
+Fouchger Homelab – Manual Generator: diagram image assets
+
+Description:
+  Sizing and lossless optimisation for the PNG diagrams embedded in the DOCX
+  manuals. Diagrams are rendered once per build (the manifest and artifact
+  store take care of reuse), so everything here runs once per distinct image,
+  not once per document that embeds it.
+
+Notes:
+  - Render resolution is derived from the width the picture is placed at in
+    the DOCX, so --image-dpi is the effective resolution on the page rather
+    than a figure setting. Pixels beyond that only inflate the DOCX, the
+    zip step and LibreOffice's PDF conversion.
+  - optimize_png() is lossless: an RGBA image whose alpha is fully opaque is
+    stored as RGB (matplotlib always writes RGBA) and re-encoded at zlib
+    level 9 (Pillow's optimize=True is slower and no smaller on these
+    images). Above LARGE_IMAGE_PIXELS (a menu map for hundreds of menus)
+    level 9 costs several seconds for about 1% over level 6, so those use 6.
+    The file is only replaced when it gets smaller. Palette
+    conversion is not attempted: antialiased text leaves the diagrams with
+    several hundred colours.
+  - Pillow is required for optimisation (matplotlib already depends on it);
+    without it optimize_png() leaves the file as it is.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Tuple
+
+DEFAULT_IMAGE_DPI = 200
+LARGE_IMAGE_PIXELS = 4_000_000
+
+
+def render_dpi(figure_width_in: float, picture_width_in: float, image_dpi: int = DEFAULT_IMAGE_DPI) -> int:
+    """Figure dpi that yields image_dpi once the figure is scaled to picture_width_in on the page."""
+    return max(50, round(image_dpi * picture_width_in / figure_width_in))
+
+
+def optimize_png(path: Path) -> Tuple[int, int]:
+    """Losslessly shrink the PNG at path in place; returns (bytes before, bytes after)."""
+    before = path.stat().st_size
+    try:
+        from PIL import Image
+    except ImportError:
+        return before, before
+
+    with Image.open(path) as im:
+        im.load()
+        img = im
+        if img.mode == "RGBA" and img.getchannel("A").getextrema() == (255, 255):
+            img = img.convert("RGB")
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        level = 9 if img.width * img.height <= LARGE_IMAGE_PIXELS else 6
+        img.save(tmp, format="PNG", compress_level=level)
+
+    after = tmp.stat().st_size
+    if after < before:
+        tmp.replace(path)
+        return before, after
+    tmp.unlink()
+    return before, before
@@ -0,0 +1,131 @@
+"""
+Fouchger Homelab – Manual Generator: persistent function index cache
+
+Description:
+  On-disk cache of per-file Bash index results (manuals/bash_index.py), so an
+  unchanged script is never re-read or re-parsed between runs.
+
+Notes:
+  - Entries are keyed by repo-relative path and validated in two steps:
+      1. stat: same mtime_ns and size -> reuse without reading the file.
+      2. content: stat changed but SHA-256 is identical (touch, checkout)
+         -> reuse the parse and refresh the stored stat.
+    Anything else is re-parsed.
+  - Entries for files that no longer exist are dropped on save.
+  - The cache is tied to the indexer source; editing bash_index.py discards it.
+  - Stored as JSON next to the outputs (docs/generated/index_cache.json).
+  - Caches for several worktrees built in one run can share a `pool` keyed
+    by (path, content sha256), so a file that is identical across worktrees
+    is parsed once. A long-lived cache (ManualBuilder) uses a pool of its
+    own, so stat hits reuse the decoded FileIndex instead of rebuilding it.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from manuals.bash_index import FileIndex, FunctionDef, index_text
+from manuals.cache import digest_bytes, digest_file
+
+CACHE_NAME = "index_cache.json"
+CACHE_VERSION = 1
+
+# (repo-relative path, content sha256) -> FileIndex, shared by several IndexCaches.
+SharedParses = Dict[Tuple[str, str], FileIndex]
+
+
+def _indexer_digest() -> str:
+    return digest_file(Path(__file__).resolve().parent / "bash_index.py")
+
+
+def _to_json(fi: FileIndex) -> Dict[str, object]:
+    return asdict(fi)
+
+
+def _from_json(data: Dict[str, object]) -> FileIndex:
+    return FileIndex(
+        path=data["path"],
+        functions=[FunctionDef(**f) for f in data["functions"]],
+        sources=[tuple(s) for s in data["sources"]],
+        toplevel_calls=list(data["toplevel_calls"]),
+    )
+
+
+class IndexCache:
+    """Per-file FileIndex cache with stat and content-hash validation."""
+
+    def __init__(self, path: Path, *, enabled: bool = True, pool: SharedParses | None = None) -> None:
+        self.path = path
+        self.pool = pool
+        self.entries: Dict[str, Dict[str, object]] = {}
+        self.seen: set = set()
+        self.stats = {"stat_hits": 0, "hash_hits": 0, "shared_hits": 0, "parsed": 0, "removed": 0}
+        self._indexer = _indexer_digest()
+        if enabled:
+            self._load()
+
+    def reset_stats(self) -> None:
+        """Start a new run on a long-lived cache (generate_manuals.py --watch)."""
+        self.seen = set()
+        self.stats = {k: 0 for k in self.stats}
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("indexer") == self._indexer:
+            self.entries = data.get("files", {})
+
+    def lookup(self, rel: str, p: Path) -> Tuple[FileIndex, str]:
+        """Return (FileIndex, content sha256) for p, parsing only if needed."""
+        self.seen.add(rel)
+        st = p.stat()
+        entry = self.entries.get(rel)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self.stats["stat_hits"] += 1
+            key = (rel, entry["sha256"])
+            if self.pool is not None and key in self.pool:
+                return self.pool[key], entry["sha256"]
+            fi = _from_json(entry["index"])
+            if self.pool is not None:
+                self.pool[key] = fi
+            return fi, entry["sha256"]
+
+        data = p.read_bytes()
+        sha = digest_bytes(data)
+        if entry and entry["sha256"] == sha:
+            self.stats["hash_hits"] += 1
+            fi = _from_json(entry["index"])
+        elif self.pool is not None and (rel, sha) in self.pool:
+            self.stats["shared_hits"] += 1
+            fi = self.pool[(rel, sha)]
+        else:
+            self.stats["parsed"] += 1
+            fi = index_text(rel, data.decode("utf-8", errors="ignore"))
+        if self.pool is not None:
+            self.pool[(rel, sha)] = fi
+        self.entries[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": sha, "index": _to_json(fi)}
+        return fi, sha
+
+    def prune(self, live: Iterable[str] | None = None) -> int:
+        """Drop entries for files not looked up this run (or not in live)."""
+        keep = set(live) if live is not None else self.seen
+        stale = [rel for rel in self.entries if rel not in keep]
+        for rel in stale:
+            del self.entries[rel]
+        self.stats["removed"] += len(stale)
+        return len(stale)
+
+    def save(self) -> None:
+        self.prune()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        payload = {"version": CACHE_VERSION, "indexer": self._indexer, "files": self.entries}
+        tmp.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        tmp.replace(self.path)
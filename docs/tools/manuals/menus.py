@@ -0,0 +1,138 @@
+"""
+Fouchger Homelab – Manual Generator: menu structure
+
+Description:
+  Reads the dialog menus out of the Bash sources: ui_menu titles and items
+  (parse_ui_menu_blocks) and, per item, what the matching `case` arm runs.
+
+Notes:
+  - A menu is any function whose body calls ui_menu; the indexer already
+    records that, so no extra file scan is needed.
+  - Each menu item resolves to targets: repo functions called in its case arm
+    (via the Bash tokenizer), scripts it runs, and make targets.
+  - menu_edges() turns items into menu -> submenu links for the menu map,
+    looking through one wrapper function (action_open_* in lib/actions.sh).
+  - Best effort, like the rest of the generator: it assumes the ui_menu and
+    `case "${choice}"` layout used in lib/menu.sh.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from manuals.bash_index import SymbolTable, index_text
+
+CASE_ARM = re.compile(r"^\s*([0-9]+)\)(.*?);;", re.M | re.S)
+SCRIPT_REF = re.compile(r"(?:\$\{?REPO_ROOT\}?/)?\b(scripts/[\w./-]+\.sh)\b")
+MAKE_REF = re.compile(r"\bmake\s+([A-Za-z0-9_][\w-]*)")
+
+
+@dataclass
+class MenuEntry:
+    key: str
+    label: str
+    targets: List[Tuple[str, str]] = field(default_factory=list)  # (kind, target)
+
+
+@dataclass
+class Menu:
+    function: str
+    file: str
+    line: int
+    title: str
+    prompt: str
+    entries: List[MenuEntry] = field(default_factory=list)
+
+
+def parse_ui_menu_blocks(menu_sh_text: str) -> List[Tuple[str, str, str, List[Tuple[str, str]]]]:
+    """
+    Parse ui_menu blocks from lib/menu.sh.
+
+    Returns:
+      List of tuples: (title, prompt, variable, items)
+      where items is list of (key, label)
+
+    Notes:
+      - This is best-effort. It assumes the ui_menu usage pattern found in the repo.
+      - If the menu formatting changes, this may return fewer results.
+    """
+    blocks = []
+    pattern = r'ui_menu\s+"([^"]+)"\s+"([^"]+)"\s+([A-Za-z_][A-Za-z0-9_]*)\s*\\\s*(.*?)\n\n'
+    for m in re.finditer(pattern, menu_sh_text, flags=re.S):
+        title, prompt, var, body = m.group(1), m.group(2), m.group(3), m.group(4)
+        items = re.findall(r'\n?\s*([0-9]+)\s+"([^"]+)"', body)
+        blocks.append((title, prompt, var, items))
+    return blocks
+
+
+def _arm_targets(arm: str, symbols: SymbolTable) -> List[Tuple[str, str]]:
+    targets: List[Tuple[str, str]] = []
+    for name in index_text("<menu>", arm).toplevel_calls:
+        if name in symbols.definitions and ("function", name) not in targets:
+            targets.append(("function", name))
+    for kind, rx in (("script", SCRIPT_REF), ("make", MAKE_REF)):
+        for ref in rx.findall(arm):
+            if (kind, ref) not in targets:
+                targets.append((kind, ref))
+    return targets
+
+
+def function_bodies(text: str, rel: str, symbols: SymbolTable) -> Dict[str, Tuple[int, str]]:
+    """name -> (line, text up to the next definition in the same file)."""
+    lines = text.splitlines(keepends=True)
+    defs = sorted(symbols.files[rel].functions, key=lambda f: f.line)
+    out: Dict[str, Tuple[int, str]] = {}
+    for i, fdef in enumerate(defs):
+        end = defs[i + 1].line - 1 if i + 1 < len(defs) else len(lines)
+        out[fdef.name] = (fdef.line, "".join(lines[fdef.line - 1:end]))
+    return out
+
+
+def parse_menus(repo: Path, symbols: SymbolTable) -> List[Menu]:
+    """Every ui_menu-driven function in the repo, with resolved item targets."""
+    menus: List[Menu] = []
+    for rel in sorted(symbols.files):
+        fns = [f for f in symbols.files[rel].functions if "ui_menu" in f.calls]
+        if not fns:
+            continue
+        text = (repo / rel).read_text(encoding="utf-8", errors="ignore")
+        bodies = function_bodies(text, rel, symbols)
+        for fdef in sorted(fns, key=lambda f: f.line):
+            line, body = bodies[fdef.name]
+            blocks = parse_ui_menu_blocks(body)
+            if not blocks:
+                continue
+            title, prompt, _, items = blocks[0]
+            arms = {m.group(1): m.group(2) for m in CASE_ARM.finditer(body)}
+            entries = [MenuEntry(key, label, _arm_targets(arms.get(key, ""), symbols)) for key, label in items]
+            menus.append(Menu(fdef.name, rel, line, title, prompt, entries))
+    return menus
+
+
+def menu_edges(menus: List[Menu], symbols: SymbolTable) -> List[Tuple[str, str, str]]:
+    """(menu, submenu, item key) for every item that opens another menu."""
+    names = {m.function for m in menus}
+    edges: List[Tuple[str, str, str]] = []
+    seen = set()
+    for m in menus:
+        for e in m.entries:
+            for kind, target in e.targets:
+                if kind != "function" or target == m.function:
+                    continue
+                if target in names:
+                    opened = [target]
+                else:
+                    opened = [
+                        c for fdef in symbols.definitions.get(target, ())
+                        for c in symbols.calls_of(fdef) if c in names and c != m.function
+                    ]
+                for child in opened:
+                    if (m.function, child, e.key) not in seen:
+                        seen.add((m.function, child, e.key))
+                        edges.append((m.function, child, e.key))
+    return edges
@@ -0,0 +1,118 @@
+"""
+Fouchger Homelab – Manual Generator: build pipeline
+
+Description:
+  Small dependency-aware task runner used by generate_manuals.py. Tasks are
+  submitted as soon as their dependencies have finished, so a PDF conversion
+  can start the moment its DOCX is written instead of waiting for every
+  manual to be built.
+
+Notes:
+  - CPU-bound tasks (diagram renders, DOCX composition) run in a process pool.
+  - Subprocess-bound tasks (soffice) run on threads; they only wait on a child.
+  - jobs=1 runs everything inline in the calling process, in submission order,
+    which keeps tracebacks simple when debugging.
+  - Task functions and arguments must be picklable when jobs > 1.
+  - With a PhaseTimer, every task runs under timing.run_timed and its phase
+    records (including nested ones from worker processes) are merged back.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from manuals.timing import PhaseTimer, run_timed
+
+
+@dataclass
+class Task:
+    name: str
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    deps: Tuple[str, ...] = ()
+    io: bool = False
+    then: Callable[[Any], None] | None = None
+
+
+class InlineExecutor(Executor):
+    """Executor that runs each submission immediately in the caller."""
+
+    def submit(self, fn, /, *args, **kwargs):  # type: ignore[override]
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as exc:  # noqa: BLE001 - re-raised by Pipeline.run
+            fut.set_exception(exc)
+        return fut
+
+
+class Pipeline:
+    """
+    Run Tasks respecting deps, with up to `jobs` running concurrently.
+
+    Notes:
+      - A dependency that was never added (for example an output that was a
+        cache hit) counts as satisfied.
+      - `then` callbacks run in the parent process and may add further tasks.
+      - The first failure cancels anything not yet started and is re-raised.
+    """
+
+    def __init__(self, jobs: int = 1, timer: PhaseTimer | None = None) -> None:
+        self.jobs = max(1, jobs)
+        self.timer = timer
+        self.pending: Dict[str, Task] = {}
+        self.running: Dict[Future, Task] = {}
+        self.results: Dict[str, Any] = {}
+
+    def add(self, task: Task) -> None:
+        self.pending[task.name] = task
+
+    def _ready(self) -> List[Task]:
+        active = set(self.pending) | {t.name for t in self.running.values()}
+        return [t for t in self.pending.values() if not any(d in active for d in t.deps)]
+
+    def run(self) -> Dict[str, Any]:
+        if self.jobs == 1:
+            cpu: Executor = InlineExecutor()
+            io: Executor = cpu
+        else:
+            cpu = ProcessPoolExecutor(max_workers=self.jobs)
+            io = ThreadPoolExecutor(max_workers=self.jobs)
+
+        try:
+            while self.pending or self.running:
+                for task in self._ready():
+                    del self.pending[task.name]
+                    pool = io if task.io else cpu
+                    if self.timer is None:
+                        fut = pool.submit(task.fn, *task.args)
+                    else:
+                        fut = pool.submit(run_timed, task.name, self.timer.profile_dir, task.fn, *task.args)
+                    self.running[fut] = task
+
+                if not self.running:
+                    missing = {d for t in self.pending.values() for d in t.deps}
+                    raise RuntimeError(f"Pipeline stalled; unresolved dependencies: {sorted(missing)}")
+
+                done, _ = wait(list(self.running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    task = self.running.pop(fut)
+                    result = fut.result()
+                    if self.timer is not None:
+                        result, records = result
+                        self.timer.merge(records)
+                    self.results[task.name] = result
+                    if task.then is not None:
+                        task.then(result)
+        finally:
+            for fut in self.running:
+                fut.cancel()
+            cpu.shutdown(wait=True, cancel_futures=True)
+            if io is not cpu:
+                io.shutdown(wait=True, cancel_futures=True)
+
+        return self.results
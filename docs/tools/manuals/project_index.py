@@ -0,0 +1,278 @@
+"""
+Fouchger Homelab – Manual Generator: machine-readable project index
+
+Description:
+  Writes what the generator learns about the repo (files, functions, call
+  graph, source edges, menus, App Manager catalogue and profiles) as
+  project_index.json and project_index.sqlite next to the manuals, so editor
+  tooling and ops scripts can look things up without grepping the tree.
+
+Usage:
+  sqlite3 docs/generated/project_index.sqlite \
+    "SELECT file, line FROM functions WHERE name = 'install_by_strategy'"
+  sqlite3 docs/generated/project_index.sqlite \
+    "SELECT menu, key, label FROM menu_targets WHERE target = 'apply_changes'"
+
+  Menus that reach a function through any call chain:
+    WITH RECURSIVE up(fn) AS (
+      SELECT 'apply_changes'
+      UNION SELECT caller FROM calls JOIN up ON calls.callee = up.fn
+    )
+    SELECT DISTINCT menu, key, label FROM menu_targets JOIN up ON target = fn;
+
+Notes:
+  - Both files carry the same data; the JSON is nested per object, the SQLite
+    tables are flat and indexed on every lookup column.
+  - Catalogue rows and profiles are read only from the files that define
+    them (APP_DATA_FILES): scripts/app_manager/lib/{catalogue,profiles}.sh
+    and the legacy scripts/core/app_manager.sh, so rows carry their file.
+    Fixtures that assign APP_CATALOGUE=( ... ) elsewhere (tests/) are not
+    apps.
+  - PROFILE_ALL_KEYS is built at runtime (sorted union); it is reproduced as
+    profile "all" when a file defines other profiles but not that one.
+  - Both outputs are written to a temp file and renamed into place.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List
+
+from manuals.bash_index import SymbolTable
+from manuals.menus import parse_menus
+
+INDEX_VERSION = 1
+JSON_NAME = "project_index.json"
+SQLITE_NAME = "project_index.sqlite"
+
+APP_DATA_FILES = (
+    "scripts/app_manager/lib/catalogue.sh",
+    "scripts/app_manager/lib/profiles.sh",
+    "scripts/core/app_manager.sh",
+)
+APP_FIELDS = ("key", "label", "default", "packages", "description", "strategy", "version_var")
+ARRAY_START = re.compile(r"^[ \t]*([A-Z][A-Z0-9_]*)=\(", re.M)
+PROFILE_VAR = re.compile(r"^PROFILE_([A-Z0-9_]+)_(KEYS|VERSION_LINES)$")
+ARRAY_REF = re.compile(r"^\$\{([A-Z][A-Z0-9_]*)\[@\]\}$")
+
+SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (path TEXT PRIMARY KEY, sha256 TEXT, functions INTEGER);
+CREATE TABLE functions (name TEXT, file TEXT, line INTEGER);
+CREATE TABLE calls (caller TEXT, caller_file TEXT, callee TEXT);
+CREATE TABLE sources (file TEXT, target TEXT);
+CREATE TABLE menus (function TEXT, file TEXT, line INTEGER, title TEXT, prompt TEXT);
+CREATE TABLE menu_targets (menu TEXT, key TEXT, label TEXT, kind TEXT, target TEXT);
+CREATE TABLE apps (
+  key TEXT, file TEXT, section TEXT, label TEXT, default_on INTEGER,
+  packages TEXT, description TEXT, strategy TEXT, version_var TEXT
+);
+CREATE TABLE app_packages (app TEXT, file TEXT, package TEXT);
+CREATE TABLE profiles (name TEXT, file TEXT, app TEXT, position INTEGER);
+CREATE TABLE profile_versions (name TEXT, file TEXT, line TEXT);
+CREATE INDEX functions_name ON functions (name);
+CREATE INDEX functions_file ON functions (file);
+CREATE INDEX calls_callee ON calls (callee);
+CREATE INDEX calls_caller ON calls (caller);
+CREATE INDEX sources_target ON sources (target);
+CREATE INDEX menu_targets_target ON menu_targets (target);
+CREATE INDEX menu_targets_menu ON menu_targets (menu);
+CREATE INDEX apps_key ON apps (key);
+CREATE INDEX apps_strategy ON apps (strategy);
+CREATE INDEX app_packages_package ON app_packages (package);
+CREATE INDEX profiles_name ON profiles (name);
+CREATE INDEX profiles_app ON profiles (app);
+"""
+
+
+# -----------------------------
+# Catalogue and profiles
+# -----------------------------
+
+def _array_words(text: str, pos: int) -> List[str]:
+    """Words of a Bash array literal starting just after "NAME=(" (quotes and comments aware)."""
+    words: List[str] = []
+    word: List[str] = []
+    in_word = False
+    n = len(text)
+    while pos < n:
+        c = text[pos]
+        if c in "\"'":
+            end = pos + 1
+            while end < n and text[end] != c:
+                end += 2 if c == '"' and text[end] == "\\" else 1
+            word.append(text[pos + 1:end])
+            in_word, pos = True, end + 1
+            continue
+        if c.isspace() or c == ")":
+            if in_word:
+                words.append("".join(word))
+                word, in_word = [], False
+            if c == ")":
+                break
+        elif c == "#" and not in_word:
+            nl = text.find("\n", pos)
+            pos = n if nl < 0 else nl
+            continue
+        else:
+            word.append(c)
+            in_word = True
+        pos += 1
+    return words
+
+
+def parse_app_data(rel: str, text: str) -> Dict[str, object]:
+    """APP_CATALOGUE rows and PROFILE_* arrays assigned in one file."""
+    arrays = {m.group(1): _array_words(text, m.end()) for m in ARRAY_START.finditer(text)}
+
+    apps = []
+    section = ""
+    for row in arrays.get("APP_CATALOGUE", []):
+        kind, _, rest = row.partition("|")
+        if kind == "HEADING":
+            section = rest
+        elif kind == "APP":
+            values = (rest.split("|") + [""] * len(APP_FIELDS))[:len(APP_FIELDS)]
+            app = dict(zip(APP_FIELDS, values))
+            app["default"] = app["default"].upper() == "ON"
+            app["packages"] = [p for p in app["packages"].split(",") if p]
+            apps.append({**app, "file": rel, "section": section})
+
+    def expand(name: str, seen: frozenset = frozenset()) -> List[str]:
+        out: List[str] = []
+        for word in arrays.get(name, []):
+            ref = ARRAY_REF.match(word)
+            if ref and ref.group(1) not in seen:
+                out.extend(expand(ref.group(1), seen | {name}))
+            elif not ref:
+                out.append(word)
+        return out
+
+    profiles: Dict[str, Dict[str, object]] = {}
+    for var in arrays:
+        m = PROFILE_VAR.match(var)
+        if m:
+            entry = profiles.setdefault(m.group(1).lower(), {"file": rel, "apps": [], "versions": []})
+            entry["apps" if m.group(2) == "KEYS" else "versions"] = expand(var)
+    if profiles and not profiles.get("all", {}).get("apps"):
+        union = sorted({a for p in profiles.values() for a in p["apps"]})
+        profiles.setdefault("all", {"file": rel, "apps": [], "versions": []})["apps"] = union
+    return {"apps": apps, "profiles": profiles}
+
+
+# -----------------------------
+# Build and write
+# -----------------------------
+
+def build_project_index(repo: Path, symbols: SymbolTable) -> Dict[str, object]:
+    """Collect the index as a JSON-ready dict."""
+    functions = []
+    for rel in sorted(symbols.files):
+        for fdef in sorted(symbols.files[rel].functions, key=lambda f: f.line):
+            functions.append({
+                "name": fdef.name,
+                "file": rel,
+                "line": fdef.line,
+                "calls": symbols.calls_of(fdef),
+                "callers": symbols.callers.get(fdef.name, []),
+            })
+
+    apps: List[Dict[str, object]] = []
+    profiles: List[Dict[str, object]] = []
+    for rel in APP_DATA_FILES:
+        if rel not in symbols.files:
+            continue
+        data = parse_app_data(rel, (repo / rel).read_text(encoding="utf-8", errors="ignore"))
+        apps.extend(data["apps"])
+        profiles.extend({"name": name, **p} for name, p in sorted(data["profiles"].items()))
+
+    menus = [
+        {
+            "function": m.function,
+            "file": m.file,
+            "line": m.line,
+            "title": m.title,
+            "prompt": m.prompt,
+            "entries": [
+                {"key": e.key, "label": e.label, "targets": [{"kind": k, "target": t} for k, t in e.targets]}
+                for e in m.entries
+            ],
+        }
+        for m in parse_menus(repo, symbols)
+    ]
+
+    return {
+        "version": INDEX_VERSION,
+        "files": [
+            {"path": rel, "sha256": symbols.digests.get(rel, ""), "functions": len(fi.functions)}
+            for rel, fi in sorted(symbols.files.items())
+        ],
+        "functions": functions,
+        "sources": [{"file": src, "target": dest} for src, dest in symbols.source_edges],
+        "menus": menus,
+        "apps": apps,
+        "profiles": profiles,
+    }
+
+
+def write_sqlite(index: Dict[str, object], path: Path) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.unlink(missing_ok=True)
+    con = sqlite3.connect(tmp)
+    try:
+        con.executescript(SCHEMA)
+        con.execute("INSERT INTO meta VALUES ('version', ?)", (str(index["version"]),))
+        con.executemany("INSERT INTO files VALUES (:path, :sha256, :functions)", index["files"])
+        con.executemany("INSERT INTO functions VALUES (:name, :file, :line)", index["functions"])
+        con.executemany(
+            "INSERT INTO calls VALUES (?, ?, ?)",
+            ((f["name"], f["file"], callee) for f in index["functions"] for callee in f["calls"]),
+        )
+        con.executemany("INSERT INTO sources VALUES (:file, :target)", index["sources"])
+        con.executemany("INSERT INTO menus VALUES (:function, :file, :line, :title, :prompt)", index["menus"])
+        con.executemany(
+            "INSERT INTO menu_targets VALUES (?, ?, ?, ?, ?)",
+            (
+                (m["function"], e["key"], e["label"], t["kind"], t["target"])
+                for m in index["menus"] for e in m["entries"] for t in (e["targets"] or [{"kind": None, "target": None}])
+            ),
+        )
+        con.executemany(
+            "INSERT INTO apps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (a["key"], a["file"], a["section"], a["label"], int(a["default"]), ",".join(a["packages"]),
+                 a["description"], a["strategy"], a["version_var"])
+                for a in index["apps"]
+            ),
+        )
+        con.executemany(
+            "INSERT INTO app_packages VALUES (?, ?, ?)",
+            ((a["key"], a["file"], pkg) for a in index["apps"] for pkg in a["packages"]),
+        )
+        con.executemany(
+            "INSERT INTO profiles VALUES (?, ?, ?, ?)",
+            ((p["name"], p["file"], app, i) for p in index["profiles"] for i, app in enumerate(p["apps"])),
+        )
+        con.executemany(
+            "INSERT INTO profile_versions VALUES (?, ?, ?)",
+            ((p["name"], p["file"], line) for p in index["profiles"] for line in p["versions"]),
+        )
+        con.commit()
+    finally:
+        con.close()
+    tmp.replace(path)
+
+
+def write_project_index(repo: Path, symbols: SymbolTable, json_path: Path, sqlite_path: Path) -> Path:
+    """Build the index and write both files (pipeline task; returns json_path)."""
+    index = build_project_index(repo, symbols)
+    tmp = json_path.with_suffix(json_path.suffix + ".tmp")
+    tmp.write_text(json.dumps(index, indent=1, ensure_ascii=False) + "\n")
+    tmp.replace(json_path)
+    write_sqlite(index, sqlite_path)
+    return json_path
@@ -0,0 +1,100 @@
+"""
+Fouchger Homelab – Manual Generator: reproducible outputs
+
+Description:
+  Post-processing that makes generated files byte-identical across runs on
+  the same repo snapshot, so they can be deduplicated by hash, rsynced
+  without spurious transfers, and fed to the PDF cache without false misses.
+
+Notes:
+  - The build date comes from SOURCE_DATE_EPOCH when set
+    (https://reproducible-builds.org/specs/source-date-epoch/).
+  - DOCX: zip entries are rewritten in a fixed order with a fixed timestamp
+    and fixed permissions; core properties use the epoch date.
+  - PNG: ancillary text/time chunks (tEXt, zTXt, iTXt, tIME) are stripped;
+    pixel data is untouched.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import re
+import struct
+import zipfile
+from pathlib import Path
+
+ZIP_EPOCH_MIN = 315532800  # 1980-01-01, the earliest time a zip entry can hold
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_DROP_CHUNKS = {b"tEXt", b"zTXt", b"iTXt", b"tIME"}
+
+
+def source_date_epoch() -> int | None:
+    """SOURCE_DATE_EPOCH as an int, or None if unset or invalid."""
+    raw = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if not raw.isdigit():
+        return None
+    return int(raw)
+
+
+def epoch_date(epoch: int) -> _dt.date:
+    return _dt.datetime.fromtimestamp(epoch, tz=_dt.timezone.utc).date()
+
+
+def normalize_docx(path: Path, epoch: int) -> None:
+    """
+    Rewrite a DOCX zip deterministically in place.
+
+    Notes:
+      - [Content_Types].xml stays first (Office expects it); the remaining
+        entries are sorted by name.
+      - dcterms:created/modified in docProps/core.xml are set to the epoch.
+    """
+    stamp = _dt.datetime.fromtimestamp(max(epoch, ZIP_EPOCH_MIN), tz=_dt.timezone.utc)
+    date_time = stamp.timetuple()[:6]
+    iso = _dt.datetime.fromtimestamp(epoch, tz=_dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    with zipfile.ZipFile(path) as zin:
+        entries = {info.filename: zin.read(info) for info in zin.infolist()}
+
+    core = entries.get("docProps/core.xml")
+    if core is not None:
+        entries["docProps/core.xml"] = re.sub(
+            rb"(<dcterms:(?:created|modified)[^>]*>)[^<]*(</dcterms:)",
+            lambda m: m.group(1) + iso.encode("ascii") + m.group(2),
+            core,
+        )
+
+    names = sorted(entries, key=lambda n: (n != "[Content_Types].xml", n))
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+        for name in names:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            info.create_system = 3
+            zout.writestr(info, entries[name])
+    tmp.replace(path)
+
+
+def strip_png_metadata(path: Path) -> None:
+    """Drop text and timestamp chunks from a PNG in place."""
+    data = path.read_bytes()
+    if not data.startswith(PNG_SIGNATURE):
+        return
+    out = [PNG_SIGNATURE]
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        ctype = data[pos + 4:pos + 8]
+        end = pos + 12 + length
+        if ctype not in PNG_DROP_CHUNKS:
+            out.append(data[pos:end])
+        pos = end
+        if ctype == b"IEND":
+            break
+    cleaned = b"".join(out)
+    if cleaned != data:
+        path.write_bytes(cleaned)
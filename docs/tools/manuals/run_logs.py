@@ -0,0 +1,273 @@
+"""
+Fouchger Homelab – Manual Generator: run log analytics
+
+Description:
+  Streams the per-run logs written by lib/run.sh (<LOG_DIR_DEFAULT>/<RUN_ID>.log,
+  RUN_ID = YYYYmmdd-HHMMSS-<component>) and their rotated copies
+  (<RUN_ID>.log.<timestamp>.bak from logging_rotate_file) into a LogStats
+  summary for the Runbook's operational analytics chapter: runs, failures
+  and duration per component, and the most frequent ERROR/WARN messages.
+
+Notes:
+  - Only the Layer 1 lines ("<date -Is> [<label>] message") are counted.
+    run_init() also captures stdout into the same file, which repeats every
+    message without a timestamp; those copies and raw command output are
+    skipped.
+  - A run is failed if it logged "Run failed (exit N)" (the ERR trap),
+    completed if it logged "Run completed successfully." and otherwise
+    unfinished (interrupted, killed, or still running). Duration is the
+    span between its first and last timestamped line; a run with only one
+    has none and is left out of the mean.
+  - A run's backups and live log are read in order by one worker, so a
+    rotated run is still counted once. Files are read line by line; memory
+    is bounded by the number of components and distinct messages, not by
+    log size. Messages are grouped with digits replaced by "#" and trimmed;
+    a run being scanned and each worker's merged total are pruned to the
+    MAX_MESSAGES most frequent once they pass twice that, so the counts in
+    the long tail are approximate.
+  - scan_run_logs() splits runs across a process pool with jobs > 1. Worker
+    results are small and merge in the parent.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from manuals.cache import digest_values
+
+RUN_ID = re.compile(r"^(\d{8}-\d{6})-(.+)$")
+LOG_NAME = re.compile(r"^(?P<run>.+)\.log(?:\.(?P<rotated>[^/]+)\.bak)?$")
+LINE = re.compile(r"^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\S*) \[([^\]]*)\] (.*)$")
+MAX_MESSAGES = 2000
+MESSAGE_CHARS = 160
+TOP_MESSAGES = 15
+
+
+def default_log_dir() -> Path:
+    """LOG_DIR_DEFAULT as lib/paths.sh resolves it (environment first)."""
+    if os.environ.get("LOG_DIR_DEFAULT"):
+        return Path(os.environ["LOG_DIR_DEFAULT"]).expanduser()
+    state = os.environ.get("STATE_DIR_DEFAULT") or str(Path.home() / ".config" / "fouchger_homelab")
+    return Path(state).expanduser() / "logs"
+
+
+@dataclass
+class ComponentStats:
+    runs: int = 0
+    failed: int = 0
+    completed: int = 0
+    timed: int = 0  # runs with at least two timestamps
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def merge(self, other: ComponentStats) -> None:
+        self.runs += other.runs
+        self.failed += other.failed
+        self.completed += other.completed
+        self.timed += other.timed
+        self.seconds += other.seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+
+@dataclass
+class LogStats:
+    files: int = 0
+    lines: int = 0
+    components: Dict[str, ComponentStats] = field(default_factory=dict)
+    messages: Counter = field(default_factory=Counter)  # (level, message) -> count
+    unreadable: int = 0
+
+    @property
+    def runs(self) -> int:
+        return sum(c.runs for c in self.components.values())
+
+    @property
+    def failed(self) -> int:
+        return sum(c.failed for c in self.components.values())
+
+    def merge(self, other: LogStats) -> None:
+        self.files += other.files
+        self.lines += other.lines
+        self.unreadable += other.unreadable
+        for name, comp in other.components.items():
+            self.components.setdefault(name, ComponentStats()).merge(comp)
+        self.messages.update(other.messages)
+        self._prune()
+
+    def _prune(self) -> None:
+        if len(self.messages) > 2 * MAX_MESSAGES:
+            self.messages = Counter(dict(self.messages.most_common(MAX_MESSAGES)))
+
+    def top_messages(self, n: int = TOP_MESSAGES) -> List[Tuple[str, str, int]]:
+        """(level, message, count), most frequent first."""
+        ranked = sorted(self.messages.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [(level, msg, count) for (level, msg), count in ranked[:n]]
+
+
+@dataclass
+class RunLogs:
+    """A log directory's run logs, grouped by run, with a cheap listing digest."""
+    log_dir: Path
+    runs: List[Tuple[str, List[Path]]]  # (run id, backups oldest first then the live log)
+    digest: str
+    skipped: int = 0  # *.log / *.bak files that are not run logs
+    stats: LogStats | None = None  # filled by the build once the runbook needs it
+
+
+def _level(label: str) -> str | None:
+    for level in ("ERROR", "WARN"):
+        if level in label:
+            return level
+    return None
+
+
+def _normalise(message: str) -> str:
+    message = message.split(" See log: ", 1)[0]
+    message = re.sub(r"\d+", "#", message)
+    if len(message) > MESSAGE_CHARS:
+        message = message[: MESSAGE_CHARS - 1] + "…"
+    return message
+
+
+def _seconds(first: str, last: str) -> float | None:
+    try:
+        return (_dt.datetime.fromisoformat(last) - _dt.datetime.fromisoformat(first)).total_seconds()
+    except ValueError:
+        return None
+
+
+def scan_run(run_id: str, paths: Sequence[Path]) -> LogStats:
+    """Stream one run's log files (in order) into a LogStats with a single run."""
+    stats = LogStats()
+    m = RUN_ID.match(run_id)
+    comp = stats.components.setdefault(m.group(2) if m else run_id, ComponentStats())
+    comp.runs = 1
+    first = last = ""
+    failed = completed = False
+    for path in paths:
+        try:
+            fh = path.open("r", encoding="utf-8", errors="replace")
+        except OSError:
+            stats.unreadable += 1
+            continue
+        stats.files += 1
+        with fh:
+            for line in fh:
+                stats.lines += 1
+                if not line[:1].isdigit():
+                    continue
+                lm = LINE.match(line.rstrip("\n"))
+                if not lm:
+                    continue
+                ts, label, message = lm.groups()
+                if first:
+                    last = ts
+                else:
+                    first = ts  # last stays empty until a second timestamp
+                level = _level(label)
+                if level is None:
+                    completed = completed or message.startswith("Run completed successfully")
+                    continue
+                failed = failed or message.startswith("Run failed (exit")
+                stats.messages[(level, _normalise(message))] += 1
+                if len(stats.messages) > 2 * MAX_MESSAGES:
+                    stats._prune()
+    comp.failed = int(failed)
+    comp.completed = int(completed and not failed)
+    if first and last:
+        secs = _seconds(first, last)
+        if secs is not None and secs >= 0:
+            comp.timed = 1
+            comp.seconds = comp.max_seconds = secs
+    return stats
+
+
+def _scan_batch(runs: Sequence[Tuple[str, List[Path]]]) -> LogStats:
+    total = LogStats()
+    for run_id, paths in runs:
+        total.merge(scan_run(run_id, paths))
+    return total
+
+
+def find_run_logs(log_dir: Path) -> RunLogs:
+    """Group <RUN_ID>.log and rotated <RUN_ID>.log.*.bak files under log_dir (recursively) by run."""
+    groups: Dict[str, List[Tuple[int, str, Path]]] = {}
+    skipped = 0
+    listing: List[Tuple[str, int, int]] = []
+    if log_dir.is_dir():
+        for dirpath, _, filenames in os.walk(log_dir):
+            for name in filenames:
+                m = LOG_NAME.match(name)
+                if not m:
+                    continue
+                if not RUN_ID.match(m.group("run")):
+                    skipped += 1
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                # Backups sort by their ISO timestamp and come before the live log.
+                rotated = m.group("rotated")
+                groups.setdefault(m.group("run"), []).append((0 if rotated else 1, rotated or "", path))
+                listing.append((path.relative_to(log_dir).as_posix(), st.st_size, st.st_mtime_ns))
+    runs = [(run_id, [p for _, _, p in sorted(files)]) for run_id, files in sorted(groups.items())]
+    return RunLogs(log_dir, runs, digest_values(sorted(listing)), skipped)
+
+
+def _batches(items: Sequence, n: int) -> Iterable[Sequence]:
+    size = max(1, -(-len(items) // n))
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def scan_run_logs(logs: RunLogs, jobs: int = 1) -> LogStats:
+    """
+    Aggregate every run in logs, across `jobs` worker processes.
+
+    Notes:
+      - Runs are split into about 4 batches per worker so a few very large
+        logs do not leave the other workers idle.
+    """
+    if jobs <= 1 or len(logs.runs) < 2 * jobs:
+        return _scan_batch(logs.runs)
+    total = LogStats()
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        for part in ex.map(_scan_batch, _batches(logs.runs, jobs * 4)):
+            total.merge(part)
+    return total
+
+
+def format_seconds(secs: float) -> str:
+    if secs < 60:
+        return f"{secs:.0f}s"
+    if secs < 3600:
+        return f"{secs / 60:.1f}m"
+    return f"{secs / 3600:.1f}h"
+
+
+def component_rows(stats: LogStats) -> List[Tuple[str, str, str, str, str, str, str]]:
+    """(component, runs, failed, failure rate, unfinished, mean duration, max duration), busiest first."""
+    rows = []
+    for name, c in sorted(stats.components.items(), key=lambda kv: (-kv[1].runs, kv[0])):
+        unfinished = c.runs - c.failed - c.completed
+        rows.append((
+            name,
+            str(c.runs),
+            str(c.failed),
+            f"{100 * c.failed / c.runs:.1f}%" if c.runs else "-",
+            str(unfinished),
+            format_seconds(c.seconds / c.timed) if c.timed else "-",
+            format_seconds(c.max_seconds) if c.timed else "-",
+        ))
+    return rows
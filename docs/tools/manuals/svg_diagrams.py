@@ -0,0 +1,147 @@
+"""
+Fouchger Homelab – Manual Generator: SVG diagram backend
+
+Description:
+  Lightweight alternative to the matplotlib renderer in generate_manuals.py.
+  It turns the same box/arrow specs into SVG text directly (no plotting
+  library), and rasterizes to PNG only when a DOCX needs a bitmap.
+
+Notes:
+  - Coordinates follow the matplotlib path: boxes are (x, y, w, h) in 0..1
+    axes units with y pointing up; the SVG viewBox flips y.
+  - PNG rasterization uses rsvg-convert (librsvg2-bin) or the cairosvg Python
+    package, whichever is available. If neither is, rasterize_png() returns
+    False and the caller falls back to matplotlib for that PNG.
+  - Output is deterministic for a given spec, which keeps the build cache and
+    reproducible builds simple.
+  - The Markdown/HTML manuals link these SVGs directly (write_svg), so those
+    formats never need matplotlib or a rasterizer.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+UNITS_PER_INCH = 100
+PT = UNITS_PER_INCH / 72.0
+MARGIN = 0.03
+BOX_PAD = 0.02
+
+
+def _fmt(v: float) -> str:
+    return f"{v:.1f}".rstrip("0").rstrip(".")
+
+
+def _text(x: float, y: float, txt: str, size_pt: float, *, bold: bool = False) -> str:
+    """Centred, possibly multi-line text block around (x, y)."""
+    lines = txt.split("\n")
+    size = size_pt * PT
+    first_dy = -(len(lines) - 1) * 0.6 * size
+    weight = ' font-weight="bold"' if bold else ""
+    spans = []
+    for i, line in enumerate(lines):
+        dy = first_dy if i == 0 else 1.2 * size
+        spans.append(f'<tspan x="{_fmt(x)}" dy="{_fmt(dy)}">{escape(line)}</tspan>')
+    return (
+        f'<text x="{_fmt(x)}" y="{_fmt(y)}" font-size="{_fmt(size)}"{weight} '
+        f'text-anchor="middle" dominant-baseline="central">{"".join(spans)}</text>'
+    )
+
+
+def render_svg(
+    boxes: Dict[str, Tuple[float, float, float, float, str]],
+    arrows: List[Tuple[str, str, str]],
+    *,
+    figsize: Tuple[float, float] = (11, 6),
+    title: str | None = None,
+) -> str:
+    """Return an SVG document for a box-and-arrow spec."""
+    width, height = figsize[0] * UNITS_PER_INCH, figsize[1] * UNITS_PER_INCH
+    inner_w, inner_h = width * (1 - 2 * MARGIN), height * (1 - 2 * MARGIN)
+
+    def px(x: float, y: float) -> Tuple[float, float]:
+        return width * MARGIN + x * inner_w, height * MARGIN + (1 - y) * inner_h
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_fmt(figsize[0])}in" height="{_fmt(figsize[1])}in" '
+        f'viewBox="0 0 {_fmt(width)} {_fmt(height)}" font-family="DejaVu Sans, Calibri, sans-serif">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10" fill="none" stroke="black"/></marker></defs>',
+        f'<rect width="{_fmt(width)}" height="{_fmt(height)}" fill="white"/>',
+    ]
+
+    if title:
+        tx, ty = px(0.5, 0.98)
+        out.append(_text(tx, ty + 8 * PT, title, 14, bold=True))
+
+    radius = BOX_PAD * min(inner_w, inner_h)
+    for x, y, w, h, txt in boxes.values():
+        x0, y0 = px(x - BOX_PAD, y + h + BOX_PAD)
+        x1, y1 = px(x + w + BOX_PAD, y - BOX_PAD)
+        out.append(
+            f'<rect x="{_fmt(x0)}" y="{_fmt(y0)}" width="{_fmt(x1 - x0)}" height="{_fmt(y1 - y0)}" '
+            f'rx="{_fmt(radius)}" fill="#1f77b4" stroke="black" stroke-width="1"/>'
+        )
+        cx, cy = px(x + w / 2, y + h / 2)
+        out.append(_text(cx, cy, txt, 10))
+
+    for frm, to, label in arrows:
+        x1, y1, w1, h1, _ = boxes[frm]
+        x2, y2, w2, h2, _ = boxes[to]
+        # Same anchor rule as the matplotlib renderer.
+        start = (x1 + w1 / 2, y1) if y2 < y1 else (x1 + w1 / 2, y1 + h1)
+        end = (x2 + w2 / 2, y2 + h2) if y2 < y1 else (x2 + w2 / 2, y2)
+        sx, sy = px(*start)
+        ex, ey = px(*end)
+        out.append(
+            f'<line x1="{_fmt(sx)}" y1="{_fmt(sy)}" x2="{_fmt(ex)}" y2="{_fmt(ey)}" '
+            f'stroke="black" stroke-width="1" marker-end="url(#arrow)"/>'
+        )
+        if label:
+            out.append(_text((sx + ex) / 2, (sy + ey) / 2, label, 9))
+
+    out.append("</svg>")
+    return "\n".join(out) + "\n"
+
+
+def write_svg(spec: Dict[str, object], svg_path: Path) -> Path:
+    """Write one diagram spec as SVG (process-pool friendly; atomic replace)."""
+    tmp = svg_path.with_suffix(".svg.tmp")
+    tmp.write_text(render_svg(spec["boxes"], spec["arrows"], figsize=spec["figsize"], title=spec["title"]))
+    tmp.replace(svg_path)
+    return svg_path
+
+
+def rasterizer() -> str | None:
+    """Name of the available SVG->PNG rasterizer, or None."""
+    if shutil.which("rsvg-convert"):
+        return "rsvg-convert"
+    try:
+        import cairosvg  # noqa: F401
+    except (ImportError, OSError):
+        # OSError: the wheel is installed but the system libcairo is not.
+        return None
+    return "cairosvg"
+
+
+def rasterize_png(svg_path: Path, png_path: Path, *, dpi: int = 200) -> bool:
+    """Rasterize svg_path to png_path. Returns False if no rasterizer is available."""
+    tool = rasterizer()
+    if tool == "rsvg-convert":
+        subprocess.run(
+            ["rsvg-convert", "--dpi-x", str(dpi), "--dpi-y", str(dpi), "-o", str(png_path), str(svg_path)],
+            check=True,
+        )
+        return True
+    if tool == "cairosvg":
+        import cairosvg
+
+        cairosvg.svg2png(url=str(svg_path), write_to=str(png_path), dpi=dpi)
+        return True
+    return False
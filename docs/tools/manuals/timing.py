@@ -0,0 +1,153 @@
+"""
+Fouchger Homelab – Manual Generator: phase timing and profiling
+
+Description:
+  Per-phase wall/CPU accounting for generate_manuals.py (--timings) and
+  optional cProfile dumps per phase (--profile).
+
+Usage:
+  with phase("scan"):
+      ...
+  Code anywhere in the generator can open a phase; it is a no-op unless a
+  PhaseTimer has been activated for the current thread.
+
+Notes:
+  - Phases nest. Reported times are exclusive: a "compose:..." phase does not
+    include the nested "save:..." phase.
+  - cpu is this process's CPU time; child_cpu is CPU used by waited-for child
+    processes (soffice, rsvg-convert) during the phase. With --jobs > 1,
+    child_cpu of concurrent PDF threads can overlap.
+  - Work done in pool workers is timed there and shipped back with the task
+    result (see run_timed), so the report covers the whole build.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Per thread, so concurrent PDF threads each report into their own timer.
+_STATE = threading.local()
+
+
+def _child_cpu() -> float:
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ru.ru_utime + ru.ru_stime
+
+
+class PhaseTimer:
+    def __init__(self, profile_dir: Path | None = None) -> None:
+        self.profile_dir = profile_dir
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        parent = self._stack[-1] if self._stack else None
+        frame: Dict[str, Any] = {"name": name, "child_wall": 0.0, "child_cpu": 0.0, "child_ccpu": 0.0, "prof": None}
+        if self.profile_dir is not None:
+            if parent is not None and parent["prof"] is not None:
+                parent["prof"].disable()
+            frame["prof"] = cProfile.Profile()
+            frame["prof"].enable()
+
+        self._stack.append(frame)
+        wall0, cpu0, ccpu0 = time.perf_counter(), time.process_time(), _child_cpu()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            ccpu = _child_cpu() - ccpu0
+            self._stack.pop()
+
+            if frame["prof"] is not None:
+                frame["prof"].disable()
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                frame["prof"].dump_stats(str(self.profile_dir / (name.replace(":", "_").replace("/", "_") + ".prof")))
+                if parent is not None and parent["prof"] is not None:
+                    parent["prof"].enable()
+
+            self.records.append({
+                "phase": name,
+                "wall": round(wall - frame["child_wall"], 6),
+                "cpu": round(cpu - frame["child_cpu"], 6),
+                "child_cpu": round(ccpu - frame["child_ccpu"], 6),
+                "pid": os.getpid(),
+            })
+            if parent is not None:
+                parent["child_wall"] += wall
+                parent["child_cpu"] += cpu
+                parent["child_ccpu"] += ccpu
+
+    def merge(self, records: List[Dict[str, Any]]) -> None:
+        self.records.extend(records)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Sum exclusive times by category (the part of the phase name before ':')."""
+        out: Dict[str, Dict[str, float]] = {}
+        for r in self.records:
+            cat = r["phase"].split(":", 1)[0]
+            t = out.setdefault(cat, {"wall": 0.0, "cpu": 0.0, "child_cpu": 0.0, "count": 0})
+            t["wall"] += r["wall"]
+            t["cpu"] += r["cpu"]
+            t["child_cpu"] += r["child_cpu"]
+            t["count"] += 1
+        return out
+
+    def report(self) -> str:
+        lines = [f"  {'phase':<40} {'wall s':>8} {'cpu s':>8} {'child s':>8}"]
+        for r in self.records:
+            lines.append(f"  {r['phase']:<40} {r['wall']:8.3f} {r['cpu']:8.3f} {r['child_cpu']:8.3f}")
+        lines.append("  totals by category:")
+        for cat, t in sorted(self.totals().items(), key=lambda kv: -kv[1]["wall"]):
+            lines.append(f"  {cat + ' (x' + str(t['count']) + ')':<40} {t['wall']:8.3f} {t['cpu']:8.3f} {t['child_cpu']:8.3f}")
+        return "\n".join(lines)
+
+    def write_json(self, path: Path, **extra: Any) -> None:
+        payload = {"phases": self.records, "totals": self.totals(), **extra}
+        path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def activate(timer: PhaseTimer | None) -> PhaseTimer | None:
+    """Make timer the active timer for this thread; returns the previous one."""
+    prev = getattr(_STATE, "timer", None)
+    _STATE.timer = timer
+    return prev
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block against the active PhaseTimer (no-op if none)."""
+    timer = getattr(_STATE, "timer", None)
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+def run_timed(name: str, profile_dir: Path | None, fn: Callable[..., Any], *args: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Run fn(*args) under a fresh timer and return (result, phase records).
+
+    Notes:
+      - Used by the pipeline so work done in pool workers is reported back.
+    """
+    timer = PhaseTimer(profile_dir)
+    prev = activate(timer)
+    try:
+        with timer.phase(name):
+            result = fn(*args)
+    finally:
+        activate(prev)
+    return result, timer.records
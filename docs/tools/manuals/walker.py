@@ -0,0 +1,213 @@
+"""
+Fouchger Homelab – Manual Generator: repository walker
+
+Description:
+  Lists the repo files the scanner should read. In a git checkout it asks
+  `git ls-files` (tracked files plus untracked files that are not ignored),
+  so the cost is bounded by the project, not by whatever build output, venvs
+  or worktree copies sit next to it. Elsewhere it walks the tree, pruning
+  excluded and .gitignore'd directories before descending into them.
+
+Notes:
+  - EXCLUDES always applies, in both modes, so a committed copy of generated
+    docs or a vendored tree is not indexed as project code. Callers add the
+    output directory when it lives inside the repo.
+  - The fallback .gitignore matcher covers what this repo uses: comments,
+    negation, trailing "/" for directories, leading "/" anchors and "*", "?",
+    "[...]" globs ("**" matches like "*"). Nested .gitignore files apply
+    below their directory.
+  - `skipped` counts pruned paths: ignored or excluded files, and ignored or
+    excluded directories counted once each (their contents are never listed).
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+EXCLUDES = (".git", "docs/generated", "node_modules", ".venv", "venv", "__pycache__", ".worktrees")
+
+
+@dataclass
+class RepoWalk:
+    files: List[Path] = field(default_factory=list)
+    skipped: int = 0
+    method: str = "walk"  # "git" or "walk"
+
+
+def _excluded(rel: str, excludes: Sequence[str]) -> bool:
+    """rel (posix, repo-relative) is an exclude entry, under one, or has one as a path component."""
+    parts = rel.split("/")
+    for ex in excludes:
+        if "/" in ex:
+            if rel == ex or rel.startswith(ex + "/"):
+                return True
+        elif ex in parts:
+            return True
+    return False
+
+
+# -----------------------------
+# git
+# -----------------------------
+
+def _git_lines(repo: Path, *args: str) -> List[str] | None:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(repo), *args],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [p for p in os.fsdecode(proc.stdout).split("\0") if p]
+
+
+def git_files(repo: Path) -> Tuple[List[str], int] | None:
+    """(tracked + untracked-but-not-ignored paths, ignored path count), or None outside a git checkout."""
+    if shutil.which("git") is None or not (repo / ".git").exists():
+        return None
+    listed = _git_lines(repo, "ls-files", "-z", "--cached", "--others", "--exclude-standard")
+    if listed is None:
+        return None
+    # --directory reports an ignored directory once instead of listing its contents.
+    ignored = _git_lines(repo, "ls-files", "-z", "--others", "--ignored", "--exclude-standard", "--directory") or []
+    return sorted(set(listed)), len(ignored)
+
+
+def git_worktrees(repo: Path) -> List[Path]:
+    """Checked-out worktrees of the repository containing repo (main first); [] if not a git checkout."""
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(repo), "worktree", "list", "--porcelain"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return []
+    out: List[Path] = []
+    for block in proc.stdout.strip().split("\n\n"):
+        lines = block.splitlines()
+        if not lines or not lines[0].startswith("worktree "):
+            continue
+        path = Path(lines[0][len("worktree "):])
+        if any(line == "bare" or line.startswith("prunable") for line in lines[1:]):
+            continue
+        if path.is_dir():
+            out.append(path)
+    return out
+
+
+# -----------------------------
+# Fallback walk
+# -----------------------------
+
+class _Ignore:
+    """Patterns from one .gitignore, relative to its directory."""
+
+    def __init__(self, base: str, text: str) -> None:
+        self.base = base
+        self.rules: List[Tuple[str, bool, bool, bool]] = []  # (pattern, negate, dir_only, anchored)
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            line = line[1:] if negate else line
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            self.rules.append((line.lstrip("/").replace("**/", "*").replace("/**", "/*"), negate, dir_only, anchored))
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """True/False if a rule decides rel (last match wins), None otherwise."""
+        if self.base:
+            if not rel.startswith(self.base + "/"):
+                return None
+            rel = rel[len(self.base) + 1:]
+        name = rel.rsplit("/", 1)[-1]
+        result = None
+        for pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if fnmatch.fnmatchcase(rel if anchored else name, pattern):
+                result = not negate
+        return result
+
+
+def _ignored(rel: str, is_dir: bool, stack: Iterable[_Ignore]) -> bool:
+    result = False
+    for ig in stack:
+        m = ig.match(rel, is_dir)
+        if m is not None:
+            result = m
+    return result
+
+
+def walk_files(repo: Path, excludes: Sequence[str]) -> Tuple[List[str], int]:
+    """(repo-relative paths, skipped count) via os.walk with .gitignore pruning."""
+    out: List[str] = []
+    skipped = 0
+    ignores: List[_Ignore] = []
+    for dirpath, dirnames, filenames in os.walk(repo):
+        rel_dir = Path(dirpath).relative_to(repo).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir
+        # Keep only the .gitignore files that apply at this depth.
+        ignores = [ig for ig in ignores if not ig.base or rel_dir == ig.base or rel_dir.startswith(ig.base + "/")]
+        if ".gitignore" in filenames:
+            try:
+                ignores.append(_Ignore(rel_dir, (Path(dirpath) / ".gitignore").read_text(errors="ignore")))
+            except OSError:
+                pass
+
+        def keep(name: str, is_dir: bool) -> bool:
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            return not _excluded(rel, excludes) and not _ignored(rel, is_dir, ignores)
+
+        kept = sorted(n for n in dirnames if keep(n, True))
+        skipped += len(dirnames) - len(kept)
+        dirnames[:] = kept
+        for n in sorted(filenames):
+            if keep(n, False):
+                out.append(f"{rel_dir}/{n}" if rel_dir else n)
+            else:
+                skipped += 1
+    return out, skipped
+
+
+# -----------------------------
+# Entry point
+# -----------------------------
+
+def walk_repo(
+    repo: Path,
+    wanted: Callable[[str], bool],
+    *,
+    excludes: Sequence[str] = EXCLUDES,
+    use_git: bool = True,
+) -> RepoWalk:
+    """Files under repo whose posix repo-relative path satisfies wanted(), sorted."""
+    listed = git_files(repo) if use_git else None
+    if listed is not None:
+        paths, skipped = listed
+        method = "git"
+    else:
+        paths, skipped = walk_files(repo, excludes)
+        method = "walk"
+
+    walk = RepoWalk(skipped=skipped, method=method)
+    for rel in paths:
+        if method == "git" and _excluded(rel, excludes):
+            walk.skipped += 1
+            continue
+        if wanted(rel):
+            p = repo / rel
+            if p.is_file():
+                walk.files.append(p)
+    walk.files.sort()
+    return walk
@@ -0,0 +1,175 @@
+"""
+Fouchger Homelab – Manual Generator: source watcher
+
+Description:
+  Change notification for generate_manuals.py --watch. Yields one batch of
+  changed paths per burst of edits, so saving several files (or an editor
+  writing a temp file and renaming it) triggers a single rebuild.
+
+Notes:
+  - Linux inotify through ctypes (no extra packages). Directories are watched
+    recursively; new subdirectories are picked up as they appear.
+  - Falls back to polling (mtime_ns/size per file) when inotify is not
+    available, for example on macOS or some network/container filesystems.
+  - A batch is yielded once no event has arrived for `debounce` seconds.
+  - If the kernel event queue overflows, the batch contains the watched roots
+    themselves; callers should treat that as "anything may have changed".
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Recursive inotify watch over a set of directories."""
+
+    def __init__(self, roots: List[Path]) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify not supported")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.roots = roots
+        self.dirs: Dict[int, Path] = {}
+        for root in roots:
+            self._add_tree(root)
+
+    def _add(self, d: Path) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(d)), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = d
+
+    def _add_tree(self, root: Path) -> None:
+        if not root.is_dir():
+            return
+        self._add(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [n for n in dirnames if not n.startswith(".")]
+            for n in dirnames:
+                self._add(Path(dirpath) / n)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read(self) -> Set[Path]:
+        """Drain pending events and return the paths they refer to."""
+        changed: Set[Path] = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos + EVENT_HEADER.size <= len(buf):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buf, pos)
+                raw = buf[pos + EVENT_HEADER.size:pos + EVENT_HEADER.size + length].rstrip(b"\0")
+                pos += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.roots)
+                    continue
+                base = self.dirs.get(wd)
+                if mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                    continue
+                if base is None:
+                    continue
+                path = base / os.fsdecode(raw) if raw else base
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may already exist in a directory moved into place.
+                    self._add_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                changed.add(path)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Stat-based fallback: compares (mtime_ns, size) for every file."""
+
+    def __init__(self, roots: List[Path], interval: float = 1.0) -> None:
+        self.roots = roots
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        state: Dict[Path, Tuple[int, int]] = {}
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [n for n in dirnames if not n.startswith(".")]
+                for n in filenames:
+                    p = Path(dirpath) / n
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    state[p] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def read(self) -> Set[Path]:
+        new = self._scan()
+        changed = {p for p in new.keys() | self.state.keys() if new.get(p) != self.state.get(p)}
+        self.state = new
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(roots: List[Path], *, poll: bool = False, interval: float = 1.0):
+    """InotifyWatcher where available, otherwise PollingWatcher."""
+    if not poll:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, interval)
+
+
+def watch_changes(watcher, *, debounce: float = 0.3) -> Iterator[Set[Path]]:
+    """Yield sets of changed paths, one per debounced burst of events."""
+    pending: Set[Path] = set()
+    polling = isinstance(watcher, PollingWatcher)
+    while True:
+        timeout = debounce if pending else None
+        if polling:
+            time.sleep(debounce if pending else watcher.interval)
+            ready = True
+        else:
+            ready = bool(select.select([watcher], [], [], timeout)[0])
+        got = watcher.read() if ready else set()
+        if got:
+            pending |= got
+        elif pending:
+            yield pending
+            pending = set()
@@ -0,0 +1,337 @@
+"""
+Fouchger Homelab – Manual Generator: output writers
+
+Description:
+  The manual builders in generate_manuals.py describe content once (title,
+  headings, paragraphs, bullet and numbered lists, tables, pictures, code,
+  footer, API reference) against a writer. Each writer renders that content
+  model to one format:
+    - DocxWriter      python-docx (imported lazily), embeds PNG diagrams
+    - MarkdownWriter  plain text, links SVG diagrams
+    - HtmlWriter      a single self-contained page, links SVG diagrams
+
+Notes:
+  - Markdown and HTML need neither python-docx nor LibreOffice, so they are
+    cheap enough to regenerate on every commit.
+  - Writers are created for a fixed output path so picture links can be made
+    relative to it; the builders pass PNGs for DOCX and SVGs for Markdown/HTML.
+  - Heading levels follow python-docx: 0 is the document title, 1 a chapter.
+
+-------------------------------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import html
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Sequence
+
+from manuals.api_reference import COLUMNS as API_COLUMNS, add_api_reference, api_reference_files
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+    from manuals.bash_index import SymbolTable
+
+SUFFIXES = {"docx": ".docx", "md": ".md", "html": ".html"}
+FORMATS = tuple(SUFFIXES)
+PICTURE_WIDTH_IN = 6.8
+
+
+# -----------------------------
+# DOCX helpers
+# -----------------------------
+
+def set_doc_styles(doc: Document) -> None:
+    from docx.shared import Pt
+
+    normal = doc.styles["Normal"]
+    normal.font.name = "Calibri"
+    normal.font.size = Pt(11)
+
+    for h, size in [("Heading 1", 20), ("Heading 2", 16), ("Heading 3", 13)]:
+        st = doc.styles[h]
+        st.font.name = "Calibri"
+        st.font.size = Pt(size)
+
+
+def add_title(doc: Document, title: str, subtitle: str | None = None) -> None:
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    r = p.add_run(title)
+    r.bold = True
+    r.font.size = Pt(28)
+
+    if subtitle:
+        p2 = doc.add_paragraph()
+        p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        r2 = p2.add_run(subtitle)
+        r2.font.size = Pt(12)
+
+
+def add_footer_note(doc: Document, text: str) -> None:
+    from docx.shared import Pt
+
+    p = doc.add_paragraph()
+    r = p.add_run(text)
+    r.italic = True
+    r.font.size = Pt(9)
+
+
+# -----------------------------
+# Writers
+# -----------------------------
+
+class DocxWriter:
+    def __init__(self, out_path: Path) -> None:
+        from docx import Document
+
+        self.out_path = out_path
+        self.doc = Document()
+        set_doc_styles(self.doc)
+
+    def title(self, title: str, subtitle: str | None = None) -> None:
+        add_title(self.doc, title, subtitle)
+
+    def heading(self, text: str, level: int) -> None:
+        self.doc.add_heading(text, level=level)
+
+    def para(self, text: str) -> None:
+        self.doc.add_paragraph(text)
+
+    def bullet(self, text: str) -> None:
+        self.doc.add_paragraph(text, style="List Bullet")
+
+    def step(self, text: str) -> None:
+        self.doc.add_paragraph(text, style="List Number")
+
+    def code(self, text: str) -> None:
+        self.doc.add_paragraph(text)
+
+    def table(self, header: Sequence[str], rows: Sequence[Sequence[str]]) -> None:
+        tbl = self.doc.add_table(rows=1, cols=len(header))
+        for cell, text in zip(tbl.rows[0].cells, header):
+            cell.text = text
+        for values in rows:
+            for cell, text in zip(tbl.add_row().cells, values):
+                cell.text = text
+
+    def picture(self, path: Path) -> None:
+        from docx.shared import Inches
+
+        self.doc.add_picture(str(path), width=Inches(PICTURE_WIDTH_IN))
+
+    def api_reference(self, symbols: SymbolTable, style: str = "table") -> None:
+        add_api_reference(self.doc, symbols, style)
+
+    def footer(self, text: str) -> None:
+        add_footer_note(self.doc, text)
+
+    def save(self) -> Path:
+        self.doc.save(self.out_path)
+        return self.out_path
+
+
+class _TextWriter:
+    """Shared list handling for the text formats: consecutive items form one list."""
+
+    def __init__(self, out_path: Path) -> None:
+        self.out_path = out_path
+        self.out: List[str] = []
+        self.list_kind: str | None = None
+
+    def _open_list(self, kind: str) -> None:
+        if self.list_kind != kind:
+            self._close_list()
+            self.list_kind = kind
+            self._list_start(kind)
+
+    def _close_list(self) -> None:
+        if self.list_kind is not None:
+            self._list_end(self.list_kind)
+            self.list_kind = None
+
+    def _list_start(self, kind: str) -> None:
+        pass
+
+    def _list_end(self, kind: str) -> None:
+        pass
+
+    def _link(self, path: Path) -> str:
+        return Path(os.path.relpath(path, self.out_path.parent)).as_posix()
+
+    def render(self) -> str:
+        raise NotImplementedError
+
+    def save(self) -> Path:
+        self._close_list()
+        self.out_path.write_text(self.render(), encoding="utf-8")
+        return self.out_path
+
+
+class MarkdownWriter(_TextWriter):
+    def _list_end(self, kind: str) -> None:
+        self.out.append("")
+
+    @staticmethod
+    def _cell(text: str) -> str:
+        return text.replace("|", "\\|").replace("\n", " ")
+
+    def title(self, title: str, subtitle: str | None = None) -> None:
+        self._close_list()
+        self.out += [f"# {title}", ""]
+        if subtitle:
+            self.out += [f"_{subtitle}_", ""]
+
+    def heading(self, text: str, level: int) -> None:
+        self._close_list()
+        self.out += ["#" * (level + 1) + " " + text, ""]
+
+    def para(self, text: str) -> None:
+        self._close_list()
+        self.out += [text, ""]
+
+    def bullet(self, text: str) -> None:
+        self._open_list("ul")
+        self.out.append(f"- {text}")
+
+    def step(self, text: str) -> None:
+        self._open_list("ol")
+        self.out.append(f"1. {text}")
+
+    def code(self, text: str) -> None:
+        self._close_list()
+        self.out += ["```bash", text.rstrip("\n"), "```", ""]
+
+    def table(self, header: Sequence[str], rows: Sequence[Sequence[str]]) -> None:
+        self._close_list()
+        self.out.append("| " + " | ".join(self._cell(h) for h in header) + " |")
+        self.out.append("|" + "---|" * len(header))
+        for values in rows:
+            self.out.append("| " + " | ".join(self._cell(v) for v in values) + " |")
+        self.out.append("")
+
+    def picture(self, path: Path) -> None:
+        self._close_list()
+        self.out += [f"![{path.stem}]({self._link(path)})", ""]
+
+    def api_reference(self, symbols: SymbolTable, style: str = "table") -> None:
+        for rel, sources, rows in api_reference_files(symbols):
+            self.heading(f"`{rel}`", 2)
+            if sources:
+                self.para("Sources: " + ", ".join(f"`{s}`" for s in sources))
+            if rows:
+                self.table([name for name, _ in API_COLUMNS], rows)
+            else:
+                self.para("No Bash functions detected.")
+
+    def footer(self, text: str) -> None:
+        self._close_list()
+        self.out += ["---", "", f"_{text}_", ""]
+
+    def render(self) -> str:
+        return "\n".join(self.out)
+
+
+HTML_STYLE = """
+body { font-family: Calibri, "DejaVu Sans", sans-serif; max-width: 60rem; margin: 2rem auto; padding: 0 1rem; line-height: 1.45; }
+h1.title { text-align: center; font-size: 2.2rem; margin-bottom: 0.2rem; }
+p.subtitle { text-align: center; margin-top: 0; }
+table { border-collapse: collapse; margin: 0.5rem 0 1rem; }
+th, td { border: 1px solid #999; padding: 0.2rem 0.5rem; vertical-align: top; text-align: left; }
+img { max-width: 100%; }
+pre { background: #f4f4f4; padding: 0.75rem; overflow-x: auto; }
+footer { margin-top: 2rem; font-size: 0.85rem; font-style: italic; }
+"""
+
+
+class HtmlWriter(_TextWriter):
+    def __init__(self, out_path: Path) -> None:
+        super().__init__(out_path)
+        self.page_title = ""
+
+    def _list_start(self, kind: str) -> None:
+        self.out.append(f"<{kind}>")
+
+    def _list_end(self, kind: str) -> None:
+        self.out.append(f"</{kind}>")
+
+    def title(self, title: str, subtitle: str | None = None) -> None:
+        self._close_list()
+        self.page_title = self.page_title or title
+        self.out.append(f'<h1 class="title">{html.escape(title)}</h1>')
+        if subtitle:
+            self.out.append(f'<p class="subtitle">{html.escape(subtitle)}</p>')
+
+    def heading(self, text: str, level: int) -> None:
+        self._close_list()
+        if level == 0:
+            self.title(text)
+            return
+        n = min(level + 1, 6)
+        self.out.append(f"<h{n}>{html.escape(text)}</h{n}>")
+
+    def para(self, text: str) -> None:
+        self._close_list()
+        self.out.append(f"<p>{html.escape(text)}</p>")
+
+    def bullet(self, text: str) -> None:
+        self._open_list("ul")
+        self.out.append(f"<li>{html.escape(text)}</li>")
+
+    def step(self, text: str) -> None:
+        self._open_list("ol")
+        self.out.append(f"<li>{html.escape(text)}</li>")
+
+    def code(self, text: str) -> None:
+        self._close_list()
+        self.out.append(f"<pre><code>{html.escape(text)}</code></pre>")
+
+    def table(self, header: Sequence[str], rows: Sequence[Sequence[str]]) -> None:
+        self._close_list()
+        head = "".join(f"<th>{html.escape(h)}</th>" for h in header)
+        body = "".join("<tr>" + "".join(f"<td>{html.escape(v)}</td>" for v in values) + "</tr>" for values in rows)
+        self.out.append(f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>")
+
+    def picture(self, path: Path) -> None:
+        self._close_list()
+        src = html.escape(self._link(path), quote=True)
+        self.out.append(f'<p><img src="{src}" alt="{html.escape(path.stem)}"></p>')
+
+    def api_reference(self, symbols: SymbolTable, style: str = "table") -> None:
+        for rel, sources, rows in api_reference_files(symbols):
+            self.heading(rel, 2)
+            if sources:
+                self.para("Sources: " + ", ".join(sources))
+            if rows:
+                self.table([name for name, _ in API_COLUMNS], rows)
+            else:
+                self.para("No Bash functions detected.")
+
+    def footer(self, text: str) -> None:
+        self._close_list()
+        self.out.append(f"<footer>{html.escape(text)}</footer>")
+
+    def render(self) -> str:
+        body = "\n".join(self.out)
+        return (
+            "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(self.page_title)}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n"
+            f"{body}\n</body>\n</html>\n"
+        )
+
+
+def make_writer(fmt: str, out_dir: Path, stem: str):
+    """Writer for one of FORMATS, targeting out_dir/<stem><suffix>."""
+    out_path = out_dir / (stem + SUFFIXES[fmt])
+    if fmt == "docx":
+        return DocxWriter(out_path)
+    if fmt == "md":
+        return MarkdownWriter(out_path)
+    if fmt == "html":
+        return HtmlWriter(out_path)
+    raise ValueError(f"unknown format: {fmt}")
@@ -12,6 +12,7 @@
 # Entry points
 #   - app_manager_menu   (preferred): opens the main menu.
 #   - apm_ui_main_menu   (internal):  menu implementation.
+#   - app_manager.sh --dry-run:       prints what Apply would change and exits.
 #
 # Design notes
 #   - No direct dialog calls: uses ui_menu/ui_checklist/ui_input/ui_confirm/
@@ -83,6 +84,7 @@ _apm_load_modules() {
   source "${base}/lib/pkg_mgr.sh"
   source "${base}/lib/installers.sh"
   source "${base}/lib/audit.sh"
+  source "${base}/lib/plan.sh"
   source "${base}/lib/apply.sh"
 
   # UI
@@ -94,7 +96,10 @@ _apm_load_modules
 # Compatibility with historical menu wiring (bin/homelab expected this name).
 app_manager_menu() { apm_ui_main_menu; }
 
-# If executed directly, open the menu.
+# If executed directly, open the menu (or print the plan with --dry-run).
 if [[ "${BASH_SOURCE[0]}" == "$0" ]]; then
-  app_manager_menu
+  case "${1:-}" in
+    --dry-run) apply_changes --dry-run ;;
+    *) app_manager_menu ;;
+  esac
 fi
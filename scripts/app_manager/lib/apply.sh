@@ -2,13 +2,51 @@
 # =============================================================================
 # Filename: scripts/app_manager/lib/apply.sh
 # Purpose : Apply selections (install/uninstall) based on env + catalogue.
+#
+# Notes
+#   - Decisions come from plan_build (plan.sh); this file only executes them.
+#   - apply_changes --dry-run prints the plan and stops: no confirmation,
+#     sudo, apt or log rotation.
+#   - Planning needs the path variables (require_paths) but none of the
+#     directories apm_init_paths creates: a missing marker or env file just
+#     reads as "not installed" / "not selected".
+#   - An empty plan skips confirmation, sudo and apt (including autoremove:
+#     nothing was removed, so nothing new is orphaned) but still refreshes
+#     the install status report.
 # =============================================================================
 
 set -Eeuo pipefail
 IFS=$'\n\t'
 
+apply_preview_changes() {
+  require_paths || return 1
+  load_env || true
+  dpkg_snapshot_invalidate
+  plan_build
+  plan_print
+}
+
 apply_changes() {
-  if ! ui_confirm "Apply Changes" "This will install selected apps.\nIt will remove only apps that were installed by this manager.\n\nProceed?"; then
+  if [[ "${1:-}" == "--dry-run" ]]; then
+    apply_preview_changes
+    return 0
+  fi
+
+  # The plan is built before apm_init_paths (which rotates the log) so that
+  # cancelling leaves nothing behind. plan_build only reads ENV_FILE,
+  # MARKER_DIR and the dpkg status file; require_paths checks they are set.
+  require_paths || return 1
+  load_env || true
+  dpkg_snapshot_invalidate  # re-check dpkg state once this run; apt may have run since the last one
+  plan_build
+
+  if plan_is_empty; then
+    ui_msgbox "Apply Changes" "Nothing to change: selections, markers and installed packages agree.\n\nThe install status report is refreshed next."
+    audit_selected_apps || true
+    return 0
+  fi
+
+  if ! ui_confirm "Apply Changes" "This will install selected apps.\nIt will remove only apps that were installed by this manager.\n\n$(plan_summary)\n\nProceed?"; then
     return 0
   fi
 
@@ -20,43 +58,25 @@ apply_changes() {
   info "Apply started. Log file: ${LOG_FILE}"
 
   ensure_pkg_mgr
-  pkg_update_once
-  load_env || true
-
-  local row type key label def pkgs_csv desc strategy version_var
-  local -a apt_install_list=()
-  local need_hashicorp_repo=0
-
-  for row in "${APP_CATALOGUE[@]}"; do
-    IFS='|' read -r type key label def pkgs_csv desc strategy version_var <<<"${row}"
-    [[ "${type}" == "APP" ]] || continue
-    validate_key "${key}" || continue
-    strategy="${strategy:-apt}"
-
-    if [[ "$(get_selection_value "${key}")" == "1" ]]; then
-      case "${strategy}" in
-        apt|hashicorp_repo)
-          [[ "${strategy}" == "hashicorp_repo" ]] && need_hashicorp_repo=1
-          local -a pkgs_arr=()
-          pkgs_csv_to_array "${pkgs_csv}" pkgs_arr
-          ((${#pkgs_arr[@]})) && apt_install_list+=("${pkgs_arr[@]}")
-          ;;
-      esac
-    fi
-  done
-
-  if [[ "${need_hashicorp_repo}" -eq 1 ]]; then
-    info "HashiCorp repo required. Ensuring repo is configured."
-    ensure_hashicorp_repo
+  if ((${#PLAN_APT_INSTALL[@]} + ${#PLAN_INSTALL_KEYS[@]})); then
     pkg_update_once
   fi
 
-  local -a apt_install_unique=()
-  unique_pkgs apt_install_list apt_install_unique
+  local key repo
+
+  for repo in "${PLAN_REPOS[@]}"; do
+    case "${repo}" in
+      hashicorp)
+        info "HashiCorp repo required. Ensuring repo is configured."
+        ensure_hashicorp_repo
+        pkg_update_once
+        ;;
+    esac
+  done
 
   local -a apt_install_final=()
   local -a apt_missing=()
-  filter_installable_apt_pkgs apt_install_unique apt_install_final apt_missing
+  filter_installable_apt_pkgs PLAN_APT_INSTALL apt_install_final apt_missing
 
   if ((${#apt_missing[@]})); then
     warn "Skipping missing apt packages: ${apt_missing[*]}"
@@ -67,54 +87,36 @@ apply_changes() {
     info "Installing (apt/${PKG_MGR}) count=${#apt_install_final[@]}"
     pkg_install_pkgs "${apt_install_final[@]}"
   else
-    info "No apt packages selected for installation."
+    info "No apt packages to install (${PLAN_APT_PRESENT} selected already installed)."
   fi
 
-  for row in "${APP_CATALOGUE[@]}"; do
-    IFS='|' read -r type key label def pkgs_csv desc strategy version_var <<<"${row}"
-    [[ "${type}" == "APP" ]] || continue
-    validate_key "${key}" || continue
-    strategy="${strategy:-apt}"
-
-    if [[ "$(get_selection_value "${key}")" == "1" ]]; then
-      case "${strategy}" in
-        apt|hashicorp_repo)
-          if [[ -n "${pkgs_csv}" ]] && verify_pkgs_installed "${pkgs_csv}"; then
-            mark_installed "${key}" "${strategy}" "${pkgs_csv}"
-            ok "Marked installed: ${key}"
-          else
-            warn "Not marking ${key}; packages not fully installed: ${pkgs_csv}"
-          fi
-          ;;
-      esac
+  for key in "${PLAN_MARK_KEYS[@]}"; do
+    if verify_pkgs_installed "${CATALOGUE_PACKAGES[${key}]}"; then
+      mark_installed "${key}" "${CATALOGUE_STRATEGY[${key}]}" "${CATALOGUE_PACKAGES[${key}]}"
+      ok "Marked installed: ${key}"
+    else
+      warn "Not marking ${key}; packages not fully installed: ${CATALOGUE_PACKAGES[${key}]}"
     fi
   done
 
-  for row in "${APP_CATALOGUE[@]}"; do
-    IFS='|' read -r type key label def pkgs_csv desc strategy version_var <<<"${row}"
-    [[ "${type}" == "APP" ]] || continue
-    validate_key "${key}" || continue
-    strategy="${strategy:-apt}"
-
-    case "${strategy}" in
-      python|binary|docker_script)
-        if [[ "$(get_selection_value "${key}")" == "1" ]]; then
-          info "Installing (${strategy}): ${key}"
-          install_by_strategy "${key}" "${pkgs_csv}" "${strategy}"
-          mark_installed "${key}" "${strategy}" "${pkgs_csv}"
-          ok "Installed: ${key}"
-        else
-          info "Removing (${strategy}): ${key}"
-          remove_by_strategy "${key}" "${pkgs_csv}" "${strategy}"
-        fi
-        ;;
-      apt|hashicorp_repo)
-        if [[ "$(get_selection_value "${key}")" != "1" ]] && is_marked_installed "${key}"; then
-          info "Removing (conservative ${strategy}): ${key}"
-          remove_by_strategy "${key}" "${pkgs_csv}" "${strategy}"
-        fi
-        ;;
-    esac
+  if ((${#PLAN_APT_REMOVE_KEYS[@]})); then
+    info "Removing (conservative apt): ${PLAN_APT_REMOVE_KEYS[*]}"
+    pkg_remove_pkgs "${PLAN_APT_REMOVE[@]}"
+    for key in "${PLAN_APT_REMOVE_KEYS[@]}"; do
+      unmark_installed "${key}"
+    done
+  fi
+
+  for key in "${PLAN_INSTALL_KEYS[@]}"; do
+    info "Installing (${CATALOGUE_STRATEGY[${key}]}): ${key}"
+    install_by_strategy "${key}" "${CATALOGUE_PACKAGES[${key}]}" "${CATALOGUE_STRATEGY[${key}]}"
+    mark_installed "${key}" "${CATALOGUE_STRATEGY[${key}]}" "${CATALOGUE_PACKAGES[${key}]}"
+    ok "Installed: ${key}"
+  done
+
+  for key in "${PLAN_REMOVE_KEYS[@]}"; do
+    info "Removing (${CATALOGUE_STRATEGY[${key}]}): ${key}"
+    remove_by_strategy "${key}" "${CATALOGUE_PACKAGES[${key}]}" "${CATALOGUE_STRATEGY[${key}]}"
   done
 
   info "Autoremove via ${PKG_MGR}"
@@ -124,4 +126,3 @@ apply_changes() {
   ok "Apply complete."
   ui_msgbox "Complete" "Install / uninstall complete.\n\nLog:\n${LOG_FILE}"
 }
-
@@ -61,7 +61,7 @@ audit_selected_apps() {
 
     local key
     key="${k#APP_}"
-    key="$(printf '%s' "${key}" | tr '[:upper:]' '[:lower:]')"
+    key="${key,,}"
     selected_keys+=("${key}")
   done < "${env_file}"
 
@@ -81,25 +81,11 @@ audit_selected_apps() {
     return 0
   fi
 
-  # Helper: find a catalogue row by key
-  _catalogue_get_row_by_key() {
-    local want_key="$1"
-    local row type key label def pkgs_csv desc strategy version_var
-    for row in "${APP_CATALOGUE[@]}"; do
-      IFS='|' read -r type key label def pkgs_csv desc strategy version_var <<<"${row}"
-      [[ "${type}" == "APP" ]] || continue
-      [[ "${key}" == "${want_key}" ]] || continue
-      printf '%s\n' "${row}"
-      return 0
-    done
-    return 1
-  }
-
-  # Package install check (dpkg)
+  # Package install check: answered from the dpkg status snapshot (pkg_utils.sh)
   _dpkg_is_installed() {
-    local pkg="$1"
-    dpkg-query -W --showformat='${Status}\n' "${pkg}" 2>/dev/null | grep -q "install ok installed"
+    is_pkg_installed "$1"
   }
+  dpkg_snapshot_refresh
 
   # Table header
   {
@@ -108,18 +94,17 @@ audit_selected_apps() {
   } >>"${out_file}"
 
   # Step 2: Resolve + test
-  local key row type label def pkgs_csv desc strategy version_var
+  local key label pkgs_csv strategy
   for key in "${selected_keys[@]}"; do
-    row="$(_catalogue_get_row_by_key "${key}" || true)"
-
-    if [[ -z "${row}" ]]; then
+    if ! catalogue_has_key "${key}"; then
       printf '%-18s  %-14s  %-10s  %s\n' "${key}" "-" "UNKNOWN" "Selected but not found in APP_CATALOGUE" >>"${out_file}"
       failures=$((failures + 1))
       continue
     fi
 
-    IFS='|' read -r type _k label def pkgs_csv desc strategy version_var <<<"${row}"
-    strategy="${strategy:-apt}"
+    label="${CATALOGUE_LABEL[${key}]}"
+    pkgs_csv="${CATALOGUE_PACKAGES[${key}]}"
+    strategy="${CATALOGUE_STRATEGY[${key}]}"
 
     local status="OK"
     local details=""
@@ -77,34 +77,67 @@ APP_CATALOGUE=(
   "APP|sops|[Sec] sops (binary)|OFF||Secrets operations|sops_binary|SOPS_VERSION"
 )
 
-catalogue_all_app_keys() {
-  local row type key
-  for row in "${APP_CATALOGUE[@]}"; do
-    IFS='|' read -r type key _rest <<<"${row}"
-    [[ "${type}" == "APP" ]] || continue
-    validate_key "${key}" || continue
-    printf '%s\n' "${key}"
+# Catalogue index: APP rows parsed once at load time into associative arrays
+# keyed by app key, so lookups are O(1) and fork-free however long the
+# catalogue grows. CATALOGUE_KEYS keeps catalogue order. Rows with an invalid
+# key are left out, and for duplicate keys the first row wins, as the old
+# linear scans did. Strategy is stored with its "apt" default applied, and
+# CATALOGUE_VAR holds each key's APP_* selection variable (key_to_var).
+declare -ga CATALOGUE_KEYS=()
+declare -gA CATALOGUE_ROW=() CATALOGUE_LABEL=() CATALOGUE_DEFAULT=() CATALOGUE_PACKAGES=()
+declare -gA CATALOGUE_DESC=() CATALOGUE_STRATEGY=() CATALOGUE_VERSION_VAR=() CATALOGUE_VAR=()
+
+catalogue_index_build() {
+  # Rows are split by word splitting on '|' with globbing off (labels hold
+  # brackets): a here-string read per row dominates load time once the
+  # catalogue reaches a few thousand rows.
+  local - i key var IFS='|'
+  local -a f
+  set -f
+  CATALOGUE_KEYS=()
+  CATALOGUE_ROW=() CATALOGUE_LABEL=() CATALOGUE_DEFAULT=() CATALOGUE_PACKAGES=()
+  CATALOGUE_DESC=() CATALOGUE_STRATEGY=() CATALOGUE_VERSION_VAR=() CATALOGUE_VAR=()
+
+  for i in "${!APP_CATALOGUE[@]}"; do
+    [[ "${APP_CATALOGUE[i]}" == APP\|* ]] || continue
+    # Splitting is intended: IFS='|' and set -f are scoped to this function by `local -`.
+    # shellcheck disable=SC2206
+    f=(${APP_CATALOGUE[i]})
+    key="${f[1]:-}"
+    [[ "${key}" =~ ^[A-Za-z0-9_-]+$ ]] || continue
+    [[ -z "${CATALOGUE_ROW[${key}]+set}" ]] || continue
+
+    CATALOGUE_KEYS+=("${key}")
+    CATALOGUE_ROW["${key}"]="${i}"
+    CATALOGUE_LABEL["${key}"]="${f[2]:-}"
+    CATALOGUE_DEFAULT["${key}"]="${f[3]:-}"
+    CATALOGUE_PACKAGES["${key}"]="${f[4]:-}"
+    CATALOGUE_DESC["${key}"]="${f[5]:-}"
+    CATALOGUE_STRATEGY["${key}"]="${f[6]:-apt}"
+    CATALOGUE_VERSION_VAR["${key}"]="${f[7]:-}"
+    var="APP_${key^^}"
+    CATALOGUE_VAR["${key}"]="${var//-/_}"
   done
 }
 
+catalogue_index_build
+
+catalogue_has_key() { [[ -n "${1}" && -n "${CATALOGUE_ROW[${1}]+set}" ]]; }
+
+catalogue_all_app_keys() {
+  ((${#CATALOGUE_KEYS[@]})) || return 0
+  printf '%s\n' "${CATALOGUE_KEYS[@]}"
+}
+
 catalogue_default_selected_keys() {
-  local row type key _label def
-  for row in "${APP_CATALOGUE[@]}"; do
-    IFS='|' read -r type key _label def _rest <<<"${row}"
-    [[ "${type}" == "APP" ]] || continue
-    validate_key "${key}" || continue
-    [[ "${def}" == "ON" ]] && printf '%s\n' "${key}"
+  local key
+  for key in "${CATALOGUE_KEYS[@]}"; do
+    [[ "${CATALOGUE_DEFAULT[${key}]}" == "ON" ]] && printf '%s\n' "${key}"
   done
+  return 0
 }
 
 catalogue_row_by_key() {
-  local want="$1" row type key
-  for row in "${APP_CATALOGUE[@]}"; do
-    IFS='|' read -r type key _rest <<<"${row}"
-    [[ "${type}" == "APP" ]] || continue
-    [[ "${key}" == "${want}" ]] || continue
-    printf '%s\n' "${row}"
-    return 0
-  done
-  return 1
+  catalogue_has_key "$1" || return 1
+  printf '%s\n' "${APP_CATALOGUE[${CATALOGUE_ROW[$1]}]}"
 }
@@ -57,7 +57,7 @@ validate_key() {
   }
 }
 
-key_to_var() { printf 'APP_%s' "${1^^}" | tr '-' '_' | tr '.' '_'; }
+key_to_var() { local v="APP_${1^^}"; v="${v//-/_}"; printf '%s' "${v//./_}"; }
 
 apm_init_paths() {
   require_paths || return 1
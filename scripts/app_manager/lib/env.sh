@@ -38,11 +38,17 @@ default_for_version_var() {
 }
 
 get_selection_value() {
-  local key="$1" var
-  var="$(key_to_var "${key}")"
+  local key="$1" var="${CATALOGUE_VAR[${1}]:-}"
+  [[ -n "${var}" ]] || var="$(key_to_var "${key}")"
   printf '%s' "${!var:-0}"
 }
 
+# Fork-free check for callers that only need on/off.
+selection_is_on() {
+  local var="${CATALOGUE_VAR[${1}]:-}"
+  [[ -n "${var}" && "${!var:-0}" == "1" ]]
+}
+
 # Writes a complete env file from:
 # - version_map: either existing (load_env) or defaults
 # - selection_map: built per operation
@@ -68,11 +74,10 @@ _env_write_with_maps() {
     echo
 
     local k av
-    while IFS= read -r k; do
-      [[ -n "${k}" ]] || continue
-      av="$(key_to_var "${k}")"
+    for k in "${CATALOGUE_KEYS[@]}"; do
+      av="${CATALOGUE_VAR[${k}]}"
       printf '%s=%s\n' "${av}" "${_sel[$k]:-0}"
-    done < <(catalogue_all_app_keys)
+    done
   } >"${ENV_FILE}"
 
   load_env
@@ -94,7 +99,7 @@ write_default_env_if_missing() {
   declare -A ver=()
 
   local k
-  while IFS= read -r k; do sel["$k"]=0; done < <(catalogue_all_app_keys)
+  for k in "${CATALOGUE_KEYS[@]}"; do sel["$k"]=0; done
   while IFS= read -r k; do sel["$k"]=1; done < <(catalogue_default_selected_keys)
 
   local var
@@ -114,7 +119,7 @@ apply_defaults_replace() {
   declare -A ver=()
 
   local k
-  while IFS= read -r k; do sel["$k"]=0; done < <(catalogue_all_app_keys)
+  for k in "${CATALOGUE_KEYS[@]}"; do sel["$k"]=0; done
   while IFS= read -r k; do sel["$k"]=1; done < <(catalogue_default_selected_keys)
 
   local var
@@ -136,7 +141,7 @@ apply_profile_replace() {
   declare -A ver=()
 
   local k
-  while IFS= read -r k; do sel["$k"]=0; done < <(catalogue_all_app_keys)
+  for k in "${CATALOGUE_KEYS[@]}"; do sel["$k"]=0; done
   while IFS= read -r k; do sel["$k"]=1; done < <(profile_keys_for_name "${profile}")
 
   local var
@@ -163,7 +168,7 @@ apply_profile_append() {
   declare -A ver=()
 
   local k
-  while IFS= read -r k; do sel["$k"]="$(get_selection_value "$k")"; done < <(catalogue_all_app_keys)
+  for k in "${CATALOGUE_KEYS[@]}"; do selection_is_on "$k" && sel["$k"]=1 || sel["$k"]=0; done
   while IFS= read -r k; do sel["$k"]=1; done < <(profile_keys_for_name "${profile}")
 
   local var
@@ -189,7 +194,7 @@ persist_current_selection_vars() {
   declare -A ver=()
 
   local k
-  while IFS= read -r k; do sel["$k"]="$(get_selection_value "$k")"; done < <(catalogue_all_app_keys)
+  for k in "${CATALOGUE_KEYS[@]}"; do selection_is_on "$k" && sel["$k"]=1 || sel["$k"]=0; done
 
   local var
   while IFS= read -r var; do ver["$var"]="${!var:-$(default_for_version_var "$var")}"; done < <(known_version_vars)
@@ -9,7 +9,7 @@ IFS=$'\n\t'
 
 ensure_state_dirs() { as_root mkdir -p "${STATE_DIR}" "${MARKER_DIR}"; }
 marker_path() { printf '%s/%s.installed_by_app_manager' "${MARKER_DIR}" "$1"; }
-is_marked_installed() { [[ -f "$(marker_path "$1")" ]]; }
+is_marked_installed() { [[ -f "${MARKER_DIR}/${1}.installed_by_app_manager" ]]; }  # marker_path, without the fork
 unmark_installed() { as_root rm -f -- "$(marker_path "$1")" >/dev/null 2>&1 || true; }
 
 mark_installed() {
@@ -24,22 +24,110 @@ ensure_pkg_mgr() {
   fi
 
   log_line "nala not found; bootstrapping via apt-get"
-  as_root apt-get update
+  pkg_update_once
   as_root apt-get install -y --no-install-recommends nala || true
 
   detect_pkg_mgr
 }
 
+# -----------------------------------------------------------------------------
+# apt list refresh cache
+#
+# pkg_update_once skips the update when the last one it ran is younger than
+# APT_UPDATE_MAX_AGE seconds and /etc/apt/sources.list* are unchanged since
+# (one cksum line per file, kept in APT_UPDATE_STAMP after the refresh time).
+# When files were only added, e.g. a vendor repo was just configured, only
+# those are fetched: apt-get update restricted to that source list, keeping
+# the other lists and the refresh time. Any edit or removal, missing lists,
+# APT_UPDATE_FORCE=1 or --force mean a full update.
+# -----------------------------------------------------------------------------
+APT_UPDATE_STAMP="${APT_UPDATE_STAMP:-${APPM_DIR:-/tmp}/apt-update.stamp}"
+APT_UPDATE_MAX_AGE="${APT_UPDATE_MAX_AGE:-3600}"
+APT_SOURCES_DIR="${APT_SOURCES_DIR:-/etc/apt}"
+APT_LISTS_DIR="${APT_LISTS_DIR:-/var/lib/apt/lists}"
+
+_apt_sources_fingerprint() {
+  # "<crc> <size> <path>" per source file, from one cksum call.
+  local f
+  local -a files=()
+  for f in "${APT_SOURCES_DIR}/sources.list" \
+    "${APT_SOURCES_DIR}"/sources.list.d/*.list \
+    "${APT_SOURCES_DIR}"/sources.list.d/*.sources; do
+    [[ -f "${f}" ]] && files+=("${f}")
+  done
+  ((${#files[@]})) || return 0
+  cksum -- "${files[@]}"
+}
+
+_apt_lists_present() {
+  compgen -G "${APT_LISTS_DIR}/*_Packages*" >/dev/null
+}
+
+_apt_update_stamp_write() {
+  local when="$1"; shift
+  mkdir -p -- "${APT_UPDATE_STAMP%/*}" >/dev/null 2>&1 || true
+  { printf '%s\n' "${when}"; (($#)) && printf '%s\n' "$@"; } >"${APT_UPDATE_STAMP}" 2>/dev/null || true
+}
+
 pkg_update_once() {
+  local force="${APT_UPDATE_FORCE:-0}"
+  [[ "${1:-}" == "--force" ]] && force=1
+
+  local now="${EPOCHSECONDS}" stamp_time=0 line path changed=0
+  local -a current=() added=()
+  local -A before=()
+  mapfile -t current < <(_apt_sources_fingerprint)
+
+  if ((!force)) && [[ -r "${APT_UPDATE_STAMP}" ]]; then
+    {
+      read -r stamp_time || true
+      while read -r line; do
+        [[ -n "${line}" ]] && before["${line#* * }"]="${line}"
+      done
+    } <"${APT_UPDATE_STAMP}"
+    [[ "${stamp_time}" =~ ^[0-9]+$ ]] || stamp_time=0
+  fi
+
+  if ((!force && stamp_time > 0 && now - stamp_time < APT_UPDATE_MAX_AGE)) && _apt_lists_present; then
+    for line in "${current[@]}"; do
+      path="${line#* * }"
+      if [[ -z "${before[${path}]+set}" ]]; then
+        added+=("${path}")
+      else
+        [[ "${before[${path}]}" == "${line}" ]] || changed=1
+        unset 'before[${path}]'
+      fi
+    done
+    ((${#before[@]})) && changed=1
+
+    if ((!changed)); then
+      if ((${#added[@]} == 0)); then
+        log_line "apt lists refreshed $((now - stamp_time))s ago and sources unchanged; skipping update"
+        return 0
+      fi
+      for path in "${added[@]}"; do
+        log_line "apt update (new source only): ${path}"
+        as_root apt-get update \
+          -o Dir::Etc::sourcelist="${path}" \
+          -o Dir::Etc::sourceparts=- \
+          -o APT::Get::List-Cleanup=0 || return $?
+      done
+      _apt_update_stamp_write "${stamp_time}" "${current[@]}"
+      return 0
+    fi
+  fi
+
+  # The stamp is only written once the update succeeded: callers that run
+  # `pkg_update_once || true` must not record a failed refresh as fresh.
   if [[ "${PKG_MGR}" == "nala" ]]; then
-    as_root nala update
+    as_root nala update || return $?
   else
-    as_root apt-get update
+    as_root apt-get update || return $?
   fi
+  _apt_update_stamp_write "${now}" "${current[@]}"
 }
 
-pkg_install_pkgs() {
-  (("$#")) || return 0
+_pkg_install() {
   if [[ "${PKG_MGR}" == "nala" ]]; then
     as_root nala install -y --no-install-recommends "$@"
   else
@@ -47,8 +135,20 @@ pkg_install_pkgs() {
   fi
 }
 
+pkg_install_pkgs() {
+  (("$#")) || return 0
+  dpkg_snapshot_invalidate
+  if ! _pkg_install "$@"; then
+    # A skipped update can leave lists pointing at superseded versions.
+    log_line "Install failed; refreshing apt lists and retrying once"
+    pkg_update_once --force
+    _pkg_install "$@"
+  fi
+}
+
 pkg_remove_pkgs() {
   (("$#")) || return 0
+  dpkg_snapshot_invalidate
   if [[ "${PKG_MGR}" == "nala" ]]; then
     as_root nala remove -y "$@" >/dev/null 2>&1 || true
   else
@@ -57,6 +157,7 @@ pkg_remove_pkgs() {
 }
 
 pkg_autoremove() {
+  dpkg_snapshot_invalidate
   if [[ "${PKG_MGR}" == "nala" ]]; then
     as_root nala autoremove -y
   else
@@ -12,8 +12,9 @@ IFS=$'\n\t'
 # -----------------------------------------------------------------------------
 apt_pkg_has_candidate() {
   local pkg="$1"
-  apt-cache policy "${pkg}" 2>/dev/null | awk -F': ' '
-    $1=="Candidate" { cand=$2 }
+  # apt indents the field ("  Candidate: 1.2-1"), so split on whitespace.
+  apt-cache policy "${pkg}" 2>/dev/null | awk '
+    $1=="Candidate:" { cand=$2 }
     END {
       if (cand=="" || cand=="(none)") exit 1
       exit 0
@@ -21,18 +22,47 @@ apt_pkg_has_candidate() {
   '
 }
 
+apt_pkg_candidates() {
+  # Print "<pkg><TAB><candidate>" for every package apt knows, from one
+  # apt-cache call (one cache load) for the whole list. Unknown packages are
+  # omitted; packages without a candidate print "(none)".
+  (("$#")) || return 0
+  apt-cache policy "$@" 2>/dev/null | awk '
+    /^[^ \t].*:$/ { pkg = substr($0, 1, length($0) - 1); next }
+    pkg != "" && $1 == "Candidate:" { print pkg "\t" $2; pkg = "" }
+  '
+}
+
 filter_installable_apt_pkgs() {
+  # Split the package array named $1 into installable ($2) and missing ($3).
+  # Candidates come from a single apt-cache policy query (apt_pkg_candidates);
+  # only arch-qualified names it did not report (pkg:arch) are re-checked on
+  # their own, in case apt printed them under another name.
   local in_name="$1" out_name="$2" missing_name="$3"
-  local -a installable=() missing=()
-  local p
+  local -a pkgs=() installable=() missing=()
+  local -A candidate=()
+  local p name version
+
+  eval "pkgs=(\"\${${in_name}[@]}\")"
 
-  eval "for p in \"\${${in_name}[@]}\"; do
-    if apt_pkg_has_candidate \"\$p\"; then
-      installable+=(\"\$p\")
+  while IFS=$'\t' read -r name version; do
+    [[ -n "${name}" ]] && candidate["${name}"]="${version}"
+  done < <(apt_pkg_candidates "${pkgs[@]}")
+
+  for p in "${pkgs[@]}"; do
+    [[ -n "${p}" ]] || continue
+    if [[ -n "${candidate[${p}]+set}" ]]; then
+      if [[ -n "${candidate[${p}]}" && "${candidate[${p}]}" != "(none)" ]]; then
+        installable+=("${p}")
+      else
+        missing+=("${p}")
+      fi
+    elif [[ "${p}" == *:* ]] && apt_pkg_has_candidate "${p}"; then
+      installable+=("${p}")
     else
-      missing+=(\"\$p\")
+      missing+=("${p}")
     fi
-  done"
+  done
 
   eval "${out_name}=(\"\${installable[@]}\")"
   eval "${missing_name}=(\"\${missing[@]}\")"
@@ -63,24 +93,73 @@ pkgs_csv_to_array() {
   eval "${out_name}=(\"\${cleaned[@]}\")"
 }
 
-unique_pkgs() {
-  local in_name="$1" out_name="$2"
-  local -a out=()
+# -----------------------------------------------------------------------------
+# Install state checks
+#
+# One snapshot of the dpkg database (package -> installed) answers every
+# install check from memory. It is read with a single awk pass over
+# /var/lib/dpkg/status (dpkg-query -W if that file is unreadable) and kept
+# until dpkg writes the file again: dpkg replaces it on every change, so its
+# mtime/size/inode fingerprint moves. Held packages count as installed.
+# pkg_mgr.sh marks the snapshot for re-checking after each install or
+# removal; re-checking costs one stat and reloads only when the fingerprint
+# changed. Without a readable status file there is nothing to fingerprint,
+# so every invalidation forces a dpkg-query reload instead.
+# -----------------------------------------------------------------------------
+DPKG_STATUS_FILE="${DPKG_STATUS_FILE:-/var/lib/dpkg/status}"
+declare -gA DPKG_INSTALLED=()
+DPKG_SNAPSHOT_STAMP=""
+DPKG_SNAPSHOT_CHECKED=0
+DPKG_SNAPSHOT_GENERATION=0
 
-  mapfile -t out < <(
-    eval "printf '%s\n' \"\${${in_name}[@]}\"" \
-      | awk 'NF' \
-      | sort -u
-  )
+_dpkg_status_stamp() {
+  # The dpkg-query fallback has no file to stat: key it on the invalidation
+  # count so it never looks unchanged after dpkg may have run.
+  if [[ -r "${DPKG_STATUS_FILE}" ]] && stat -c '%.9Y:%s:%i' -- "${DPKG_STATUS_FILE}" 2>/dev/null; then
+    return 0
+  fi
+  printf 'query:%d' "${DPKG_SNAPSHOT_GENERATION}"
+}
 
-  eval "${out_name}=(\"\${out[@]}\")"
+_dpkg_installed_list() {
+  # "<pkg>" and "<pkg>:<arch>" for every package dpkg reports as installed.
+  if [[ -r "${DPKG_STATUS_FILE}" ]]; then
+    awk '
+      /^Package: /      { pkg = $2 }
+      /^Architecture: / { arch = $2 }
+      /^Status: /       { ok = ($0 ~ / ok installed$/) }
+      /^$/              { if (ok && pkg != "") { print pkg; print pkg ":" arch }; pkg = ""; arch = ""; ok = 0 }
+      END               { if (ok && pkg != "") { print pkg; print pkg ":" arch } }
+    ' "${DPKG_STATUS_FILE}"
+  elif command -v dpkg-query >/dev/null 2>&1; then
+    dpkg-query -W -f='${Package}\t${Architecture}\t${Status}\n' 2>/dev/null \
+      | awk -F'\t' '$3 ~ / ok installed$/ { print $1; print $1 ":" $2 }'
+  fi
+}
+
+dpkg_snapshot_refresh() {
+  # Reload the snapshot if the status file changed since it was taken.
+  local stamp pkg
+  stamp="$(_dpkg_status_stamp)"
+  DPKG_SNAPSHOT_CHECKED=1
+  [[ -n "${DPKG_SNAPSHOT_STAMP}" && "${stamp}" == "${DPKG_SNAPSHOT_STAMP}" ]] && return 0
+
+  DPKG_INSTALLED=()
+  while IFS= read -r pkg; do
+    [[ -n "${pkg}" ]] && DPKG_INSTALLED["${pkg}"]=1
+  done < <(_dpkg_installed_list)
+  DPKG_SNAPSHOT_STAMP="${stamp}"
+}
+
+dpkg_snapshot_invalidate() {
+  # Call after anything that may run dpkg; the next check re-stats the file.
+  DPKG_SNAPSHOT_CHECKED=0
+  DPKG_SNAPSHOT_GENERATION=$((DPKG_SNAPSHOT_GENERATION + 1))
 }
 
-# -----------------------------------------------------------------------------
-# Install state checks
-# -----------------------------------------------------------------------------
 is_pkg_installed() {
-  dpkg-query -W -f='${Status}' "$1" 2>/dev/null | grep -q "install ok installed"
+  ((DPKG_SNAPSHOT_CHECKED)) || dpkg_snapshot_refresh
+  [[ -n "${1}" && -n "${DPKG_INSTALLED[${1}]+set}" ]]
 }
 
 verify_pkgs_installed() {
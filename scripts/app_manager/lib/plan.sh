@@ -0,0 +1,162 @@
+#!/usr/bin/env bash
+# =============================================================================
+# Filename: scripts/app_manager/lib/plan.sh
+# Purpose : Execution plan for Apply: what would change, computed up front.
+#
+# Notes
+#   - plan_build makes one pass over the catalogue index using the current
+#     selections (APP_* vars), markers and the dpkg snapshot. It only reads
+#     state: no sudo, no apt, no network. apply_changes executes the result
+#     and the Preview / --dry-run path prints it.
+#   - Inputs: APP_* vars (load_env), ${MARKER_DIR}/*.installed_by_app_manager
+#     and DPKG_STATUS_FILE. It does not need apm_init_paths to have run.
+#   - apt installs list only packages that are not installed yet. Selected
+#     apps whose packages are present but which have no marker are adopted
+#     (marked) without an apt call.
+#   - apt removals come from the markers of deselected apps, minus any
+#     package a selected app still needs.
+#   - Strategy installs (python, binary, docker_script) run for every
+#     selected app, as before, so version pin changes are picked up.
+#     Strategy removals are planned only for apps with a marker; the
+#     removers themselves are marker-guarded.
+#   - Other strategies (vendor repos, nvm, yq/sops binaries) are not applied
+#     by apply_changes; the plan lists them as skipped.
+# =============================================================================
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+declare -ga PLAN_REPOS=()             # vendor repos to configure (before the apt install)
+declare -ga PLAN_APT_INSTALL=()       # packages to apt install
+declare -ga PLAN_APT_REMOVE=()        # packages to apt remove
+declare -ga PLAN_APT_REMOVE_KEYS=()   # apt apps whose marker is removed with them
+declare -ga PLAN_INSTALL_KEYS=()      # strategy installs (install_by_strategy)
+declare -ga PLAN_REMOVE_KEYS=()       # strategy removals (remove_by_strategy)
+declare -ga PLAN_MARK_KEYS=()         # apt apps to mark once their packages verify
+declare -ga PLAN_SKIPPED_KEYS=()      # selected apps whose strategy Apply does not handle
+declare -gi PLAN_APT_PRESENT=0        # selected apt packages already installed
+
+plan_build() {
+  local key strategy pkg
+  local -a pkgs_arr=()
+  local -A wanted=() removing=()
+  local need_hashicorp_repo=0
+
+  PLAN_REPOS=() PLAN_APT_INSTALL=() PLAN_APT_REMOVE=() PLAN_APT_REMOVE_KEYS=()
+  PLAN_INSTALL_KEYS=() PLAN_REMOVE_KEYS=() PLAN_MARK_KEYS=() PLAN_SKIPPED_KEYS=()
+  PLAN_APT_PRESENT=0
+
+  dpkg_snapshot_refresh
+
+  for key in "${CATALOGUE_KEYS[@]}"; do
+    strategy="${CATALOGUE_STRATEGY[${key}]}"
+
+    if selection_is_on "${key}"; then
+      case "${strategy}" in
+        apt|hashicorp_repo)
+          pkgs_csv_to_array "${CATALOGUE_PACKAGES[${key}]}" pkgs_arr
+          for pkg in "${pkgs_arr[@]}"; do
+            [[ -z "${wanted[${pkg}]+set}" ]] || continue
+            wanted["${pkg}"]=1
+            if is_pkg_installed "${pkg}"; then
+              PLAN_APT_PRESENT+=1
+            else
+              PLAN_APT_INSTALL+=("${pkg}")
+              [[ "${strategy}" == "hashicorp_repo" ]] && need_hashicorp_repo=1
+            fi
+          done
+          if ((${#pkgs_arr[@]})) && ! is_marked_installed "${key}"; then
+            PLAN_MARK_KEYS+=("${key}")
+          fi
+          ;;
+        python|binary|docker_script)
+          PLAN_INSTALL_KEYS+=("${key}")
+          ;;
+        *)
+          PLAN_SKIPPED_KEYS+=("${key}")
+          ;;
+      esac
+    elif is_marked_installed "${key}"; then
+      case "${strategy}" in
+        apt|hashicorp_repo) PLAN_APT_REMOVE_KEYS+=("${key}") ;;
+        python|binary|docker_script) PLAN_REMOVE_KEYS+=("${key}") ;;
+      esac
+    fi
+  done
+
+  # Packages are read from the markers once all selected packages are known.
+  for key in "${PLAN_APT_REMOVE_KEYS[@]}"; do
+    pkgs_csv_to_array "$(marker_get_packages_compat_csv "${key}" || true)" pkgs_arr
+    for pkg in "${pkgs_arr[@]}"; do
+      [[ -z "${wanted[${pkg}]+set}" && -z "${removing[${pkg}]+set}" ]] || continue
+      removing["${pkg}"]=1
+      PLAN_APT_REMOVE+=("${pkg}")
+    done
+  done
+
+  ((need_hashicorp_repo)) && PLAN_REPOS+=("hashicorp")
+  return 0
+}
+
+plan_is_empty() {
+  ! ((${#PLAN_REPOS[@]} + ${#PLAN_APT_INSTALL[@]} + ${#PLAN_APT_REMOVE_KEYS[@]} \
+    + ${#PLAN_INSTALL_KEYS[@]} + ${#PLAN_REMOVE_KEYS[@]} + ${#PLAN_MARK_KEYS[@]}))
+}
+
+plan_summary() {
+  printf 'Repos to configure: %d\nApt installs: %d (%d already installed)\nApt removals: %d\nStrategy installs: %d\nStrategy removals: %d\nMarkers to write: %d\n' \
+    "${#PLAN_REPOS[@]}" "${#PLAN_APT_INSTALL[@]}" "${PLAN_APT_PRESENT}" "${#PLAN_APT_REMOVE[@]}" \
+    "${#PLAN_INSTALL_KEYS[@]}" "${#PLAN_REMOVE_KEYS[@]}" \
+    "$((${#PLAN_MARK_KEYS[@]} + ${#PLAN_INSTALL_KEYS[@]}))"
+}
+
+_plan_print_list() {
+  local title="$1"; shift
+  printf '%s (%d)\n' "${title}" "$#"
+  (($#)) || { printf '  (none)\n\n'; return 0; }
+  printf '  %s\n' "$@"
+  printf '\n'
+}
+
+plan_print() {
+  local key
+  local -a install_lines=() remove_lines=() mark_lines=() unmark_lines=() skipped_lines=()
+
+  for key in "${PLAN_INSTALL_KEYS[@]}"; do
+    install_lines+=("${key} (${CATALOGUE_STRATEGY[${key}]})")
+    mark_lines+=("+ ${key} (after install)")
+  done
+  for key in "${PLAN_MARK_KEYS[@]}"; do
+    mark_lines+=("+ ${key} (once ${CATALOGUE_PACKAGES[${key}]} verify)")
+  done
+  for key in "${PLAN_REMOVE_KEYS[@]}"; do
+    remove_lines+=("${key} (${CATALOGUE_STRATEGY[${key}]})")
+    unmark_lines+=("- ${key}")
+  done
+  for key in "${PLAN_APT_REMOVE_KEYS[@]}"; do
+    unmark_lines+=("- ${key}")
+  done
+  for key in "${PLAN_SKIPPED_KEYS[@]}"; do
+    skipped_lines+=("${key} (${CATALOGUE_STRATEGY[${key}]})")
+  done
+
+  printf 'fouchger_homelab app_manager plan (dry run)\n'
+  printf 'Env file  : %s\n' "${ENV_FILE}"
+  [[ -f "${ENV_FILE}" ]] || printf '            (not found: no apps are selected)\n'
+  printf '\n'
+
+  if plan_is_empty; then
+    printf 'Nothing to change: selections, markers and installed packages agree.\n\n'
+  fi
+
+  _plan_print_list "Repos to configure" "${PLAN_REPOS[@]}"
+  _plan_print_list "Apt installs (${PLAN_APT_PRESENT} selected packages already installed)" "${PLAN_APT_INSTALL[@]}"
+  _plan_print_list "Apt removals" "${PLAN_APT_REMOVE[@]}"
+  _plan_print_list "Strategy installs" "${install_lines[@]}"
+  _plan_print_list "Strategy removals" "${remove_lines[@]}"
+  _plan_print_list "Marker changes" "${mark_lines[@]}" "${unmark_lines[@]}"
+  ((${#skipped_lines[@]} == 0)) || _plan_print_list "Selected but not handled by Apply" "${skipped_lines[@]}"
+
+  printf 'Apt installs are checked against apt candidates when applied;\n'
+  printf 'packages with no candidate are skipped then.\n'
+}
@@ -44,7 +44,7 @@ apm_ui_run_checklist() {
         ;;
       APP)
         validate_key "${key}" || continue
-        if [[ "$(get_selection_value "${key}")" == "1" ]]; then status="on"; else status="off"; fi
+        if selection_is_on "${key}"; then status="on"; else status="off"; fi
         items+=( "${key}" "${label} | ${desc}" "${status}" )
         ;;
     esac
@@ -62,11 +62,11 @@ apm_ui_run_checklist() {
     chosen["$k"]=1
   done
 
-  for k in $(catalogue_all_app_keys); do
+  for k in "${CATALOGUE_KEYS[@]}"; do
     if [[ -n "${chosen[$k]:-}" ]]; then
-      printf -v "$(key_to_var "${k}")" '%s' "1"
+      printf -v "${CATALOGUE_VAR[${k}]}" '%s' "1"
     else
-      printf -v "$(key_to_var "${k}")" '%s' "0"
+      printf -v "${CATALOGUE_VAR[${k}]}" '%s' "0"
     fi
   done
 
@@ -102,6 +102,12 @@ apm_ui_apply_profile_append() {
   fi
 }
 
+apm_ui_preview_changes() {
+  local out_file="${APPM_DIR}/app-plan-preview.txt"
+  apply_changes --dry-run >"${out_file}"
+  _app_test_show_dialog "${out_file}" "Preview changes"
+}
+
 apm_ui_main_menu() {
   apm_init_paths || return 1
   write_default_env_if_missing || true
@@ -114,6 +120,7 @@ apm_ui_main_menu() {
       prof_append "Apply profile (append selections)" \
       select "Select apps (interactive)" \
       pins "Edit version pins" \
+      preview "Preview changes (dry run)" \
       apply "Apply changes (install/uninstall)" \
       audit "Audit selected apps" \
       back "Back"
@@ -124,6 +131,7 @@ apm_ui_main_menu() {
       prof_append)  apm_ui_apply_profile_append ;;
       select)       apm_ui_run_checklist ;;
       pins)         apm_ui_edit_version_pins ;;     # implemented in strategies.sh section below? (kept as separate function in strategies file is not right)
+      preview)      apm_ui_preview_changes ;;
       apply)        apply_changes ;;
       audit)        audit_selected_apps || true ;;
       back|"")      return 0 ;;
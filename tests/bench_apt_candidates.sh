@@ -0,0 +1,106 @@
+#!/usr/bin/env bash
+# -----------------------------------------------------------------------------
+# Filename: tests/bench_apt_candidates.sh
+# Created: 2026-10-17
+# Description:
+#   Benchmark for filter_installable_apt_pkgs in
+#   scripts/app_manager/lib/pkg_utils.sh: one `apt-cache policy` per package
+#   (the previous loop over apt_pkg_has_candidate) against the single batched
+#   query, at 50, 500 and 5000 packages.
+#   apt-cache is stubbed in PATH: every call reads a generated package list,
+#   standing in for the cache load a real apt-cache pays per invocation, then
+#   prints `apt-cache policy` style blocks. One in ten requested packages is
+#   unknown and one in twenty has no candidate, so both paths are exercised.
+#   Also checks that both approaches split the list identically.
+# Usage:
+#   tests/bench_apt_candidates.sh
+#   BENCH_SIZES="50 500" tests/bench_apt_candidates.sh
+# -----------------------------------------------------------------------------
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+fail() { echo "FAIL: $*" >&2; exit 1; }
+
+TEST_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_DIR="$(cd "$TEST_DIR/.." && pwd)"
+
+# shellcheck source=../scripts/app_manager/lib/pkg_utils.sh
+source "$REPO_DIR/scripts/app_manager/lib/pkg_utils.sh"
+
+SIZES="${BENCH_SIZES:-50 500 5000}"
+DB_SIZE="${BENCH_DB_SIZE:-60000}"
+
+tmp="$(mktemp -d)"
+cleanup() { rm -rf "$tmp"; }
+trap cleanup EXIT
+
+# Package "database": name and candidate per line, like a trimmed apt cache.
+awk -v n="${DB_SIZE}" 'BEGIN {
+  for (i = 0; i < n; i++) printf "pkg%05d %s\n", i, (i % 20 == 7 ? "(none)" : "1." i "-1ubuntu1")
+}' >"$tmp/packages.db"
+
+mkdir -p "$tmp/bin"
+cat >"$tmp/bin/apt-cache" <<'EOF'
+#!/usr/bin/env bash
+[[ "${1:-}" == "policy" ]] || exit 1
+shift
+printf '%s\n' "$@" | awk -v db="${APT_STUB_DB}" '
+  BEGIN { while ((getline line < db) > 0) { split(line, f, " "); cand[f[1]] = f[2] } }
+  {
+    if (!($1 in cand)) { print "N: Unable to locate package " $1 > "/dev/stderr"; next }
+    printf "%s:\n  Installed: (none)\n  Candidate: %s\n  Version table:\n", $1, cand[$1]
+    if (cand[$1] != "(none)") printf "     %s 500\n        500 http://archive.ubuntu.com/ubuntu noble/main amd64 Packages\n", cand[$1]
+  }
+'
+EOF
+chmod +x "$tmp/bin/apt-cache"
+export APT_STUB_DB="$tmp/packages.db"
+PATH="$tmp/bin:$PATH"
+
+# The previous implementation, kept here as the baseline.
+filter_per_package() {
+  local in_name="$1" out_name="$2" missing_name="$3"
+  local -a installable=() missing=()
+  local p
+
+  eval "for p in \"\${${in_name}[@]}\"; do
+    if apt_pkg_has_candidate \"\$p\"; then
+      installable+=(\"\$p\")
+    else
+      missing+=(\"\$p\")
+    fi
+  done"
+
+  eval "${out_name}=(\"\${installable[@]}\")"
+  eval "${missing_name}=(\"\${missing[@]}\")"
+}
+
+elapsed() {
+  # Seconds since $1 (an EPOCHREALTIME value), to the millisecond.
+  awk -v a="$1" -v b="${EPOCHREALTIME}" 'BEGIN { printf "%.3f", b - a }'
+}
+
+printf '%-8s %12s %12s %9s %10s\n' "packages" "per-pkg (s)" "batched (s)" "speed-up" "missing"
+IFS=' ' read -r -a sizes <<<"${SIZES}"
+for n in "${sizes[@]}"; do
+  mapfile -t wanted < <(awk -v n="$n" -v db="${DB_SIZE}" 'BEGIN {
+    for (i = 0; i < n; i++) print (i % 10 == 3 ? "absent" i : sprintf("pkg%05d", (i * 7) % db))
+  }')
+
+  start="${EPOCHREALTIME}"
+  filter_per_package wanted old_ok old_missing
+  old_s="$(elapsed "$start")"
+
+  start="${EPOCHREALTIME}"
+  filter_installable_apt_pkgs wanted new_ok new_missing
+  new_s="$(elapsed "$start")"
+
+  [[ "${old_ok[*]}" == "${new_ok[*]}" ]] || fail "installable lists differ at n=${n}"
+  [[ "${old_missing[*]}" == "${new_missing[*]}" ]] || fail "missing lists differ at n=${n}"
+
+  printf '%-8s %12s %12s %8sx %10s\n' "$n" "$old_s" "$new_s" \
+    "$(awk -v a="$old_s" -v b="$new_s" 'BEGIN { printf "%.0f", (b > 0 ? a / b : 0) }')" "${#new_missing[@]}"
+done
+
+echo "PASS: filter_installable_apt_pkgs (batched results match per-package)"
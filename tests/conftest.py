@@ -0,0 +1,16 @@
+"""
+Fouchger Homelab – tests: pytest setup for the manual generator
+
+Description:
+  Puts docs/tools on sys.path so tests import the `manuals` package the same
+  way docs/tools/generate_manuals.py does. The Bash self-tests (test_*.sh)
+  run on their own and are not collected.
+
+-------------------------------------------------------------------------------
+"""
+
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_DIR / "docs" / "tools"))
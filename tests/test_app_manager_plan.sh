@@ -0,0 +1,144 @@
+#!/usr/bin/env bash
+# -----------------------------------------------------------------------------
+# Filename: tests/test_app_manager_plan.sh
+# Created: 2026-10-17
+# Description:
+#   Self-test for the App Manager planner (scripts/app_manager/lib/plan.sh)
+#   and apply_changes --dry-run. Uses the real catalogue with a fake dpkg
+#   status file, marker directory and env file; sudo, apt-get, apt-cache and
+#   nala are stubbed in PATH to fail loudly, so the test also proves the
+#   dry run, and Apply on an empty plan, never reach them.
+# -----------------------------------------------------------------------------
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+fail() { echo "FAIL: $*" >&2; exit 1; }
+
+TEST_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_DIR="$(cd "$TEST_DIR/.." && pwd)"
+LIB="$REPO_DIR/scripts/app_manager/lib"
+
+tmp="$(mktemp -d)"
+cleanup() { rm -rf "$tmp"; }
+trap cleanup EXIT
+
+mkdir -p "$tmp/bin" "$tmp/appm" "$tmp/state/markers"
+for cmd in sudo apt-get apt-cache nala; do
+  printf '#!/usr/bin/env bash\necho "%s $*" >>"%s/forbidden"\nexit 1\n' "$cmd" "$tmp" >"$tmp/bin/$cmd"
+  chmod +x "$tmp/bin/$cmd"
+done
+PATH="$tmp/bin:$PATH"
+
+export APPM_DIR="$tmp/appm" ENV_BACKUP_DIR="$tmp/appm/backups" STATE_DIR="$tmp/state"
+export MARKER_DIR="$tmp/state/markers" BIN_DIR="$tmp/bin"
+export DPKG_STATUS_FILE="$tmp/status"
+export USER="${USER:-$(id -un)}"
+
+# Installed: curl, jq, openssh-server. openssh-client is only config-files.
+cat >"$DPKG_STATUS_FILE" <<'EOF'
+Package: curl
+Status: install ok installed
+Architecture: amd64
+
+Package: jq
+Status: install ok installed
+Architecture: amd64
+
+Package: openssh-server
+Status: install ok installed
+Architecture: amd64
+
+Package: openssh-client
+Status: deinstall ok config-files
+Architecture: amd64
+EOF
+
+# Selected: curl, jq, openssh, tmux (apt), terraform (hashicorp_repo), helm (binary).
+cat >"$APPM_DIR/app_install_list.env" <<'EOF'
+APP_CURL=1
+APP_JQ=1
+APP_OPENSSH=1
+APP_TMUX=1
+APP_TERRAFORM=1
+APP_HELM=1
+APP_GH=1
+APP_REDIS=0
+APP_KUBECTL=0
+EOF
+
+# Markers: jq already marked; redis (deselected) shares curl with a selected
+# app; kubectl (deselected binary) is marked; sops (deselected) is not.
+printf 'strategy=apt\npackages_csv=jq\n' >"$MARKER_DIR/jq.installed_by_app_manager"
+printf 'strategy=apt\npackages_csv=redis-server,curl\n' >"$MARKER_DIR/redis.installed_by_app_manager"
+printf 'strategy=binary\n' >"$MARKER_DIR/kubectl.installed_by_app_manager"
+
+ui_msgbox() { fail "unexpected dialog: $1"; }
+
+# shellcheck source=../lib/logging.sh
+source "$REPO_DIR/lib/logging.sh"
+for f in constants catalogue env markers pkg_utils audit plan apply; do
+  # shellcheck source=/dev/null
+  source "$LIB/$f.sh"
+done
+
+load_env
+plan_build
+
+words() { local IFS=' '; printf '%s' "$*"; }
+has() { local want="$1" x; shift; for x in "$@"; do [[ "$x" == "$want" ]] && return 0; done; return 1; }
+
+# Apt installs: only what is missing.
+[[ "$(words "${PLAN_APT_INSTALL[@]}")" == "openssh-client tmux terraform" ]] || fail "apt installs: $(words "${PLAN_APT_INSTALL[@]}")"
+[[ "${PLAN_APT_PRESENT}" -eq 3 ]] || fail "already installed: expected 3, got ${PLAN_APT_PRESENT}"
+[[ "$(words "${PLAN_REPOS[@]}")" == "hashicorp" ]] || fail "repos: $(words "${PLAN_REPOS[@]}")"
+
+# Apt removals: redis-server goes, curl stays because the curl app is selected.
+[[ "$(words "${PLAN_APT_REMOVE[@]}")" == "redis-server" ]] || fail "apt removals: $(words "${PLAN_APT_REMOVE[@]}")"
+has curl "${PLAN_APT_REMOVE[@]}" && fail "curl removed although a selected app needs it"
+[[ "$(words "${PLAN_APT_REMOVE_KEYS[@]}")" == "redis" ]] || fail "apt removal keys: $(words "${PLAN_APT_REMOVE_KEYS[@]}")"
+
+# Strategy installs/removals: helm installs; only the marked kubectl is removed.
+[[ "$(words "${PLAN_INSTALL_KEYS[@]}")" == "helm" ]] || fail "strategy installs: $(words "${PLAN_INSTALL_KEYS[@]}")"
+[[ "$(words "${PLAN_REMOVE_KEYS[@]}")" == "kubectl" ]] || fail "strategy removals: $(words "${PLAN_REMOVE_KEYS[@]}")"
+
+# Markers: unmarked selected apt apps are marked; jq (already marked) is not.
+has jq "${PLAN_MARK_KEYS[@]}" && fail "jq re-marked"
+for k in curl openssh tmux terraform; do
+  has "$k" "${PLAN_MARK_KEYS[@]}" || fail "$k not planned for marking (got $(words "${PLAN_MARK_KEYS[@]}"))"
+done
+
+# Unhandled strategy is reported, not acted on.
+[[ "$(words "${PLAN_SKIPPED_KEYS[@]}")" == "gh" ]] || fail "skipped: $(words "${PLAN_SKIPPED_KEYS[@]}")"
+
+# Dry run: prints the plan, runs no sudo/apt, creates nothing.
+out="$(apply_changes --dry-run)"
+grep -q "^  redis-server$" <<<"$out" || fail "dry run does not list redis-server removal"
+grep -q "^  - redis$" <<<"$out" || fail "dry run does not list the redis marker removal"
+[[ ! -e "$tmp/forbidden" ]] || fail "dry run ran: $(cat "$tmp/forbidden")"
+[[ ! -e "$APPM_DIR/app-manager.log" ]] || fail "dry run touched the apply log"
+
+# Everything in agreement: empty plan.
+printf 'APP_CURL=1\nAPP_JQ=1\n' >"$APPM_DIR/app_install_list.env"
+rm -f "$MARKER_DIR"/*.installed_by_app_manager
+printf 'strategy=apt\npackages_csv=curl\n' >"$MARKER_DIR/curl.installed_by_app_manager"
+printf 'strategy=apt\npackages_csv=jq\n' >"$MARKER_DIR/jq.installed_by_app_manager"
+unset APP_OPENSSH APP_TMUX APP_TERRAFORM APP_HELM APP_GH
+load_env
+plan_build
+plan_is_empty || fail "plan not empty when selections, markers and dpkg agree: $(plan_summary | tr '\n' ' ')"
+
+# Apply on an empty plan: no confirmation, sudo or apt, but the status report
+# is still refreshed.
+ui_confirm() { fail "confirmation asked for an empty plan"; }
+ui_msgbox() { printf '%s\n' "$2" >>"$tmp/msgbox"; }
+ui_textbox() { printf '%s\n' "$2" >>"$tmp/textbox"; }
+apply_changes >/dev/null
+grep -q "^Nothing to change" "$tmp/msgbox" || fail "empty plan did not say there is nothing to change"
+report="$APPM_DIR/app-install-status.txt"
+[[ "$(cat "$tmp/textbox")" == "$report" ]] || fail "status report not shown"
+grep -Eq '^curl +apt +OK ' "$report" || fail "status report missing curl: $(cat "$report")"
+grep -Eq '^jq +apt +OK ' "$report" || fail "status report missing jq"
+[[ ! -e "$tmp/forbidden" ]] || fail "empty plan ran: $(cat "$tmp/forbidden")"
+
+echo "PASS: plan_build / apply_changes (dry run, empty plan)"
@@ -0,0 +1,85 @@
+#!/usr/bin/env bash
+# -----------------------------------------------------------------------------
+# Filename: tests/test_apt_update_cache.sh
+# Created: 2026-10-17
+# Description:
+#   Self-test for the apt list refresh cache in
+#   scripts/app_manager/lib/pkg_mgr.sh (pkg_update_once): fresh unchanged
+#   sources skip the update, an added source is fetched on its own, and a
+#   failed update (full or targeted) is never recorded as fresh.
+#   apt-get is stubbed in PATH; no root, network or apt needed.
+# -----------------------------------------------------------------------------
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+fail() { echo "FAIL: $*" >&2; exit 1; }
+
+TEST_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_DIR="$(cd "$TEST_DIR/.." && pwd)"
+
+tmp="$(mktemp -d)"
+cleanup() { rm -rf "$tmp"; }
+trap cleanup EXIT
+
+mkdir -p "$tmp/etc/sources.list.d" "$tmp/lists" "$tmp/bin"
+echo "deb http://deb.debian.org/debian bookworm main" >"$tmp/etc/sources.list"
+: >"$tmp/lists/deb.debian.org_dists_bookworm_main_binary-amd64_Packages"
+
+# apt-get stub: logs each call, fails while $tmp/fail exists.
+cat >"$tmp/bin/apt-get" <<EOF
+#!/usr/bin/env bash
+printf '%s\n' "\$*" >>"$tmp/calls"
+[[ ! -e "$tmp/fail" ]]
+EOF
+chmod +x "$tmp/bin/apt-get"
+PATH="$tmp/bin:$PATH"
+
+export APT_SOURCES_DIR="$tmp/etc" APT_LISTS_DIR="$tmp/lists" APT_UPDATE_STAMP="$tmp/state/apt-update.stamp"
+
+# shellcheck source=../scripts/app_manager/lib/constants.sh
+source "$REPO_DIR/scripts/app_manager/lib/constants.sh"
+# shellcheck source=../scripts/app_manager/lib/pkg_mgr.sh
+source "$REPO_DIR/scripts/app_manager/lib/pkg_mgr.sh"
+as_root() { "$@"; }
+log_line() { :; }
+PKG_MGR="apt-get"
+
+calls() { [[ -f "$tmp/calls" ]] && wc -l <"$tmp/calls" || echo 0; }
+expect_calls() { [[ "$(calls)" -eq "$1" ]] || fail "$2: expected $1 apt-get calls, got $(calls)"; }
+
+# 1) A failed full update is not stamped, even when the caller ignores it.
+touch "$tmp/fail"
+pkg_update_once || true
+[[ ! -e "$APT_UPDATE_STAMP" ]] || fail "stamp written after failed update"
+pkg_update_once || true
+expect_calls 2 "retry after failed update"
+
+# 2) A successful update is stamped; the next call is skipped.
+rm -f "$tmp/fail"
+pkg_update_once || fail "update failed"
+[[ -s "$APT_UPDATE_STAMP" ]] || fail "stamp missing after update"
+pkg_update_once || fail "skipped update failed"
+expect_calls 3 "fresh unchanged sources"
+
+# 3) An added vendor list is fetched on its own.
+echo "deb https://apt.releases.hashicorp.com bookworm main" >"$tmp/etc/sources.list.d/hashicorp.list"
+touch "$tmp/fail"
+pkg_update_once || true
+expect_calls 4 "targeted update attempt"
+grep -q "sourcelist=$tmp/etc/sources.list.d/hashicorp.list" "$tmp/calls" || fail "targeted update not restricted to the new list"
+grep -q "hashicorp.list" "$APT_UPDATE_STAMP" && fail "failed targeted update recorded in stamp"
+
+# 4) ...and retried until it succeeds, then skipped.
+rm -f "$tmp/fail"
+pkg_update_once || fail "targeted update failed"
+pkg_update_once || fail "skipped update failed"
+expect_calls 5 "after targeted update"
+
+# 5) An edited list forces a full update.
+echo "deb http://security.debian.org bookworm-security main" >>"$tmp/etc/sources.list"
+pkg_update_once || fail "full update failed"
+expect_calls 6 "edited sources"
+[[ "$(tail -n 1 "$tmp/calls")" == "update" ]] || fail "edited sources did not run a full update"
+
+echo "PASS: pkg_update_once (apt list refresh cache)"
@@ -0,0 +1,162 @@
+"""
+Fouchger Homelab – tests: Bash symbol indexer
+
+Description:
+  index_text / index_repo (docs/tools/manuals/bash_index.py) on small
+  fixtures: definitions, calls and source edges, including the constructs
+  the lexer has to step over (case patterns, heredocs, $(...), $(( ))).
+
+-------------------------------------------------------------------------------
+"""
+
+from pathlib import Path
+
+from manuals.bash_index import index_repo, index_text
+
+
+def calls(text: str) -> dict:
+    fi = index_text("t.sh", text)
+    return {f.name: f.calls for f in fi.functions}
+
+
+def test_definitions() -> None:
+    fi = index_text("t.sh", (
+        "plain() { :; }\n"
+        "function kw { :; }\n"
+        "function kw_parens() {\n"
+        "  :\n"
+        "}\n"
+        "sub() ( : )\n"
+        "ns::dotted.name-x() { :; }\n"
+        'echo "not() { a definition }"\n'
+        "# commented() { :; }\n"
+    ))
+    assert [(f.name, f.line) for f in fi.functions] == [
+        ("plain", 1), ("kw", 2), ("kw_parens", 3), ("sub", 6), ("ns::dotted.name-x", 7),
+    ]
+
+
+def test_calls_once_in_order_with_prefixes_and_nesting() -> None:
+    got = calls(
+        "outer() {\n"
+        "  VAR=1 first arg\n"
+        "  if second; then command third; fi\n"
+        "  first again\n"
+        "  inner() { nested_only; }\n"
+        "  { grouped; } && piped | fourth\n"
+        "}\n"
+        "top_level\n"
+    )
+    assert got == {"outer": ["first", "second", "third", "grouped", "piped", "fourth"], "inner": ["nested_only"]}
+    assert index_text("t.sh", "outer() { :; }\ntop_level\necho top_level\n").toplevel_calls == ["top_level", "echo"]
+
+
+def test_case_patterns_are_not_calls() -> None:
+    got = calls(
+        "main() {\n"
+        '  case "$1" in\n'
+        "    start) start_service ;;\n"
+        "    stop|restart)\n"
+        "      stop_service\n"
+        "      ;;\n"
+        "    (status|health) report ;;&\n"
+        "    reload) reload_config ;&\n"
+        "    nested)\n"
+        '      case "$2" in\n'
+        "        soft) soft_reload ;;\n"
+        "      esac\n"
+        "      ;;\n"
+        "    *) usage ;;\n"
+        "  esac\n"
+        "  after_case\n"
+        "  for in_list in a b; do loop_body; done\n"
+        "}\n"
+    )
+    assert got == {"main": [
+        "start_service", "stop_service", "report", "reload_config", "soft_reload",
+        "usage", "after_case", "loop_body",
+    ]}
+
+
+def test_case_without_final_terminator() -> None:
+    assert calls("f() {\n  case $x in\n    a) one\n  esac\n  two\n}\n") == {"f": ["one", "two"]}
+
+
+def test_heredocs_are_skipped() -> None:
+    got = calls(
+        "f() {\n"
+        "  cat <<EOF\n"
+        "not_a_call $(also_not)\n"
+        "EOF\n"
+        "\tcat <<-'END' >out\n"
+        "\tquoted_body\n"
+        "\tEND\n"
+        "  after_heredoc <<<\"here_string\"\n"
+        "}\n"
+    )
+    assert got == {"f": ["cat", "after_heredoc"]}
+
+
+def test_substitutions_and_arithmetic() -> None:
+    got = calls(
+        "f() {\n"
+        '  out="$(outer "$(inner)" `backtick`)"\n'
+        "  diff <(left) >(right)\n"
+        "  n=$(( count + $(in_arith) ))\n"
+        "  (( total += n ))\n"
+        "  arr=(not_a_call \"$(in_array)\")\n"
+        "  last\n"
+        "}\n"
+    )
+    assert got == {"f": ["outer", "inner", "backtick", "diff", "left", "right", "last"]}
+
+
+def test_line_numbers_follow_strings_and_continuations() -> None:
+    fi = index_text("t.sh", (
+        "a() {\n"
+        "  echo 'multi\n"
+        "line' \\\n"
+        "    more\n"
+        "}\n"
+        "b() { :; }\n"
+    ))
+    assert [(f.name, f.line) for f in fi.functions] == [("a", 1), ("b", 6)]
+
+
+def test_source_edges_and_call_graph(tmp_path: Path) -> None:
+    files = {
+        "bin/tool": "",
+        "lib/util.sh": "util() { :; }\n",
+        "lib/extra.sh": "extra() { util; }\n",
+        "scripts/app/main.sh": (
+            'source "${REPO_ROOT}/lib/util.sh"\n'
+            '. "$(cd "$(dirname "$0")" && pwd)/lib/extra.sh"\n'
+            "source /etc/os-release\n"
+            "source missing.sh\n"
+            "main() { util; extra; unknown_cmd; }\n"
+            "main\n"
+        ),
+    }
+    paths = []
+    for rel, text in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    symbols = index_repo(tmp_path, paths)
+
+    assert symbols.files["scripts/app/main.sh"].sources == [
+        ('"${REPO_ROOT}/lib/util.sh"', 1),
+        ('"$(cd "$(dirname "$0")" && pwd)/lib/extra.sh"', 2),
+        ("/etc/os-release", 3),
+        ("missing.sh", 4),
+    ]
+    assert sorted(symbols.source_edges) == [
+        ("scripts/app/main.sh", "lib/extra.sh"),
+        ("scripts/app/main.sh", "lib/util.sh"),
+    ]
+    main = symbols.definitions["main"][0]
+    assert symbols.calls_of(main) == ["util", "extra"]
+    assert symbols.callers["util"] == ["extra", "main"]
+    assert symbols.callers["main"] == ["<scripts/app/main.sh>"]
+    assert set(symbols.digests) == set(files)
@@ -0,0 +1,80 @@
+#!/usr/bin/env bash
+# -----------------------------------------------------------------------------
+# Filename: tests/test_catalogue_index.sh
+# Created: 2026-10-17
+# Description:
+#   Self-test for catalogue_index_build in
+#   scripts/app_manager/lib/catalogue.sh: first row wins for a duplicate
+#   key, invalid keys are skipped, strategy defaults to apt, CATALOGUE_VAR
+#   naming, and neither IFS nor noglob leak out of the split.
+# -----------------------------------------------------------------------------
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+fail() { echo "FAIL: $*" >&2; exit 1; }
+
+TEST_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_DIR="$(cd "$TEST_DIR/.." && pwd)"
+
+tmp="$(mktemp -d)"
+cleanup() { rm -rf "$tmp"; }
+trap cleanup EXIT
+
+# shellcheck source=../scripts/app_manager/lib/catalogue.sh
+source "$REPO_DIR/scripts/app_manager/lib/catalogue.sh"
+
+catalogue_has_key curl || fail "shipped catalogue has no curl"
+
+# Files that a glob in a label would match if globbing were on.
+touch "$tmp/a" "$tmp/C"
+cd "$tmp"
+
+APP_CATALOGUE=(
+  "HEADING|Test"
+  "APP|alpha|[C] Alpha *|ON|pkg-a,pkg-b|First alpha|apt|ALPHA_VERSION"
+  "BLANK| "
+  "APP|beta-cli|[C] Beta|OFF|beta|No strategy||"
+  "APP|gamma|[C] Gamma|OFF|gamma|Trailing fields omitted"
+  "APP|alpha|[C] Alpha again|OFF|pkg-z|Duplicate|binary|"
+  "APP|bad key|[C] Space|ON|x|Invalid key|apt|"
+  "APP|bad.key|[C] Dot|ON|x|Invalid key|apt|"
+  "APP||[C] Empty|ON|x|Empty key|apt|"
+  "APP|delta|[C] Delta|ON||Binary only|binary|DELTA_VERSION"
+)
+catalogue_index_build
+
+words() { local IFS=' '; printf '%s' "$*"; }
+
+# Keys in row order; duplicate and invalid keys dropped.
+[[ "$(words "${CATALOGUE_KEYS[@]}")" == "alpha beta-cli gamma delta" ]] \
+  || fail "keys: $(words "${CATALOGUE_KEYS[@]}")"
+catalogue_has_key "bad key" && fail "invalid key indexed"
+
+# First row wins.
+[[ "${CATALOGUE_ROW[alpha]}" == 1 ]] || fail "alpha row: ${CATALOGUE_ROW[alpha]}"
+[[ "${CATALOGUE_LABEL[alpha]}" == "[C] Alpha *" ]] || fail "alpha label: ${CATALOGUE_LABEL[alpha]}"
+[[ "${CATALOGUE_PACKAGES[alpha]}" == "pkg-a,pkg-b" ]] || fail "alpha packages: ${CATALOGUE_PACKAGES[alpha]}"
+[[ "${CATALOGUE_STRATEGY[alpha]}" == "apt" ]] || fail "alpha strategy: ${CATALOGUE_STRATEGY[alpha]}"
+[[ "${CATALOGUE_VERSION_VAR[alpha]}" == "ALPHA_VERSION" ]] || fail "alpha version var"
+[[ "$(catalogue_row_by_key alpha)" == "${APP_CATALOGUE[1]}" ]] || fail "catalogue_row_by_key alpha"
+
+# Strategy defaults to apt, whether empty or missing.
+[[ "${CATALOGUE_STRATEGY[beta-cli]}" == "apt" ]] || fail "empty strategy: ${CATALOGUE_STRATEGY[beta-cli]}"
+[[ "${CATALOGUE_STRATEGY[gamma]}" == "apt" ]] || fail "missing strategy: ${CATALOGUE_STRATEGY[gamma]}"
+[[ "${CATALOGUE_STRATEGY[delta]}" == "binary" ]] || fail "delta strategy: ${CATALOGUE_STRATEGY[delta]}"
+[[ -z "${CATALOGUE_PACKAGES[delta]}" ]] || fail "delta packages: ${CATALOGUE_PACKAGES[delta]}"
+[[ "${CATALOGUE_DEFAULT[delta]}" == "ON" ]] || fail "delta default: ${CATALOGUE_DEFAULT[delta]}"
+
+# Selection variable names: upper case, '-' becomes '_'.
+[[ "${CATALOGUE_VAR[alpha]}" == "APP_ALPHA" ]] || fail "alpha var: ${CATALOGUE_VAR[alpha]}"
+[[ "${CATALOGUE_VAR[beta-cli]}" == "APP_BETA_CLI" ]] || fail "beta-cli var: ${CATALOGUE_VAR[beta-cli]}"
+
+mapfile -t defaults < <(catalogue_default_selected_keys)
+[[ "$(words "${defaults[@]}")" == "alpha delta" ]] || fail "default keys: $(words "${defaults[@]}")"
+
+# The split's IFS and set -f stay inside the function.
+[[ "$IFS" == $'\n\t' ]] || fail "IFS leaked from catalogue_index_build"
+[[ "$-" != *f* ]] || fail "noglob leaked from catalogue_index_build"
+
+echo "PASS: catalogue_index_build"
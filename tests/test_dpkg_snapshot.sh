@@ -0,0 +1,75 @@
+#!/usr/bin/env bash
+# -----------------------------------------------------------------------------
+# Filename: tests/test_dpkg_snapshot.sh
+# Created: 2026-10-17
+# Description:
+#   Self-test for the dpkg snapshot in scripts/app_manager/lib/pkg_utils.sh
+#   (is_pkg_installed): the snapshot follows changes to the status file and,
+#   when that file is missing, reloads from dpkg-query after every
+#   dpkg_snapshot_invalidate. dpkg-query is stubbed in PATH.
+# -----------------------------------------------------------------------------
+
+set -Eeuo pipefail
+IFS=$'\n\t'
+
+fail() { echo "FAIL: $*" >&2; exit 1; }
+
+TEST_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_DIR="$(cd "$TEST_DIR/.." && pwd)"
+
+tmp="$(mktemp -d)"
+cleanup() { rm -rf "$tmp"; }
+trap cleanup EXIT
+
+# dpkg-query stub: logs each call and prints $tmp/query ("pkg<TAB>arch<TAB>status").
+mkdir -p "$tmp/bin"
+cat >"$tmp/bin/dpkg-query" <<EOF
+#!/usr/bin/env bash
+echo x >>"$tmp/calls"
+cat "$tmp/query"
+EOF
+chmod +x "$tmp/bin/dpkg-query"
+PATH="$tmp/bin:$PATH"
+
+calls() { [[ -f "$tmp/calls" ]] && wc -l <"$tmp/calls" || echo 0; }
+
+status_stanza() { printf 'Package: %s\nStatus: %s\nArchitecture: amd64\n\n' "$1" "$2"; }
+
+export DPKG_STATUS_FILE="$tmp/status"
+status_stanza curl "install ok installed" >"$DPKG_STATUS_FILE"
+
+# shellcheck source=../scripts/app_manager/lib/pkg_utils.sh
+source "$REPO_DIR/scripts/app_manager/lib/pkg_utils.sh"
+
+# 1) Status file: answers from the file, follows a rewrite after invalidate.
+is_pkg_installed curl || fail "curl not installed (status file)"
+is_pkg_installed curl:amd64 || fail "curl:amd64 not installed (status file)"
+is_pkg_installed jq && fail "jq installed (status file)"
+{ status_stanza curl "deinstall ok config-files"; status_stanza jq "install ok installed"; } >"$DPKG_STATUS_FILE.new"
+mv "$DPKG_STATUS_FILE.new" "$DPKG_STATUS_FILE"
+dpkg_snapshot_invalidate
+is_pkg_installed curl && fail "curl still installed after status file rewrite"
+is_pkg_installed jq || fail "jq not installed after status file rewrite"
+[[ "$(calls)" -eq 0 ]] || fail "dpkg-query used while the status file is readable"
+
+# 2) No status file: dpkg-query answers...
+rm -f "$DPKG_STATUS_FILE"
+printf 'curl\tamd64\tinstall ok installed\n' >"$tmp/query"
+dpkg_snapshot_invalidate
+is_pkg_installed curl || fail "curl not installed (dpkg-query)"
+is_pkg_installed jq && fail "jq installed (dpkg-query)"
+[[ "$(calls)" -eq 1 ]] || fail "expected 1 dpkg-query call, got $(calls)"
+
+# 3) ...is reused until the next invalidate...
+printf 'jq\tamd64\tinstall ok installed\n' >"$tmp/query"
+is_pkg_installed curl || fail "snapshot reloaded without invalidate"
+dpkg_snapshot_refresh
+[[ "$(calls)" -eq 1 ]] || fail "dpkg-query re-run without invalidate"
+
+# 4) ...and is reloaded after it, although there is no file to stat.
+dpkg_snapshot_invalidate
+is_pkg_installed curl && fail "stale dpkg-query snapshot: curl still installed"
+is_pkg_installed jq || fail "stale dpkg-query snapshot: jq not installed"
+[[ "$(calls)" -eq 2 ]] || fail "expected 2 dpkg-query calls, got $(calls)"
+
+echo "PASS: is_pkg_installed (dpkg snapshot)"
@@ -0,0 +1,67 @@
+"""
+Fouchger Homelab – tests: project index catalogue and profiles
+
+Description:
+  build_project_index (docs/tools/manuals/project_index.py) must take apps
+  and profiles only from the files that define them, never from fixtures
+  such as tests/test_catalogue_index.sh.
+
+-------------------------------------------------------------------------------
+"""
+
+from pathlib import Path
+
+from conftest import REPO_DIR
+from manuals.bash_index import index_repo
+from manuals.project_index import APP_DATA_FILES, build_project_index
+from manuals.walker import walk_repo
+
+
+def _write(root: Path, rel: str, text: str) -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_fixture_catalogues_are_not_apps(tmp_path: Path) -> None:
+    paths = [
+        _write(tmp_path, "scripts/app_manager/lib/catalogue.sh", (
+            "APP_CATALOGUE=(\n"
+            '  "HEADING|Core"\n'
+            '  "APP|curl|[Core] curl|ON|curl|HTTP client|apt|"\n'
+            '  "APP|helm|[K8s] helm|OFF||Charts|binary|HELM_VERSION"\n'
+            ")\n"
+        )),
+        _write(tmp_path, "scripts/app_manager/lib/profiles.sh", (
+            "PROFILE_BASIC_KEYS=(curl)\n"
+            'PROFILE_K8S_KEYS=("${PROFILE_BASIC_KEYS[@]}" helm)\n'
+        )),
+        _write(tmp_path, "tests/test_fixture.sh", (
+            'APP_CATALOGUE=(\n  "APP|fake|Fake|ON|fake|Fixture|apt|"\n)\n'
+            "PROFILE_FAKE_KEYS=(fake)\n"
+        )),
+        _write(tmp_path, "scripts/other.sh", 'APP_CATALOGUE=("APP|stray|Stray|ON|x|y|apt|")\n'),
+    ]
+    index = build_project_index(tmp_path, index_repo(tmp_path, paths))
+
+    assert [(a["key"], a["file"], a["section"]) for a in index["apps"]] == [
+        ("curl", "scripts/app_manager/lib/catalogue.sh", "Core"),
+        ("helm", "scripts/app_manager/lib/catalogue.sh", "Core"),
+    ]
+    assert index["apps"][1]["packages"] == [] and index["apps"][1]["default"] is False
+    profiles = {p["name"]: p for p in index["profiles"]}
+    assert sorted(profiles) == ["all", "basic", "k8s"]
+    assert profiles["k8s"]["apps"] == ["curl", "helm"]
+    assert profiles["all"]["apps"] == ["curl", "helm"]
+
+
+def test_repo_index_has_no_test_rows() -> None:
+    walk = walk_repo(REPO_DIR, lambda rel: rel.endswith(".sh") or rel == "bin/homelab")
+    index = build_project_index(REPO_DIR, index_repo(REPO_DIR, walk.files))
+
+    assert index["apps"], "no catalogue rows found"
+    assert {a["file"] for a in index["apps"]} <= set(APP_DATA_FILES)
+    assert {p["file"] for p in index["profiles"]} <= set(APP_DATA_FILES)
+    assert not [a for a in index["apps"] if a["file"].startswith("tests/")]
+    assert "curl" in {a["key"] for a in index["apps"] if a["file"] == "scripts/app_manager/lib/catalogue.sh"}
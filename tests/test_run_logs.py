@@ -0,0 +1,111 @@
+"""
+Fouchger Homelab – tests: run log analytics
+
+Description:
+  find_run_logs / scan_run / scan_run_logs (docs/tools/manuals/run_logs.py):
+  failed, completed and unfinished runs, rotated backups read before the
+  live log, message normalisation, the per-run message cap, and the rows
+  the Runbook chapter prints (component_rows, top_messages).
+
+-------------------------------------------------------------------------------
+"""
+
+from pathlib import Path
+
+from bench_manuals import make_synthetic_logs
+from manuals import run_logs
+from manuals.run_logs import component_rows, find_run_logs, scan_run, scan_run_logs
+
+
+def _log(path: Path, *lines: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def test_run_kinds_rotation_and_messages(tmp_path: Path) -> None:
+    # Completed, 2 minutes; the untimestamped stdout copies are ignored.
+    _log(tmp_path / "20260101-080000-homelab.log",
+         "2026-01-01T08:00:00+00:00 [ℹ️ INFO] Run started: 20260101-080000-homelab",
+         "[ℹ️ INFO] Run started: 20260101-080000-homelab",
+         "2026-01-01T08:01:00+00:00 [⚠️ WARN] Retry 1 of 5 for apt",
+         "[⚠️ WARN] Retry 1 of 5 for apt",
+         "2026-01-01T08:02:00+00:00 [✔ OK] Run completed successfully.")
+    # Failed, 30 seconds; "See log:" and digits are normalised away.
+    _log(tmp_path / "20260101-090000-homelab.log",
+         "2026-01-01T09:00:00+00:00 [ℹ️ INFO] Run started: 20260101-090000-homelab",
+         "2026-01-01T09:00:30+00:00 [✖ ERROR] Run failed (exit 100) at line 42. See log: /var/log/x.log")
+    # Unfinished, a single timestamp: not timed.
+    _log(tmp_path / "20260101-100000-app_manager.log",
+         "2026-01-01T10:00:00+00:00 [ℹ️ INFO] Run started: 20260101-100000-app_manager")
+    # Rotated twice; backups (oldest first) then the live log: 10 minutes.
+    run = "20260101-110000-app_manager"
+    older = _log(tmp_path / "backup" / f"{run}.log.2026-01-01T11-01-00+00-00.bak",
+                 "2026-01-01T11:00:00+00:00 [ℹ️ INFO] Run started: " + run,
+                 "2026-01-01T11:01:00+00:00 [⚠️ WARN] Retry 2 of 5 for apt")
+    newer = _log(tmp_path / "backup" / f"{run}.log.2026-01-01T11-05-00+00-00.bak",
+                 "2026-01-01T11:05:00+00:00 [⚠️ WARN] Retry 3 of 5 for apt")
+    live = _log(tmp_path / f"{run}.log",
+                "2026-01-01T11:10:00+00:00 [✔ OK] Run completed successfully.")
+    # Not run logs.
+    _log(tmp_path / "notes.log", "2026-01-01T12:00:00+00:00 [✖ ERROR] not a run")
+    _log(tmp_path / "readme.txt", "ignored")
+
+    logs = find_run_logs(tmp_path)
+    assert [run_id for run_id, _ in logs.runs] == [
+        "20260101-080000-homelab", "20260101-090000-homelab",
+        "20260101-100000-app_manager", run,
+    ]
+    assert dict(logs.runs)[run] == [older, newer, live]
+    assert logs.skipped == 1
+
+    stats = scan_run_logs(logs)
+    assert (stats.files, stats.runs, stats.failed, stats.unreadable) == (6, 4, 1, 0)
+    assert component_rows(stats) == [
+        ("app_manager", "2", "0", "0.0%", "1", "10.0m", "10.0m"),
+        ("homelab", "2", "1", "50.0%", "0", "1.2m", "2.0m"),
+    ]
+    assert stats.top_messages() == [
+        ("WARN", "Retry # of # for apt", 3),
+        ("ERROR", "Run failed (exit #) at line #.", 1),
+    ]
+
+
+def test_listing_digest_tracks_changes(tmp_path: Path) -> None:
+    log = _log(tmp_path / "20260101-080000-homelab.log", "2026-01-01T08:00:00+00:00 [ℹ️ INFO] start")
+    before = find_run_logs(tmp_path).digest
+    assert find_run_logs(tmp_path).digest == before
+    log.write_text(log.read_text() + "2026-01-01T08:00:05+00:00 [✔ OK] Run completed successfully.\n")
+    assert find_run_logs(tmp_path).digest != before
+
+
+def test_scan_caps_distinct_messages(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(run_logs, "MAX_MESSAGES", 5)
+    lines = []
+    for i in range(200):
+        lines.append("2026-01-01T08:00:00+00:00 [✖ ERROR] disk full on /dev/sda1")
+        tail = "".join(chr(97 + (i >> s) % 26) for s in (0, 5, 10))
+        lines.append(f"2026-01-01T08:00:01+00:00 [⚠️ WARN] unique {tail}")
+    path = _log(tmp_path / "20260101-080000-homelab.log", *lines)
+
+    stats = scan_run("20260101-080000-homelab", [path])
+    assert len(stats.messages) <= 2 * run_logs.MAX_MESSAGES
+    # The frequent message survives every prune with its exact count.
+    assert stats.top_messages(1) == [("ERROR", "disk full on /dev/sda#", 200)]
+    assert stats.lines == 400
+
+
+def test_synthetic_logs_serial_and_parallel_agree(tmp_path: Path) -> None:
+    made = make_synthetic_logs(tmp_path, 30)
+    logs = find_run_logs(tmp_path)
+    assert len(logs.runs) == made["runs"]
+    assert sum(len(paths) for _, paths in logs.runs) == made["log_files"]
+    for _, paths in logs.runs:
+        assert all(p.suffix == ".bak" for p in paths[:-1]) and paths[-1].suffix == ".log"
+
+    serial = scan_run_logs(logs, jobs=1)
+    parallel = scan_run_logs(logs, jobs=2)
+    assert serial.runs == made["runs"]
+    assert component_rows(serial) == component_rows(parallel)
+    assert serial.top_messages() == parallel.top_messages()
+    assert (serial.files, serial.lines) == (parallel.files, parallel.lines)
@@ -0,0 +1,55 @@
+"""
+Fouchger Homelab – tests: manual generator watch mode dates
+
+Description:
+  watch() (docs/tools/generate_manuals.py) must re-read the date and
+  SOURCE_DATE_EPOCH for every rebuild, as ManualBuilder.build does, so a
+  session left running past midnight stamps documents with the new day.
+  build_all and the file watcher are replaced; nothing is rendered.
+
+-------------------------------------------------------------------------------
+"""
+
+import datetime as _dt
+from pathlib import Path
+
+import generate_manuals as gm
+
+DAY1 = _dt.datetime(2026, 3, 1, 23, 59, tzinfo=_dt.timezone.utc)
+DAY2 = DAY1 + _dt.timedelta(minutes=2)
+
+
+class _Watcher:
+    interval = 1.0
+
+    def close(self) -> None:
+        pass
+
+
+def _run_watch(tmp_path: Path, monkeypatch, argv):
+    (tmp_path / "lib").mkdir()
+    builds = []
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", str(int(DAY1.timestamp())))
+
+    def changes(watcher, debounce):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", str(int(DAY2.timestamp())))
+        yield [tmp_path / "lib" / "core.sh"]
+
+    monkeypatch.setattr(gm, "make_watcher", lambda roots, poll: _Watcher())
+    monkeypatch.setattr(gm, "watch_changes", changes)
+    monkeypatch.setattr(gm, "build_all", lambda args, repo, out, jobs, epoch, today, label, cache: builds.append((epoch, today, label)))
+    gm.watch(gm.make_parser().parse_args(argv), tmp_path, tmp_path / "out", 1)
+    return builds
+
+
+def test_each_rebuild_reads_the_date(tmp_path: Path, monkeypatch) -> None:
+    builds = _run_watch(tmp_path, monkeypatch, ["--format", "md"])
+    assert builds == [
+        (int(DAY1.timestamp()), DAY1.date(), f"{tmp_path.name} (01 March 2026)"),
+        (int(DAY2.timestamp()), DAY2.date(), f"{tmp_path.name} (02 March 2026)"),
+    ]
+
+
+def test_explicit_snapshot_label_is_kept(tmp_path: Path, monkeypatch) -> None:
+    builds = _run_watch(tmp_path, monkeypatch, ["--format", "md", "--snapshot-label", "v1.2"])
+    assert [(today, label) for _, today, label in builds] == [(DAY1.date(), "v1.2"), (DAY2.date(), "v1.2")]